@@ -155,6 +155,24 @@ else:
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Cache
+# По умолчанию кеш в памяти процесса; для нескольких воркеров укажите общий бэкенд
+# (Redis/Memcached), чтобы сброс кеша сигналами был виден всем процессам.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('DJANGO_CACHE_LOCATION', 'luchik'),
+    }
+}
+
+# Время жизни кешированного индекса активных карточек набора, сек
+FLASH_CARDS_INDEX_TIMEOUT = int(os.getenv('FLASH_CARDS_INDEX_TIMEOUT', '3600'))
+
+# Пул заранее сгенерированных сессий тренажеров (см. trainers.pools.SessionPool)
+SESSION_POOL_ENABLED = os.getenv('SESSION_POOL_ENABLED', 'True').lower() == 'true'
+SESSION_POOL_SIZE = int(os.getenv('SESSION_POOL_SIZE', '8'))
+SESSION_POOL_MAX_KEYS = int(os.getenv('SESSION_POOL_MAX_KEYS', '64'))
+
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
@@ -0,0 +1,177 @@
+import json
+import math
+import platform
+import random
+import time
+from datetime import datetime, timezone
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+
+from trainers_flash_cards.services import generate_flashcards_abacus_session
+from trainers_schulte_table.services import (
+    MAX_VARIANT_GRID_SIZE,
+    MIN_GRID_SIZE,
+    generate_schulte_layout,
+    layout_cells,
+)
+from trainers_simply.services import generate_abacus_numbers, generate_simply_sequence
+from trainers_stroop.config import StroopLevelConfig, get_stroop_config
+from trainers_stroop.services import generate_stroop_rounds
+
+# Запуск одного прогона: принимает генератор случайных чисел и возвращает
+# счетчик запасных путей ({"fallbacks": ...}), если он есть у генератора.
+Case = Tuple[Dict, Callable[[random.Random], Dict[str, int]]]
+
+
+def _run_simply(range_key: int, num_examples: int, max_digit: int, rng: random.Random) -> Dict[str, int]:
+    numbers, _, _, _ = generate_simply_sequence(range_key, num_examples, max_digit, rng)
+    # Однозначные числа при max_digit >= 5 идут через генератор абакуса и тоже могут
+    # получить корректирующее число в конце.
+    return {"fallbacks": int(len(numbers) > num_examples)}
+
+
+def _run_abacus(max_digit: int, num_examples: int, rng: random.Random) -> Dict[str, int]:
+    numbers = generate_abacus_numbers(max_digit, num_examples, rng)
+    # Корректирующее число в конце последовательности — запасной путь генератора.
+    return {"fallbacks": int(len(numbers) > num_examples)}
+
+
+def _run_flashcards_abacus(difficulty: int, quantity: int, max_digit: int, rng: random.Random) -> Dict[str, int]:
+    generate_flashcards_abacus_session(difficulty, 1.0, quantity, max_digit, rng)
+    return {}
+
+
+def _run_stroop(level: StroopLevelConfig, rng: random.Random) -> Dict[str, int]:
+    generate_stroop_rounds(level.palette, level.rounds, level.mismatch_ratio, rng)
+    return {}
+
+
+def _run_schulte(variant: str, size: int, rng: random.Random) -> Dict[str, int]:
+    layout_cells(generate_schulte_layout(size, rng), variant, size)
+    return {}
+
+
+def simply_cases() -> Iterator[Case]:
+    for range_key in range(1, 5):
+        for max_digit in range(2, 10):
+            for num_examples in range(2, 100):
+                params = {"range_key": range_key, "max_digit": max_digit, "num_examples": num_examples}
+                yield params, partial(_run_simply, range_key, num_examples, max_digit)
+
+
+def abacus_cases() -> Iterator[Case]:
+    for max_digit in range(2, 10):
+        for num_examples in range(2, 100):
+            params = {"max_digit": max_digit, "num_examples": num_examples}
+            yield params, partial(_run_abacus, max_digit, num_examples)
+
+
+def flashcards_abacus_cases() -> Iterator[Case]:
+    for difficulty in range(1, 5):
+        for max_digit in range(2, 10):
+            for quantity in range(2, 100):
+                params = {"difficulty": difficulty, "max_digit": max_digit, "quantity": quantity}
+                yield params, partial(_run_flashcards_abacus, difficulty, quantity, max_digit)
+
+
+def stroop_cases() -> Iterator[Case]:
+    for slug, level in get_stroop_config().levels.items():
+        yield {"level": slug}, partial(_run_stroop, level)
+
+
+def schulte_cases() -> Iterator[Case]:
+    for variant, max_size in MAX_VARIANT_GRID_SIZE.items():
+        for size in range(MIN_GRID_SIZE, max_size + 1):
+            yield {"variant": variant, "size": size}, partial(_run_schulte, variant, size)
+
+
+GENERATORS: Dict[str, Callable[[], Iterator[Case]]] = {
+    "simply": simply_cases,
+    "abacus": abacus_cases,
+    "flashcards_abacus": flashcards_abacus_cases,
+    "stroop": stroop_cases,
+    "schulte": schulte_cases,
+}
+
+
+def _percentile(sorted_samples: List[int], fraction: float) -> int:
+    index = max(0, math.ceil(fraction * len(sorted_samples)) - 1)
+    return sorted_samples[index]
+
+
+def summarize(samples_ns: List[int]) -> Dict[str, float]:
+    ordered = sorted(samples_ns)
+    return {
+        "mean_us": round(sum(ordered) / len(ordered) / 1000, 3),
+        "p50_us": round(_percentile(ordered, 0.5) / 1000, 3),
+        "p99_us": round(_percentile(ordered, 0.99) / 1000, 3),
+        "max_us": round(ordered[-1] / 1000, 3),
+    }
+
+
+class Command(BaseCommand):
+    help = "Замеряет время генераторов сессий тренажеров на всех допустимых настройках и пишет JSON-отчет."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--generators",
+            default=",".join(GENERATORS),
+            help=f"Список генераторов через запятую: {', '.join(GENERATORS)}.",
+        )
+        parser.add_argument("--repeat", type=int, default=20, help="Прогонов на каждую комбинацию настроек.")
+        parser.add_argument("--seed", type=int, default=0, help="Зерно для воспроизводимых замеров.")
+        parser.add_argument("--output", default="bench_generators.json", help="Путь к JSON-отчету.")
+
+    def handle(self, *args, **options):
+        names = [name.strip() for name in options["generators"].split(",") if name.strip()]
+        unknown = [name for name in names if name not in GENERATORS]
+        if unknown:
+            raise CommandError(f"Неизвестные генераторы: {', '.join(unknown)}")
+
+        repeat = options["repeat"]
+        if repeat < 1:
+            raise CommandError("--repeat должен быть не меньше 1.")
+
+        rng = random.Random(options["seed"])
+        report = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "repeat": repeat,
+            "seed": options["seed"],
+            "generators": {},
+        }
+
+        for name in names:
+            cases: List[Dict] = []
+            all_samples: List[int] = []
+            totals = {"fallbacks": 0}
+
+            for params, run in GENERATORS[name]():
+                samples: List[int] = []
+                counters = {"fallbacks": 0}
+                for _ in range(repeat):
+                    started = time.perf_counter_ns()
+                    observed = run(rng)
+                    samples.append(time.perf_counter_ns() - started)
+                    for counter, value in observed.items():
+                        counters[counter] = counters.get(counter, 0) + value
+
+                all_samples.extend(samples)
+                for counter, value in counters.items():
+                    totals[counter] = totals.get(counter, 0) + value
+                cases.append({"params": params, **summarize(samples), **counters})
+
+            summary = {"cases": len(cases), "runs": len(all_samples), **summarize(all_samples), **totals}
+            report["generators"][name] = {"summary": summary, "cases": cases}
+            self.stdout.write(
+                f"{name}: {summary['cases']} комбинаций, mean {summary['mean_us']} мкс, "
+                f"p50 {summary['p50_us']} мкс, p99 {summary['p99_us']} мкс, "
+                f"запасных путей {summary['fallbacks']}"
+            )
+
+        with open(options["output"], "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, ensure_ascii=False, indent=2)
+
+        self.stdout.write(self.style.SUCCESS(f"Отчет сохранен в {options['output']}"))
@@ -0,0 +1,187 @@
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .seeding import make_rng
+
+logger = logging.getLogger(__name__)
+
+PooledSession = Tuple[int, Any]  # (зерно, сгенерированная сессия)
+
+_registry: Dict[str, "SessionPool"] = {}
+
+
+class StaleSessionKey(Exception):
+    """Фабрика больше не может генерировать сессии для ключа (например, изменились настройки)."""
+
+
+class SessionPool:
+    """
+    Внутрипроцессный пул заранее сгенерированных сессий для популярных наборов настроек.
+
+    Запрос забирает готовую сессию из очереди своего ключа (например,
+    ``(range_key, num_examples, max_digit)``), а фоновый поток дозаполняет очереди
+    до ``size``. Если очередь пуста, сессия генерируется прямо в запросе (промах).
+    Сессии с явно переданным зерном в пул не попадают — их генерирует ``generate``.
+
+    ``batch_factory(key, count)`` (необязательно) генерирует сразу несколько пар
+    (зерно, сессия) за вызов; фоновый поток использует его для дозаполнения.
+    Фабрика бросает StaleSessionKey, если ключ устарел, — такой ключ молча убирается из пула.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[Hashable, random.Random], Any],
+        size: Optional[int] = None,
+        max_keys: Optional[int] = None,
+        enabled: Optional[bool] = None,
+        batch_factory: Optional[Callable[[Hashable, int], List[PooledSession]]] = None,
+    ) -> None:
+        self.name = name
+        self.factory = factory
+        self.batch_factory = batch_factory
+        self.size = settings.SESSION_POOL_SIZE if size is None else size
+        self.max_keys = settings.SESSION_POOL_MAX_KEYS if max_keys is None else max_keys
+        self.enabled = settings.SESSION_POOL_ENABLED if enabled is None else enabled
+
+        self._queues: "OrderedDict[Hashable, Deque[PooledSession]]" = OrderedDict()
+        self._pending_since: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.errors = 0
+        self.last_refill_lag = 0.0
+        self.max_refill_lag = 0.0
+
+        _registry[name] = self
+
+    def generate(self, key: Hashable, seed: Optional[int] = None) -> PooledSession:
+        rng, seed = make_rng(seed)
+        return seed, self.factory(key, rng)
+
+    def generate_many(self, key: Hashable, count: int) -> List[PooledSession]:
+        if self.batch_factory is not None:
+            return self.batch_factory(key, count)
+        return [self.generate(key) for _ in range(count)]
+
+    def get(self, key: Hashable) -> PooledSession:
+        if not self.enabled or self.size <= 0:
+            return self.generate(key)
+
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = deque()
+                self._queues[key] = queue
+                while len(self._queues) > self.max_keys:
+                    evicted, _ = self._queues.popitem(last=False)
+                    self._pending_since.pop(evicted, None)
+            else:
+                self._queues.move_to_end(key)
+
+            pooled = queue.popleft() if queue else None
+            if pooled is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            self._pending_since.setdefault(key, time.monotonic())
+
+        self._ensure_worker()
+        self._wakeup.set()
+        return pooled if pooled is not None else self.generate(key)
+
+    def refill(self) -> None:
+        """Один проход дозаполнения всех очередей до ``size``."""
+
+        with self._lock:
+            work = [(key, self.size - len(queue)) for key, queue in self._queues.items() if len(queue) < self.size]
+
+        for key, missing in work:
+            try:
+                fresh = self.generate_many(key, missing)
+            except StaleSessionKey:
+                logger.debug("Устаревший ключ %r убран из пула сессий %s", key, self.name)
+                self._discard(key)
+                continue
+            except Exception:
+                # Ошибка одного ключа не должна останавливать дозаполнение остальных:
+                # ключ убирается из пула, следующий запрос с ним сгенерирует сессию сам.
+                logger.exception("Не удалось дозаполнить пул сессий %s для ключа %r", self.name, key)
+                self._discard(key)
+                with self._lock:
+                    self.errors += 1
+                continue
+            with self._lock:
+                queue = self._queues.get(key)
+                if queue is None:
+                    continue
+                queue.extend(fresh[: max(0, self.size - len(queue))])
+                started = self._pending_since.pop(key, None)
+                self.refills += 1
+                if started is not None:
+                    self.last_refill_lag = time.monotonic() - started
+                    self.max_refill_lag = max(self.max_refill_lag, self.last_refill_lag)
+
+    def _discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._queues.pop(key, None)
+            self._pending_since.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests_total = self.hits + self.misses
+            return {
+                "name": self.name,
+                "enabled": self.enabled,
+                "size": self.size,
+                "max_keys": self.max_keys,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / requests_total, 4) if requests_total else None,
+                "refills": self.refills,
+                "errors": self.errors,
+                "last_refill_lag_ms": round(self.last_refill_lag * 1000, 3),
+                "max_refill_lag_ms": round(self.max_refill_lag * 1000, 3),
+                "keys": [
+                    {"key": list(key) if isinstance(key, tuple) else key, "available": len(queue)}
+                    for key, queue in self._queues.items()
+                ],
+            }
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run, name=f"session-pool-{self.name}", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            # Фабрики могут обращаться к ORM: поток живет долго, поэтому соединения
+            # закрываются по тем же правилам, что и после обычного запроса.
+            close_old_connections()
+            try:
+                self.refill()
+            except Exception:
+                logger.exception("Не удалось дозаполнить пул сессий %s", self.name)
+            finally:
+                close_old_connections()
+
+
+def get_pool_stats() -> List[dict]:
+    return [pool.stats() for pool in _registry.values()]
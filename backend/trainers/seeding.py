@@ -0,0 +1,29 @@
+import random
+import secrets
+from typing import Optional, Tuple
+
+MAX_SEED = 2**32 - 1
+
+
+def make_rng(seed: Optional[int] = None) -> Tuple[random.Random, int]:
+    """
+    Возвращает собственный генератор случайных чисел для одной сессии и его зерно.
+
+    Если зерно не передано, оно выбирается случайно. Одинаковые зерно и настройки
+    всегда дают одну и ту же сессию, поэтому сессию можно не хранить, а пересоздать.
+    """
+
+    if seed is None:
+        seed = secrets.randbits(32)
+    return random.Random(seed), seed
+
+
+def parse_seed(raw_value: Optional[str]) -> Optional[int]:
+    """Разбирает зерно из query-параметра. Бросает ValueError для некорректных значений."""
+
+    if raw_value is None or raw_value == "":
+        return None
+    seed = int(raw_value)
+    if seed < 0 or seed > MAX_SEED:
+        raise ValueError("seed out of range")
+    return seed
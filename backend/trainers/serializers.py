@@ -30,25 +30,9 @@ class TrainerSerializer(serializers.ModelSerializer):
 
     def get_difficulties(self, trainer: Trainer) -> List[dict]:
         if trainer.slug == "stroop-test":
-            from trainers_stroop.views import DIFFICULTIES
+            from trainers_stroop.config import get_stroop_config
 
-            difficulties: List[dict] = []
-            for order, (slug, config) in enumerate(DIFFICULTIES.items(), start=1):
-                mismatch_ratio = int(round(config["mismatch_ratio"] * 100))
-                difficulties.append(
-                    {
-                        "id": order,
-                        "title": f'{config["rounds"]} раундов — уровень «{slug}»',
-                        "word_count": config["rounds"],
-                        "sample_text": (
-                            f'Рекомендуемое время: {config["recommended_seconds"]} сек. '
-                            f"Несовпадений: {mismatch_ratio}%"
-                        ),
-                        "order": order,
-                        "is_active": True,
-                    }
-                )
-            return difficulties
+            return get_stroop_config().catalog
 
         providers = {
             "fading-text": (
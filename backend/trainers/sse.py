@@ -0,0 +1,34 @@
+import json
+from typing import Any, Iterable
+
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Одно событие Server-Sent Events с JSON-данными."""
+
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Позволяет потоковым представлениям принимать ``Accept: text/event-stream``.
+    Обычные ответы DRF (например, ошибки валидации) отдаются одним событием ``error``.
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return format_sse("error", data).encode(self.charset)
+
+
+def event_stream_response(events: Iterable[str]) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(events, content_type="text/event-stream; charset=utf-8")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -1,3 +1,101 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from collections import deque
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .pools import SessionPool
+
+
+def _numbers_factory(key, rng):
+    return [rng.randrange(100) for _ in range(key)]
+
+
+class SessionPoolTests(SimpleTestCase):
+    def test_miss_then_hit_after_refill(self) -> None:
+        pool = SessionPool('test-pool', _numbers_factory, size=3, max_keys=4)
+        pool._ensure_worker = lambda: None
+
+        seed, numbers = pool.get(5)
+        self.assertEqual(len(numbers), 5)
+        self.assertEqual((pool.hits, pool.misses), (0, 1))
+
+        pool.refill()
+        self.assertEqual(pool.stats()['keys'], [{'key': 5, 'available': 3}])
+
+        pool.get(5)
+        self.assertEqual((pool.hits, pool.misses), (1, 1))
+        self.assertGreaterEqual(pool.stats()['last_refill_lag_ms'], 0)
+
+    def test_pooled_session_is_reproducible_from_seed(self) -> None:
+        pool = SessionPool('test-pool', _numbers_factory, size=2, max_keys=4)
+        pool._ensure_worker = lambda: None
+        pool.get(4)
+        pool.refill()
+
+        seed, numbers = pool.get(4)
+        self.assertEqual(pool.generate(4, seed), (seed, numbers))
+
+    def test_least_recently_used_keys_are_evicted(self) -> None:
+        pool = SessionPool('test-pool', _numbers_factory, size=1, max_keys=2)
+        pool._ensure_worker = lambda: None
+        for key in (1, 2, 3):
+            pool.get(key)
+
+        self.assertEqual([item['key'] for item in pool.stats()['keys']], [2, 3])
+
+    def test_failing_key_does_not_stop_refill(self) -> None:
+        def factory(key, rng):
+            if key == 0:
+                raise ValueError('сломанный ключ')
+            return _numbers_factory(key, rng)
+
+        pool = SessionPool('test-pool', factory, size=2, max_keys=4)
+        pool._ensure_worker = lambda: None
+        pool.get(3)
+        pool._queues[0] = deque()
+        pool._queues.move_to_end(0, last=False)
+
+        with self.assertLogs('trainers.pools', level='ERROR'):
+            pool.refill()
+        self.assertEqual(pool.stats()['keys'], [{'key': 3, 'available': 2}])
+        self.assertEqual(pool.errors, 1)
+
+    def test_disabled_pool_generates_inline(self) -> None:
+        pool = SessionPool('test-pool', _numbers_factory, size=2, enabled=False)
+        seed, numbers = pool.get(3)
+
+        self.assertEqual(len(numbers), 3)
+        self.assertEqual(pool.stats()['keys'], [])
+
+
+class BenchGeneratorsCommandTests(TestCase):
+    def test_writes_json_report(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = os.path.join(tmp_dir, 'report.json')
+            call_command('bench_generators', generators='abacus,stroop', repeat=2, output=output, stdout=StringIO())
+
+            with open(output, encoding='utf-8') as report_file:
+                report = json.load(report_file)
+
+        self.assertEqual(set(report['generators']), {'abacus', 'stroop'})
+        abacus = report['generators']['abacus']
+        self.assertEqual(abacus['summary']['cases'], 8 * 98)
+        self.assertEqual(abacus['summary']['runs'], 8 * 98 * 2)
+        for key in ('mean_us', 'p50_us', 'p99_us', 'fallbacks'):
+            self.assertIn(key, abacus['cases'][0])
+
+
+class SessionPoolStatsApiTests(APITestCase):
+    def test_stats_endpoint_lists_pools(self) -> None:
+        response = self.client.get(reverse('session-pool-stats'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = {pool['name'] for pool in response.data['pools']}
+        self.assertTrue({'simply', 'flash-cards-abacus', 'stroop'} <= names)
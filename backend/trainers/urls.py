@@ -1,12 +1,13 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import TrainerViewSet
+from .views import TrainerViewSet, session_pool_stats
 
 router = DefaultRouter()
 router.register(r'trainers', TrainerViewSet, basename='trainer')
 
 urlpatterns = [
+    path('trainers/session-pools/', session_pool_stats, name='session-pool-stats'),
     path('', include(router.urls)),
 ]
 
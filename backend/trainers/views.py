@@ -1,6 +1,9 @@
 from rest_framework import viewsets
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
 
 from .models import Trainer
+from .pools import get_pool_stats
 from .serializers import TrainerSerializer
 
 
@@ -9,3 +12,10 @@ class TrainerViewSet(viewsets.ReadOnlyModelViewSet):
 
     queryset = Trainer.objects.filter(is_active=True)
     serializer_class = TrainerSerializer
+
+
+@api_view(['GET'])
+def session_pool_stats(request):
+    """Состояние пулов заранее сгенерированных сессий: заполненность, попадания, задержка дозаполнения."""
+
+    return Response({'pools': get_pool_stats()})
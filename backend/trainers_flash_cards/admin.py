@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import FlashCard, FlashCardDeck
+from .models import FlashCard, FlashCardDeck, FlashCardReview
 
 
 class FlashCardInline(admin.TabularInline):
@@ -12,17 +12,12 @@ class FlashCardInline(admin.TabularInline):
 
 @admin.register(FlashCardDeck)
 class FlashCardDeckAdmin(admin.ModelAdmin):
-    list_display = ("title", "slug", "card_count", "updated_at")
+    list_display = ("title", "slug", "active_card_count", "content_version", "updated_at")
     list_filter = ("created_at",)
     search_fields = ("title", "slug")
     prepopulated_fields = {"slug": ("title",)}
     inlines = [FlashCardInline]
 
-    def card_count(self, obj: FlashCardDeck) -> int:
-        return obj.cards.count()
-
-    card_count.short_description = "Карточек"
-
 
 @admin.register(FlashCard)
 class FlashCardAdmin(admin.ModelAdmin):
@@ -36,3 +31,11 @@ class FlashCardAdmin(admin.ModelAdmin):
         return obj.front_text[:64] + ("..." if len(obj.front_text) > 64 else "")
 
     short_front.short_description = "Лицевая сторона"
+
+
+@admin.register(FlashCardReview)
+class FlashCardReviewAdmin(admin.ModelAdmin):
+    list_display = ("learner", "card", "deck", "interval_days", "ease_factor", "due_at")
+    list_filter = ("deck",)
+    search_fields = ("learner",)
+    raw_id_fields = ("card", "deck")
@@ -5,3 +5,6 @@ class TrainersFlashCardsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'trainers_flash_cards'
     verbose_name = 'Флеш-карты'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from functools import partial
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import FlashCard, FlashCardDeck
+
+
+@dataclass(frozen=True)
+class DeckIndex:
+    """Компактный снимок набора: реквизиты и упорядоченные (order, id) активные карточки."""
+
+    deck_id: int
+    slug: str
+    title: str
+    accent_color: str
+    is_active: bool
+    content_version: int
+    card_ids: Tuple[int, ...]
+    front_texts: Tuple[str, ...]
+
+
+def deck_index_cache_key(deck_id: int) -> str:
+    return f"flash_cards:deck_index:{deck_id}"
+
+
+def deck_slug_cache_key(slug: str) -> str:
+    return f"flash_cards:deck_slug:{slug}"
+
+
+def build_deck_index(deck: dict) -> DeckIndex:
+    cards = list(
+        FlashCard.objects.filter(deck_id=deck["id"], is_active=True)
+        .order_by("order", "id")
+        .values_list("id", "front_text")
+    )
+    return DeckIndex(
+        deck_id=deck["id"],
+        slug=deck["slug"],
+        title=deck["title"],
+        accent_color=deck["accent_color"],
+        is_active=deck["is_active"],
+        content_version=deck["content_version"],
+        card_ids=tuple(card_id for card_id, _ in cards),
+        front_texts=tuple(text for _, text in cards),
+    )
+
+
+def get_deck_index(slug: str) -> Optional[DeckIndex]:
+    """
+    Возвращает индекс набора по слагу из кеша, при промахе строит его двумя запросами.
+
+    Попадание в кеш проверяется одним запросом content_version по первичному ключу:
+    версия растет при любом изменении набора или его карточек, в том числе из других
+    процессов (импорт, команды, shell), чей сброс кеша до этого процесса не доходит.
+    Сигналы и пересчет статистики дополнительно удаляют запись после коммита.
+    """
+
+    deck_id = cache.get(deck_slug_cache_key(slug))
+    if deck_id is not None:
+        index = cache.get(deck_index_cache_key(deck_id))
+        if index is not None and index.slug == slug:
+            version = FlashCardDeck.objects.filter(pk=deck_id).values_list("content_version", flat=True).first()
+            if version == index.content_version:
+                return index
+
+    deck = (
+        FlashCardDeck.objects.filter(slug=slug)
+        .values("id", "slug", "title", "accent_color", "is_active", "content_version")
+        .first()
+    )
+    if deck is None:
+        return None
+
+    index = build_deck_index(deck)
+    timeout = settings.FLASH_CARDS_INDEX_TIMEOUT
+    cache.set_many(
+        {
+            deck_slug_cache_key(slug): index.deck_id,
+            deck_index_cache_key(index.deck_id): index,
+        },
+        timeout,
+    )
+    return index
+
+
+def invalidate_deck_index(deck_id: int) -> None:
+    # После коммита: иначе параллельный запрос успеет закешировать индекс по еще старым данным.
+    transaction.on_commit(partial(cache.delete, deck_index_cache_key(deck_id)))
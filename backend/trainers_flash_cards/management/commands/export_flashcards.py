@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from trainers_flash_cards.models import FlashCardDeck
+from trainers_flash_cards.transfer import FORMATS, TransferError, detect_format, export_flashcards
+
+
+class Command(BaseCommand):
+    help = "Выгружает карточки наборов в CSV или JSONL (по записи на карточку) потоково."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Путь к файлу или «-» для вывода в stdout.")
+        parser.add_argument("--format", choices=FORMATS, help="Формат файла (по умолчанию по расширению).")
+        parser.add_argument("--deck", action="append", default=[], help="Слаг набора (можно повторять).")
+
+    def handle(self, *args, **options):
+        if options["path"] == "-" and not options["format"]:
+            raise CommandError("При выводе в stdout укажите --format.")
+        if options["deck"]:
+            found = set(FlashCardDeck.objects.filter(slug__in=options["deck"]).values_list("slug", flat=True))
+            missing = sorted(set(options["deck"]) - found)
+            if missing:
+                raise CommandError(f"Наборы не найдены: {', '.join(missing)}")
+
+        try:
+            file_format = detect_format(options["path"], options["format"])
+            if options["path"] == "-":
+                # В stdout идут только данные, без итогового сообщения.
+                export_flashcards(self.stdout, file_format, options["deck"])
+                return
+            with open(options["path"], "w", encoding="utf-8", newline="") as stream:
+                exported = export_flashcards(stream, file_format, options["deck"])
+        except (OSError, TransferError) as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(self.style.SUCCESS(f"Выгружено карточек: {exported}"))
@@ -0,0 +1,49 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from trainers.models import Trainer
+from trainers_flash_cards.transfer import FORMATS, TransferError, detect_format, import_flashcards
+
+
+class Command(BaseCommand):
+    help = (
+        "Импортирует наборы флеш-карт из CSV или JSONL пакетами в одной транзакции. "
+        "Карточки сопоставляются по слагу набора и порядковому номеру."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Путь к файлу или «-» для чтения из stdin.")
+        parser.add_argument("--format", choices=FORMATS, help="Формат файла (по умолчанию по расширению).")
+        parser.add_argument("--trainer", default="flash-words", help="Слаг тренажера для новых наборов.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Записей в одном пакете.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size должен быть положительным.")
+        if options["path"] == "-" and not options["format"]:
+            raise CommandError("При чтении из stdin укажите --format.")
+
+        trainer = Trainer.objects.filter(slug=options["trainer"]).first()
+        if trainer is None:
+            raise CommandError(f"Тренажер не найден: {options['trainer']}")
+
+        started = time.perf_counter()
+        try:
+            file_format = detect_format(options["path"], options["format"])
+            if options["path"] == "-":
+                result = import_flashcards(sys.stdin, file_format, trainer, options["batch_size"])
+            else:
+                with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                    result = import_flashcards(stream, file_format, trainer, options["batch_size"])
+        except (OSError, TransferError) as error:
+            raise CommandError(str(error))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Обработано записей: {result.rows} за {time.perf_counter() - started:.2f} с. "
+                f"Наборы: создано {result.decks_created}, обновлено {result.decks_updated}. "
+                f"Карточки: создано {result.cards_created}, обновлено {result.cards_updated}."
+            )
+        )
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from trainers_flash_cards.models import FlashCardDeck
+from trainers_flash_cards.stats import refresh_deck_stats
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает active_card_count, sample_text и content_version наборов флеш-карт."
+
+    def add_arguments(self, parser):
+        parser.add_argument("slugs", nargs="*", help="Слаги наборов (по умолчанию все наборы).")
+
+    def handle(self, *args, **options):
+        deck_ids = None
+        if options["slugs"]:
+            found = dict(FlashCardDeck.objects.filter(slug__in=options["slugs"]).values_list("slug", "pk"))
+            missing = sorted(set(options["slugs"]) - set(found))
+            if missing:
+                raise CommandError(f"Наборы не найдены: {', '.join(missing)}")
+            deck_ids = found.values()
+
+        updated = refresh_deck_stats(deck_ids)
+        self.stdout.write(self.style.SUCCESS(f"Обновлено наборов: {updated}"))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers_flash_cards', '0005_seed_extended_flash_words_levels'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='flashcard',
+            index=models.Index(fields=['deck', 'is_active', 'order', 'id'], name='flash_card_active_order_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:56
+
+from django.db import migrations, models
+
+
+def fill_deck_stats(apps, schema_editor):
+    FlashCardDeck = apps.get_model('trainers_flash_cards', 'FlashCardDeck')
+    FlashCard = apps.get_model('trainers_flash_cards', 'FlashCard')
+
+    for deck in FlashCardDeck.objects.all():
+        cards = FlashCard.objects.filter(deck=deck, is_active=True).order_by('order', 'id')
+        deck.active_card_count = cards.count()
+        deck.sample_text = ', '.join(cards.values_list('front_text', flat=True)[:12])
+        deck.content_version = 1
+        deck.save(update_fields=['active_card_count', 'sample_text', 'content_version'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers_flash_cards', '0006_flashcard_active_order_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flashcarddeck',
+            name='active_card_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Активных карточек'),
+        ),
+        migrations.AddField(
+            model_name='flashcarddeck',
+            name='content_version',
+            field=models.PositiveBigIntegerField(default=0, editable=False, verbose_name='Версия содержимого'),
+        ),
+        migrations.AddField(
+            model_name='flashcarddeck',
+            name='sample_text',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Первые слова активных карточек'),
+        ),
+        migrations.RunPython(fill_deck_stats, migrations.RunPython.noop),
+    ]
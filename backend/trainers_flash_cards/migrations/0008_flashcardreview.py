@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers_flash_cards', '0007_flashcarddeck_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FlashCardReview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('learner', models.CharField(help_text='Идентификатор ученика, который хранит клиент', max_length=64, verbose_name='Ученик')),
+                ('ease_factor', models.FloatField(default=2.5, verbose_name='Коэффициент легкости')),
+                ('interval_days', models.PositiveIntegerField(default=0, verbose_name='Интервал, дней')),
+                ('repetitions', models.PositiveIntegerField(default=0, verbose_name='Успешных повторений подряд')),
+                ('lapses', models.PositiveIntegerField(default=0, verbose_name='Забываний')),
+                ('due_at', models.DateTimeField(verbose_name='Следующее повторение')),
+                ('last_reviewed_at', models.DateTimeField(verbose_name='Последнее повторение')),
+                ('card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='trainers_flash_cards.flashcard', verbose_name='Карточка')),
+                ('deck', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='trainers_flash_cards.flashcarddeck', verbose_name='Набор')),
+            ],
+            options={
+                'verbose_name': 'Повторение карточки',
+                'verbose_name_plural': 'Повторения карточек',
+                'db_table': 'flash_cards_review',
+                'indexes': [models.Index(fields=['learner', 'deck', 'due_at'], name='flash_review_due_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='flashcardreview',
+            constraint=models.UniqueConstraint(fields=('learner', 'card'), name='flash_review_learner_card_uniq'),
+        ),
+    ]
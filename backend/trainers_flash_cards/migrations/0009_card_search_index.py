@@ -0,0 +1,72 @@
+from django.db import migrations
+
+# Выражение документа должно совпадать с trainers_flash_cards.search.POSTGRES_CARD_DOCUMENT,
+# иначе планировщик не сможет использовать индекс.
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS flash_card_search_idx ON flash_cards_card "
+    "USING gin ((to_tsvector('simple', front_text || ' ' || back_text || ' ' || hint)))",
+    "CREATE INDEX IF NOT EXISTS flash_card_front_trgm_idx ON flash_cards_card USING gin (front_text gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS flash_deck_title_trgm_idx ON flash_cards_deck USING gin (UPPER(title) gin_trgm_ops)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS flash_deck_title_trgm_idx",
+    "DROP INDEX IF EXISTS flash_card_front_trgm_idx",
+    "DROP INDEX IF EXISTS flash_card_search_idx",
+]
+
+
+def _sqlite_fts(table, columns):
+    """FTS5-таблица с внешним содержимым и триггеры, которые держат ее в актуальном состоянии."""
+
+    fts = f"{table}_fts"
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    insert_new = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values});"
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, content='{table}', "
+        f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def _sqlite_drop_fts(table):
+    fts = f"{table}_fts"
+    return [f"DROP TRIGGER IF EXISTS {fts}_{suffix}" for suffix in ("au", "ad", "ai")] + [f"DROP TABLE IF EXISTS {fts}"]
+
+
+# Для локального запуска на SQLite — FTS5-таблицы карточек и наборов.
+SQLITE_FORWARD = _sqlite_fts("flash_cards_card", ("front_text", "back_text", "hint")) + _sqlite_fts(
+    "flash_cards_deck", ("title", "description")
+)
+SQLITE_BACKWARD = _sqlite_drop_fts("flash_cards_deck") + _sqlite_drop_fts("flash_cards_card")
+
+
+def _run(schema_editor, statements_by_vendor):
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    _run(schema_editor, {"postgresql": POSTGRES_FORWARD, "sqlite": SQLITE_FORWARD})
+
+
+def drop_search_index(apps, schema_editor):
+    _run(schema_editor, {"postgresql": POSTGRES_BACKWARD, "sqlite": SQLITE_BACKWARD})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers_flash_cards', '0008_flashcardreview'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -4,6 +4,9 @@ from trainers.models import Trainer
 
 
 class FlashCardDeck(models.Model):
+    # Поля статистики обновляются только через trainers_flash_cards.stats.
+    STATS_FIELDS = ("active_card_count", "sample_text", "content_version")
+
     trainer = models.ForeignKey(
         Trainer,
         on_delete=models.CASCADE,
@@ -21,6 +24,9 @@ class FlashCardDeck(models.Model):
     )
     order = models.PositiveIntegerField(default=0, verbose_name="Порядок отображения")
     is_active = models.BooleanField(default=True, verbose_name="Активен")
+    active_card_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Активных карточек")
+    sample_text = models.TextField(blank=True, default="", editable=False, verbose_name="Первые слова активных карточек")
+    content_version = models.PositiveBigIntegerField(default=0, editable=False, verbose_name="Версия содержимого")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создано")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
 
@@ -33,6 +39,63 @@ class FlashCardDeck(models.Model):
     def __str__(self) -> str:
         return self.title
 
+    def save(self, *args, **kwargs):
+        # Экземпляр набора мог устареть, пока сигналы карточек меняли статистику в БД,
+        # поэтому при обычном сохранении статистику не перезаписываем.
+        if not self._state.adding and kwargs.get("update_fields") is None and not kwargs.get("force_insert"):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.STATS_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+
+class FlashCardQuerySet(models.QuerySet):
+    """Массовые операции, которые не шлют сигналы, сами пересчитывают статистику наборов."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        created = super().bulk_create(objs, *args, **kwargs)
+        from .stats import schedule_deck_stats_refresh
+
+        schedule_deck_stats_refresh({obj.deck_id for obj in objs})
+        return created
+
+    def update(self, **kwargs):
+        from .reviews import sync_review_decks
+        from .stats import schedule_deck_stats_refresh
+
+        deck_ids = set(self.order_by().values_list("deck_id", flat=True).distinct())
+        moves_cards = "deck" in kwargs or "deck_id" in kwargs
+        # Новый набор может быть выражением (например, Case из bulk_update), поэтому
+        # наборы после переноса читаются из базы по id карточек.
+        card_ids = list(self.values_list("pk", flat=True)) if moves_cards else []
+        rows = super().update(**kwargs)
+        if card_ids:
+            moved = FlashCard._base_manager.filter(pk__in=card_ids)
+            deck_ids.update(moved.order_by().values_list("deck_id", flat=True).distinct())
+            sync_review_decks(card_ids)
+
+        schedule_deck_stats_refresh(deck_ids)
+        return rows
+
+    update.alters_data = True
+
+    def delete(self):
+        # Сигналы post_delete приходят по одному на карточку — пока идет удаление,
+        # они только копят наборы, а статистика пересчитывается один раз в конце.
+        from .stats import deferred_deck_stats, schedule_deck_stats_refresh
+
+        with deferred_deck_stats():
+            deck_ids = set(self.order_by().values_list("deck_id", flat=True).distinct())
+            deleted = super().delete()
+            schedule_deck_stats_refresh(deck_ids)
+        return deleted
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
 
 class FlashCard(models.Model):
     deck = models.ForeignKey(
@@ -54,11 +117,59 @@ class FlashCard(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создано")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
 
+    objects = FlashCardQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Флеш-карта"
         verbose_name_plural = "Флеш-карты"
         ordering = ["deck", "order", "id"]
         db_table = "flash_cards_card"
+        indexes = [
+            models.Index(fields=["deck", "is_active", "order", "id"], name="flash_card_active_order_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.front_text[:48]}..." if len(self.front_text) > 48 else self.front_text
+
+
+class FlashCardReview(models.Model):
+    """Расписание повторения карточки для одного ученика (алгоритм SM-2)."""
+
+    learner = models.CharField(
+        max_length=64,
+        verbose_name="Ученик",
+        help_text="Идентификатор ученика, который хранит клиент",
+    )
+    card = models.ForeignKey(
+        FlashCard,
+        on_delete=models.CASCADE,
+        related_name="reviews",
+        verbose_name="Карточка",
+    )
+    # Дублирует card.deck, чтобы очередь набора читалась по индексу без соединения с карточками.
+    deck = models.ForeignKey(
+        FlashCardDeck,
+        on_delete=models.CASCADE,
+        related_name="reviews",
+        verbose_name="Набор",
+    )
+    ease_factor = models.FloatField(default=2.5, verbose_name="Коэффициент легкости")
+    interval_days = models.PositiveIntegerField(default=0, verbose_name="Интервал, дней")
+    repetitions = models.PositiveIntegerField(default=0, verbose_name="Успешных повторений подряд")
+    lapses = models.PositiveIntegerField(default=0, verbose_name="Забываний")
+    due_at = models.DateTimeField(verbose_name="Следующее повторение")
+    last_reviewed_at = models.DateTimeField(verbose_name="Последнее повторение")
+
+    class Meta:
+        verbose_name = "Повторение карточки"
+        verbose_name_plural = "Повторения карточек"
+        db_table = "flash_cards_review"
+        constraints = [
+            models.UniqueConstraint(fields=["learner", "card"], name="flash_review_learner_card_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["learner", "deck", "due_at"], name="flash_review_due_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.learner}: {self.card_id}"
@@ -0,0 +1,21 @@
+from rest_framework.pagination import CursorPagination
+
+
+class FlashCardDeckCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация наборов включается параметром ``page_size``.
+
+    Без него список отдается целиком, как раньше: наборов немного, а клиенту удобнее один массив.
+    """
+
+    page_size = None
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("order", "title", "id")
+
+
+class FlashCardCursorPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    ordering = ("order", "id")
@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .deck_cache import DeckIndex
+from .models import FlashCard, FlashCardReview
+
+MIN_EASE_FACTOR = 1.3
+DEFAULT_EASE_FACTOR = 2.5
+# Оценки ниже этой считаются забыванием: интервал сбрасывается.
+PASSING_QUALITY = 3
+
+SCHEDULE_FIELDS = ("ease_factor", "interval_days", "repetitions", "lapses", "due_at", "last_reviewed_at")
+
+
+def apply_sm2(review: FlashCardReview, quality: int, now: datetime) -> None:
+    """Обновляет расписание карточки по SM-2 для оценки ответа от 0 до 5."""
+
+    if quality < PASSING_QUALITY:
+        if review.repetitions:
+            review.lapses += 1
+        review.repetitions = 0
+        review.interval_days = 1
+    else:
+        if review.repetitions == 0:
+            review.interval_days = 1
+        elif review.repetitions == 1:
+            review.interval_days = 6
+        else:
+            review.interval_days = max(1, round(review.interval_days * review.ease_factor))
+        review.repetitions += 1
+
+    penalty = 5 - quality
+    review.ease_factor = max(MIN_EASE_FACTOR, review.ease_factor + 0.1 - penalty * (0.08 + penalty * 0.02))
+    review.last_reviewed_at = now
+    review.due_at = now + timedelta(days=review.interval_days)
+
+
+def select_review_cards(learner: str, deck_index: DeckIndex, limit: int) -> Tuple[List[int], int, int]:
+    """
+    Возвращает до ``limit`` карточек для повторения: сначала просроченные (самые давние первыми),
+    затем новые в порядке набора, затем ближайшие по расписанию. Также возвращает число
+    просроченных и новых карточек в выборке.
+
+    Основной запрос читает ``limit`` строк по индексу (learner, deck, due_at); полный список
+    повторенных карточек нужен, только если просроченных не хватает на сессию.
+    """
+
+    now = timezone.now()
+    # Неактивные карточки отсекаются в запросе, до LIMIT: иначе их давние расписания
+    # занимали бы места в выборке и вытесняли активные карточки.
+    reviews = FlashCardReview.objects.filter(learner=learner, deck_id=deck_index.deck_id, card__is_active=True)
+    queue = list(reviews.order_by("due_at", "id").values_list("card_id", "due_at")[:limit])
+
+    due = [card_id for card_id, due_at in queue if due_at <= now]
+    if len(due) == limit:
+        return due, len(due), 0
+
+    reviewed = set(reviews.values_list("card_id", flat=True))
+    new = [card_id for card_id in deck_index.card_ids if card_id not in reviewed][: limit - len(due)]
+    upcoming = [card_id for card_id, due_at in queue if due_at > now]
+    return due + new + upcoming[: limit - len(due) - len(new)], len(due), len(new)
+
+
+def sync_review_decks(card_ids: Iterable[int]) -> None:
+    """Переносит копию deck_id в расписаниях карточек, которые перешли в другой набор."""
+
+    card_ids = list(card_ids)
+    if not card_ids:
+        return
+    current_deck = FlashCard._base_manager.filter(pk=OuterRef("card_id")).values("deck_id")[:1]
+    FlashCardReview.objects.filter(card_id__in=card_ids).update(deck_id=Subquery(current_deck))
+
+
+def record_answers(learner: str, answers: Iterable[Tuple[int, int]]) -> Dict[str, int]:
+    """
+    Применяет оценки сессии одним проходом: читает расписания всех карточек сессии одним
+    запросом и сохраняет их через bulk_update/bulk_create. Повтор карточки в списке
+    применяется последовательно.
+    """
+
+    answers = list(answers)
+    card_ids = {card_id for card_id, _ in answers}
+    deck_ids = dict(FlashCard.objects.filter(pk__in=card_ids).values_list("pk", "deck_id"))
+    unknown = card_ids - set(deck_ids)
+    if unknown:
+        raise ValueError(f"Карточки не найдены: {', '.join(map(str, sorted(unknown)))}")
+
+    now = timezone.now()
+    with transaction.atomic():
+        existing = {
+            review.card_id: review
+            for review in FlashCardReview.objects.select_for_update().filter(learner=learner, card_id__in=card_ids)
+        }
+        created: Dict[int, FlashCardReview] = {}
+        for card_id, quality in answers:
+            review = existing.get(card_id) or created.get(card_id)
+            if review is not None:
+                # Карточка могла перейти в другой набор — выравниваем копию deck_id.
+                review.deck_id = deck_ids[card_id]
+            else:
+                review = FlashCardReview(
+                    learner=learner,
+                    card_id=card_id,
+                    deck_id=deck_ids[card_id],
+                    ease_factor=DEFAULT_EASE_FACTOR,
+                )
+                created[card_id] = review
+            apply_sm2(review, quality, now)
+
+        if existing:
+            FlashCardReview.objects.bulk_update(
+                existing.values(),
+                ["deck", *SCHEDULE_FIELDS],
+            )
+        if created:
+            # Строку мог одновременно создать параллельный запрос: select_for_update
+            # не блокирует еще не существующие строки, поэтому конфликт разрешается вставкой.
+            FlashCardReview.objects.bulk_create(
+                created.values(),
+                update_conflicts=True,
+                unique_fields=["learner", "card"],
+                update_fields=["deck", *SCHEDULE_FIELDS],
+            )
+
+    return {"updated": len(existing), "created": len(created)}
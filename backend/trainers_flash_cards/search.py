@@ -0,0 +1,126 @@
+"""
+Поиск по карточкам и наборам.
+
+На PostgreSQL карточки ищутся по GIN-индексу tsvector (совпадение по префиксам слов)
+и по триграммному индексу лицевой стороны (опечатки), на SQLite — через FTS5-таблицу
+flash_cards_card_fts (наборы — через flash_cards_deck_fts). Индексы создает миграция
+0009_card_search_index.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import FlashCard, FlashCardDeck
+
+MAX_QUERY_TOKENS = 8
+
+POSTGRES_CARD_DOCUMENT = "to_tsvector('simple', c.front_text || ' ' || c.back_text || ' ' || c.hint)"
+
+_CARD_COLUMNS = 'c.id, c.front_text, c.back_text, c.hint, c."order", d.slug, d.title'
+
+
+def query_tokens(query: str) -> List[str]:
+    return re.findall(r"\w+", query.lower())[:MAX_QUERY_TOKENS]
+
+
+def _postgres_card_rows(query: str, tokens: List[str], deck_slug: Optional[str], limit: int) -> list:
+    tsquery = " & ".join(f"{token}:*" for token in tokens)
+    deck_filter = "AND d.slug = %s" if deck_slug else ""
+    sql = f"""
+        SELECT {_CARD_COLUMNS}
+        FROM flash_cards_card c
+        JOIN flash_cards_deck d ON d.id = c.deck_id
+        WHERE c.is_active AND d.is_active {deck_filter}
+          AND ({POSTGRES_CARD_DOCUMENT} @@ to_tsquery('simple', %s) OR c.front_text %% %s)
+        ORDER BY ts_rank({POSTGRES_CARD_DOCUMENT}, to_tsquery('simple', %s)) + similarity(c.front_text, %s) DESC, c.id
+        LIMIT %s
+    """
+    params = ([deck_slug] if deck_slug else []) + [tsquery, query, tsquery, query, limit]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _sqlite_card_rows(tokens: List[str], deck_slug: Optional[str], limit: int) -> list:
+    # Каждое слово — префиксная фраза FTS5, кавычки внутри слова невозможны после \w+.
+    match = " ".join(f'"{token}"*' for token in tokens)
+    deck_filter = "AND d.slug = %s" if deck_slug else ""
+    sql = f"""
+        SELECT {_CARD_COLUMNS}
+        FROM flash_cards_card_fts
+        JOIN flash_cards_card c ON c.id = flash_cards_card_fts.rowid
+        JOIN flash_cards_deck d ON d.id = c.deck_id
+        WHERE flash_cards_card_fts MATCH %s AND c.is_active AND d.is_active {deck_filter}
+        ORDER BY flash_cards_card_fts.rank, c.id
+        LIMIT %s
+    """
+    params = [match] + ([deck_slug] if deck_slug else []) + [limit]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def _fallback_card_rows(tokens: List[str], deck_slug: Optional[str], limit: int) -> list:
+    cards = FlashCard.objects.filter(is_active=True, deck__is_active=True)
+    if deck_slug:
+        cards = cards.filter(deck__slug=deck_slug)
+    for token in tokens:
+        cards = cards.filter(Q(front_text__icontains=token) | Q(back_text__icontains=token) | Q(hint__icontains=token))
+    return list(
+        cards.order_by("id").values_list(
+            "id", "front_text", "back_text", "hint", "order", "deck__slug", "deck__title"
+        )[:limit]
+    )
+
+
+def search_cards(query: str, deck_slug: Optional[str] = None, limit: int = 20) -> List[Dict]:
+    """Активные карточки активных наборов, подходящие под запрос, — лучшие совпадения первыми."""
+
+    tokens = query_tokens(query)
+    if not tokens:
+        return []
+
+    if connection.vendor == "postgresql":
+        rows = _postgres_card_rows(query, tokens, deck_slug, limit)
+    elif connection.vendor == "sqlite":
+        rows = _sqlite_card_rows(tokens, deck_slug, limit)
+    else:
+        rows = _fallback_card_rows(tokens, deck_slug, limit)
+
+    return [
+        {
+            "id": card_id,
+            "front_text": front_text,
+            "back_text": back_text,
+            "hint": hint,
+            "order": order,
+            "deck": {"slug": slug, "title": title},
+        }
+        for card_id, front_text, back_text, hint, order, slug, title in rows
+    ]
+
+
+def search_decks(query: str, limit: int = 20) -> List[FlashCardDeck]:
+    """Активные наборы, в названии которых встречается запрос."""
+
+    decks = FlashCardDeck.objects.filter(is_active=True)
+    if connection.vendor == "sqlite":
+        # LIKE в SQLite не сравнивает кириллицу без учета регистра, поэтому — через FTS5.
+        tokens = query_tokens(query)
+        if not tokens:
+            return []
+        match = "title : (" + " ".join(f'"{token}"*' for token in tokens) + ")"
+        decks = decks.filter(
+            pk__in=RawSQL("SELECT rowid FROM flash_cards_deck_fts WHERE flash_cards_deck_fts MATCH %s", [match])
+        )
+    else:
+        # На PostgreSQL icontains по названию использует триграммный индекс по UPPER(title).
+        query = query.strip()
+        if not query:
+            return []
+        decks = decks.filter(title__icontains=query)
+    return list(decks.order_by("order", "title", "id")[:limit])
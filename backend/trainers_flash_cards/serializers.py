@@ -1,6 +1,9 @@
 from rest_framework import serializers
 
+from trainers.seeding import MAX_SEED
+
 from .models import FlashCard, FlashCardDeck
+from .services import COLUMNS_FORMAT_FULL, COLUMNS_FORMATS
 
 
 class FlashCardSerializer(serializers.ModelSerializer):
@@ -9,8 +12,19 @@ class FlashCardSerializer(serializers.ModelSerializer):
         fields = ("id", "front_text", "back_text", "hint", "order")
 
 
-class FlashCardDeckSerializer(serializers.ModelSerializer):
-    cards = FlashCardSerializer(many=True, read_only=True)
+class DynamicFieldsMixin:
+    """Оставляет в ответе только поля из аргумента ``fields`` (неизвестные имена игнорируются)."""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+
+class FlashCardDeckSummarySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    word_count = serializers.IntegerField(source="active_card_count", read_only=True)
 
     class Meta:
         model = FlashCardDeck
@@ -22,13 +36,20 @@ class FlashCardDeckSerializer(serializers.ModelSerializer):
             "accent_color",
             "is_active",
             "order",
-            "cards",
+            "word_count",
+            "sample_text",
         )
 
 
+class FlashCardDeckSerializer(FlashCardDeckSummarySerializer):
+    cards = FlashCardSerializer(many=True, read_only=True)
+
+    class Meta(FlashCardDeckSummarySerializer.Meta):
+        fields = FlashCardDeckSummarySerializer.Meta.fields + ("cards",)
+
+
 class FlashCardDeckDifficultySerializer(serializers.ModelSerializer):
-    word_count = serializers.SerializerMethodField()
-    sample_text = serializers.SerializerMethodField()
+    word_count = serializers.IntegerField(source="active_card_count", read_only=True)
 
     class Meta:
         model = FlashCardDeck
@@ -41,18 +62,30 @@ class FlashCardDeckDifficultySerializer(serializers.ModelSerializer):
             "sample_text",
         )
 
-    def get_word_count(self, deck: FlashCardDeck) -> int:
-        return deck.cards.filter(is_active=True).count()
 
-    def get_sample_text(self, deck: FlashCardDeck) -> str:
-        words = list(deck.cards.filter(is_active=True).order_by("order", "id").values_list("front_text", flat=True))
-        return ", ".join(words)
+class FlashCardSearchRequestSerializer(serializers.Serializer):
+    q = serializers.CharField(min_length=2, max_length=100, trim_whitespace=True)
+    deck = serializers.SlugField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class FlashCardSearchDeckSerializer(serializers.Serializer):
+    slug = serializers.SlugField()
+    title = serializers.CharField()
+
+
+class FlashCardSearchResultSerializer(FlashCardSerializer):
+    deck = FlashCardSearchDeckSerializer()
+
+    class Meta(FlashCardSerializer.Meta):
+        fields = FlashCardSerializer.Meta.fields + ("deck",)
 
 
 class FlashCardSessionRequestSerializer(serializers.Serializer):
     deck_slug = serializers.SlugField()
     speed = serializers.FloatField(min_value=0.05, max_value=4.0)
     word_count = serializers.IntegerField(min_value=2)
+    seed = serializers.IntegerField(min_value=0, max_value=MAX_SEED, required=False)
 
 
 class FlashCardSessionCardSerializer(serializers.Serializer):
@@ -64,8 +97,37 @@ class FlashCardSessionResponseSerializer(serializers.Serializer):
     deck = serializers.DictField()
     speed = serializers.FloatField()
     word_count = serializers.IntegerField()
+    seed = serializers.IntegerField()
+    sequence = FlashCardSessionCardSerializer(many=True)
+    recall = FlashCardSessionCardSerializer(many=True)
+
+
+class FlashCardReviewSessionRequestSerializer(serializers.Serializer):
+    learner = serializers.SlugField(max_length=64)
+    deck_slug = serializers.SlugField()
+    word_count = serializers.IntegerField(min_value=1, max_value=200)
+    seed = serializers.IntegerField(min_value=0, max_value=MAX_SEED, required=False)
+
+
+class FlashCardReviewSessionResponseSerializer(serializers.Serializer):
+    deck = serializers.DictField()
+    learner = serializers.CharField()
+    word_count = serializers.IntegerField()
+    seed = serializers.IntegerField()
     sequence = FlashCardSessionCardSerializer(many=True)
     recall = FlashCardSessionCardSerializer(many=True)
+    due_count = serializers.IntegerField()
+    new_count = serializers.IntegerField()
+
+
+class FlashCardReviewAnswerSerializer(serializers.Serializer):
+    card_id = serializers.IntegerField(min_value=1)
+    quality = serializers.IntegerField(min_value=0, max_value=5)
+
+
+class FlashCardReviewAnswersRequestSerializer(serializers.Serializer):
+    learner = serializers.SlugField(max_length=64)
+    answers = FlashCardReviewAnswerSerializer(many=True, allow_empty=False, max_length=500)
 
 
 class FlashCardAbacusSessionRequestSerializer(serializers.Serializer):
@@ -73,6 +135,9 @@ class FlashCardAbacusSessionRequestSerializer(serializers.Serializer):
     speed = serializers.FloatField(min_value=0.1, max_value=10.0)
     quantity = serializers.IntegerField(min_value=2, max_value=99)
     max_digit = serializers.IntegerField(min_value=2, max_value=9)
+    seed = serializers.IntegerField(min_value=0, max_value=MAX_SEED, required=False)
+    # digits — строка цифр числа, bitmask — полубайт на столбец (бит 3 — верхняя косточка).
+    columns_format = serializers.ChoiceField(choices=COLUMNS_FORMATS, default=COLUMNS_FORMAT_FULL)
 
 
 class FlashCardAbacusColumnSerializer(serializers.Serializer):
@@ -98,4 +163,15 @@ class FlashCardAbacusSessionResponseSerializer(serializers.Serializer):
     cards = FlashCardAbacusCardSerializer(many=True)
     numbers = serializers.ListField(child=serializers.IntegerField())
     total = serializers.IntegerField()
-    speed = serializers.FloatField()
\ No newline at end of file
+    speed = serializers.FloatField()
+    seed = serializers.IntegerField()
+
+
+class FlashCardAbacusCompactSessionResponseSerializer(serializers.Serializer):
+    settings = FlashCardAbacusSettingsSerializer()
+    numbers = serializers.ListField(child=serializers.IntegerField())
+    columns_format = serializers.CharField()
+    columns = serializers.ListField()
+    total = serializers.IntegerField()
+    speed = serializers.FloatField()
+    seed = serializers.IntegerField()
@@ -1,7 +1,5 @@
 import random
-from dataclasses import dataclass
-from typing import Dict, List
-
+from typing import Dict, Iterator, List, Optional
 
 DIFFICULTY_RANGES: Dict[int, tuple[int, int]] = {
     1: (0, 10),
@@ -18,41 +16,51 @@ DIFFICULTY_LABELS: Dict[int, str] = {
 }
 
 
-@dataclass
-class AbacusColumn:
-    upper_active: bool
-    lower_active_count: int
-
-
-def _digit_to_abacus_column(digit: int) -> AbacusColumn:
-    if digit < 0 or digit > 9:
-        raise ValueError("Digit must be between 0 and 9")
-
-    upper_active = digit >= 5
-    lower_active_count = digit - 5 if upper_active else digit
-
-    return AbacusColumn(upper_active=upper_active, lower_active_count=lower_active_count)
+MAX_ABACUS_VALUE = 9999
+
+COLUMNS_FORMAT_FULL = "full"
+COLUMNS_FORMAT_DIGITS = "digits"
+COLUMNS_FORMAT_BITMASK = "bitmask"
+COLUMNS_FORMATS = (COLUMNS_FORMAT_FULL, COLUMNS_FORMAT_DIGITS, COLUMNS_FORMAT_BITMASK)
+
+# Столбец абакуса для цифры: верхняя косточка (пятерка) и число нижних косточек.
+_DIGIT_COLUMNS = tuple({"upper_active": digit >= 5, "lower_active_count": digit % 5} for digit in range(10))
+
+# Таблицы для всех чисел 0–9999. Словари столбцов общие для всех карточек — только для чтения.
+ABACUS_DIGITS = tuple(str(value) for value in range(MAX_ABACUS_VALUE + 1))
+ABACUS_COLUMNS = tuple(tuple(_DIGIT_COLUMNS[int(char)] for char in digits) for digits in ABACUS_DIGITS)
+# Полубайт на столбец, старший столбец в старших битах: бит 3 — верхняя косточка, биты 0–2 — нижние.
+ABACUS_BITMASKS = tuple(
+    sum(
+        ((digit >= 5) << 3 | digit % 5) << (4 * (len(digits) - 1 - position))
+        for position, digit in enumerate(map(int, digits))
+    )
+    for digits in ABACUS_DIGITS
+)
+
+_COLUMN_TABLES = {
+    COLUMNS_FORMAT_FULL: ABACUS_COLUMNS,
+    COLUMNS_FORMAT_DIGITS: ABACUS_DIGITS,
+    COLUMNS_FORMAT_BITMASK: ABACUS_BITMASKS,
+}
 
 
-def _number_to_columns(number: int) -> List[AbacusColumn]:
-    if number == 0:
-        return [_digit_to_abacus_column(0)]
+def encode_abacus_columns(numbers: List[int], columns_format: str) -> List:
+    """Столбцы абакуса для каждого числа в выбранном формате (поиск по готовой таблице)."""
 
-    digits = [int(char) for char in str(number)]
-    return [_digit_to_abacus_column(digit) for digit in digits]
+    table = _COLUMN_TABLES[columns_format]
+    return [table[number] for number in numbers]
 
 
-def _generate_number(difficulty: int, max_digit: int) -> int:
+def _generate_number(difficulty: int, max_digit: int, rng: random.Random) -> int:
     digits_count = max(1, min(4, difficulty))
-    digits: List[str] = []
+    value = 0
 
     for position in range(digits_count):
         min_digit = 1 if digits_count > 1 and position == 0 else 0
         min_digit = min(min_digit, max_digit)
-        digit = random.randint(min_digit, max_digit)
-        digits.append(str(digit))
+        value = value * 10 + rng.randint(min_digit, max_digit)
 
-    value = int("".join(digits))
     min_value, max_value = DIFFICULTY_RANGES.get(difficulty, (0, 10))
 
     if value < min_value:
@@ -62,46 +70,46 @@ def _generate_number(difficulty: int, max_digit: int) -> int:
     return value
 
 
-def generate_flashcards_abacus_session(
+def iter_flashcards_abacus_cards(
     difficulty: int,
-    speed: float,
     quantity: int,
     max_digit: int,
-) -> Dict:
-    numbers: List[int] = []
-
-    for _ in range(quantity):
-        number = _generate_number(difficulty, max_digit)
-        numbers.append(number)
-
-    total = sum(numbers)
-    cards = [
-        {
-            "index": idx + 1,
-            "value": value,
-            "columns": [
-                {
-                    "upper_active": column.upper_active,
-                    "lower_active_count": column.lower_active_count,
-                }
-                for column in _number_to_columns(value)
-            ],
-        }
-        for idx, value in enumerate(numbers)
-    ]
-
-    settings = {
+    rng: Optional[random.Random] = None,
+    columns_format: str = COLUMNS_FORMAT_FULL,
+) -> Iterator[Dict]:
+    """Карточки абакуса по одной, в порядке показа."""
+
+    rng = rng if rng is not None else random.Random()
+    table = _COLUMN_TABLES[columns_format]
+
+    for idx in range(quantity):
+        value = _generate_number(difficulty, max_digit, rng)
+        yield {"index": idx + 1, "value": value, "columns": table[value]}
+
+
+def build_flashcards_abacus_settings(difficulty: int, quantity: int, max_digit: int) -> Dict:
+    return {
         "difficulty": difficulty,
         "difficulty_label": DIFFICULTY_LABELS.get(difficulty, "1–10"),
         "quantity": quantity,
         "max_digit": max_digit,
     }
 
+
+def generate_flashcards_abacus_session(
+    difficulty: int,
+    speed: float,
+    quantity: int,
+    max_digit: int,
+    rng: Optional[random.Random] = None,
+) -> Dict:
+    cards = list(iter_flashcards_abacus_cards(difficulty, quantity, max_digit, rng))
+    numbers = [card["value"] for card in cards]
+
     return {
-        "settings": settings,
+        "settings": build_flashcards_abacus_settings(difficulty, quantity, max_digit),
         "cards": cards,
         "numbers": numbers,
-        "total": total,
+        "total": sum(numbers),
         "speed": speed,
     }
-
@@ -0,0 +1,60 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .deck_cache import invalidate_deck_index
+from .models import FlashCard, FlashCardDeck
+from .reviews import sync_review_decks
+from .stats import apply_card_change
+
+
+@receiver(pre_save, sender=FlashCard)
+def remember_previous_state(sender, instance: FlashCard, **kwargs) -> None:
+    if instance.pk is None:
+        instance._previous_state = None
+        return
+    instance._previous_state = (
+        FlashCard.objects.filter(pk=instance.pk).values("deck_id", "is_active", "front_text", "order").first()
+    )
+
+
+@receiver(post_save, sender=FlashCard)
+def update_deck_after_card_save(sender, instance: FlashCard, created: bool, **kwargs) -> None:
+    previous = getattr(instance, "_previous_state", None)
+
+    if created or previous is None:
+        apply_card_change(instance.deck_id, count_delta=int(instance.is_active), sample_changed=instance.is_active)
+        return
+
+    if previous["deck_id"] != instance.deck_id:
+        sync_review_decks([instance.pk])
+        was_active = previous["is_active"]
+        apply_card_change(previous["deck_id"], count_delta=-int(was_active), sample_changed=was_active)
+        apply_card_change(instance.deck_id, count_delta=int(instance.is_active), sample_changed=instance.is_active)
+        return
+
+    count_delta = int(instance.is_active) - int(previous["is_active"])
+    sample_changed = bool(count_delta) or (
+        instance.is_active
+        and (previous["front_text"] != instance.front_text or previous["order"] != instance.order)
+    )
+    apply_card_change(instance.deck_id, count_delta=count_delta, sample_changed=sample_changed)
+
+
+@receiver(post_delete, sender=FlashCard)
+def update_deck_after_card_delete(sender, instance: FlashCard, origin=None, **kwargs) -> None:
+    if origin is not None and getattr(origin, "model", type(origin)) is not FlashCard:
+        # Карточка удаляется каскадом вместе со своим набором — обновлять нечего.
+        return
+    apply_card_change(instance.deck_id, count_delta=-int(instance.is_active), sample_changed=instance.is_active)
+
+
+@receiver(post_save, sender=FlashCardDeck)
+def update_deck_version(sender, instance: FlashCardDeck, **kwargs) -> None:
+    FlashCardDeck.objects.filter(pk=instance.pk).update(content_version=F("content_version") + 1)
+    invalidate_deck_index(instance.pk)
+
+
+@receiver(post_delete, sender=FlashCardDeck)
+def invalidate_deleted_deck(sender, instance: FlashCardDeck, **kwargs) -> None:
+    invalidate_deck_index(instance.pk)
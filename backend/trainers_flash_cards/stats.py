@@ -0,0 +1,115 @@
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+from django.db.models import F
+from django.utils import timezone
+
+from .deck_cache import invalidate_deck_index
+from .models import FlashCard, FlashCardDeck
+
+SAMPLE_TEXT_SEPARATOR = ", "
+# sample_text — превью для списка наборов, а не полный список слов: его размер не растет
+# вместе с набором, и пересборка читает не больше SAMPLE_TEXT_WORDS карточек по индексу.
+SAMPLE_TEXT_WORDS = 12
+
+_deferred = threading.local()
+
+
+def active_sample_text(deck_id: int) -> str:
+    words = (
+        FlashCard.objects.filter(deck_id=deck_id, is_active=True)
+        .order_by("order", "id")
+        .values_list("front_text", flat=True)[:SAMPLE_TEXT_WORDS]
+    )
+    return SAMPLE_TEXT_SEPARATOR.join(words)
+
+
+def apply_card_change(deck_id: int, count_delta: int = 0, sample_changed: bool = False) -> None:
+    """
+    Инкрементально обновляет статистику набора после изменения одной карточки:
+    сдвигает счетчик активных карточек, пересобирает sample_text, только если
+    изменились активность, текст или порядок карточки, и увеличивает content_version и updated_at.
+    Внутри deferred_deck_stats набор только откладывается до общего пересчета.
+    """
+
+    pending = getattr(_deferred, "deck_ids", None)
+    if pending is not None:
+        pending.add(deck_id)
+        return
+
+    updates = {"content_version": F("content_version") + 1, "updated_at": timezone.now()}
+    if count_delta:
+        updates["active_card_count"] = F("active_card_count") + count_delta
+    if sample_changed:
+        updates["sample_text"] = active_sample_text(deck_id)
+    FlashCardDeck.objects.filter(pk=deck_id).update(**updates)
+    invalidate_deck_index(deck_id)
+
+
+def refresh_deck_stats(deck_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Пересчитывает статистику указанных наборов (или всех) одним чтением карточек.
+    Используется после массовых операций и командой rebuild_deck_stats.
+    Возвращает количество обновленных наборов.
+    """
+
+    decks = FlashCardDeck.objects.all()
+    cards = FlashCard.objects.filter(is_active=True)
+    if deck_ids is not None:
+        deck_ids = set(deck_ids)
+        if not deck_ids:
+            return 0
+        decks = decks.filter(pk__in=deck_ids)
+        cards = cards.filter(deck_id__in=deck_ids)
+
+    counts: Dict[int, int] = defaultdict(int)
+    words: Dict[int, List[str]] = defaultdict(list)
+    for deck_id, front_text in cards.order_by("deck_id", "order", "id").values_list("deck_id", "front_text"):
+        counts[deck_id] += 1
+        if len(words[deck_id]) < SAMPLE_TEXT_WORDS:
+            words[deck_id].append(front_text)
+
+    updated = 0
+    for deck_id in decks.values_list("pk", flat=True):
+        FlashCardDeck.objects.filter(pk=deck_id).update(
+            active_card_count=counts.get(deck_id, 0),
+            sample_text=SAMPLE_TEXT_SEPARATOR.join(words.get(deck_id, [])),
+            content_version=F("content_version") + 1,
+            updated_at=timezone.now(),
+        )
+        invalidate_deck_index(deck_id)
+        updated += 1
+    return updated
+
+
+def schedule_deck_stats_refresh(deck_ids: Iterable[int]) -> None:
+    """Пересчитывает статистику сразу или копит наборы, если открыт блок deferred_deck_stats."""
+
+    pending = getattr(_deferred, "deck_ids", None)
+    if pending is None:
+        refresh_deck_stats(deck_ids)
+    else:
+        pending.update(deck_ids)
+
+
+@contextmanager
+def deferred_deck_stats():
+    """
+    Откладывает пересчет статистики после массовых операций до выхода из блока,
+    чтобы пакетный импорт читал карточки каждого набора один раз, а не после каждого пакета.
+    """
+
+    if getattr(_deferred, "deck_ids", None) is not None:
+        yield
+        return
+
+    _deferred.deck_ids = set()
+    try:
+        yield
+    except BaseException:
+        _deferred.deck_ids = None
+        raise
+    deck_ids, _deferred.deck_ids = _deferred.deck_ids, None
+    refresh_deck_stats(deck_ids)
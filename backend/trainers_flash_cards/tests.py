@@ -1,13 +1,32 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.urls import reverse
 from rest_framework.test import APIClient, APITestCase
 
 from trainers.models import Trainer
 
-from .models import FlashCard, FlashCardDeck
+from .deck_cache import deck_index_cache_key
+from .models import FlashCard, FlashCardDeck, FlashCardReview
+from .reviews import apply_sm2
+from .stats import SAMPLE_TEXT_WORDS
 
 
 class FlashCardDeckApiTests(APITestCase):
     def setUp(self) -> None:
+        cache.clear()
         self.trainer = Trainer.objects.get(slug='flash-words')
         self.deck = FlashCardDeck.objects.create(
             slug='basic-phrases',
@@ -31,22 +50,124 @@ class FlashCardDeckApiTests(APITestCase):
         )
         self.client = APIClient()
 
-    def test_deck_list_returns_cards(self) -> None:
+    def test_deck_list_returns_summaries(self) -> None:
         url = reverse('flashcard-deck-list')
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         self.assertGreaterEqual(len(response.data), 1)
         deck_payload = next((item for item in response.data if item['slug'] == self.deck.slug), None)
         self.assertIsNotNone(deck_payload)
-        self.assertEqual(len(deck_payload['cards']), 2)
+        self.assertNotIn('cards', deck_payload)
+        self.assertEqual(deck_payload['word_count'], 2)
+        self.assertEqual(deck_payload['sample_text'], 'Hello, Bye')
+
+    def test_deck_list_includes_cards_on_request(self) -> None:
+        response = self.client.get(reverse('flashcard-deck-list'), {'include': 'cards'})
+        deck_payload = next(item for item in response.data if item['slug'] == self.deck.slug)
+        self.assertEqual([card['front_text'] for card in deck_payload['cards']], ['Hello', 'Bye'])
+
+    def test_deck_list_limits_fields(self) -> None:
+        response = self.client.get(reverse('flashcard-deck-list'), {'fields': 'slug,word_count'})
+        for item in response.data:
+            self.assertEqual(set(item), {'slug', 'word_count'})
+
+    def test_deck_list_cursor_pagination(self) -> None:
+        for index in range(3):
+            FlashCardDeck.objects.create(
+                slug=f'extra-{index}',
+                title=f'Набор {index}',
+                trainer=self.trainer,
+                order=10 + index,
+            )
+        expected = list(
+            FlashCardDeck.objects.filter(is_active=True).order_by('order', 'title', 'id').values_list('slug', flat=True)
+        )
+
+        seen = []
+        response = self.client.get(reverse('flashcard-deck-list'), {'page_size': 2, 'fields': 'slug'})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen.extend(item['slug'] for item in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(seen, expected)
 
     def test_deck_detail(self) -> None:
         url = reverse('flashcard-deck-detail', kwargs={'slug': self.deck.slug})
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data['slug'], self.deck.slug)
+        self.assertEqual(response.data['word_count'], 2)
+
+        response = self.client.get(url, {'include': 'cards'})
         self.assertEqual(len(response.data['cards']), 2)
 
+    def test_deck_cards_are_paginated(self) -> None:
+        url = reverse('flashcard-deck-cards', kwargs={'slug': self.deck.slug})
+        first = self.client.get(url, {'page_size': 1})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual([card['front_text'] for card in first.data['results']], ['Hello'])
+
+        second = self.client.get(first.data['next'])
+        self.assertEqual([card['front_text'] for card in second.data['results']], ['Bye'])
+        self.assertIsNone(second.data['next'])
+
+        missing = self.client.get(reverse('flashcard-deck-cards', kwargs={'slug': 'missing'}))
+        self.assertEqual(missing.status_code, 404)
+
+    def test_deck_list_supports_conditional_get(self) -> None:
+        url = reverse('flashcard-deck-list')
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('"'))
+        self.assertFalse(response.has_header('Last-Modified'))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        card = FlashCard.objects.get(deck=self.deck, front_text='Bye')
+        card.back_text = 'До свидания'
+        card.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        response = self.client.get(url, {'include': 'cards'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_deactivated_deck_is_not_hidden_by_if_modified_since(self) -> None:
+        url = reverse('flashcard-deck-list')
+        before = self.client.get(url)
+        # Любая дата позже всех updated_at: раньше такой запрос получал 304.
+        since = 'Thu, 01 Jan 2099 00:00:00 GMT'
+
+        self.deck.is_active = False
+        self.deck.save()
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), len(before.data) - 1)
+
+        detail = self.client.get(
+            reverse('flashcard-deck-detail', kwargs={'slug': self.deck.slug}),
+            HTTP_IF_MODIFIED_SINCE=since,
+        )
+        self.assertEqual(detail.status_code, 404)
+
+    def test_deck_detail_supports_conditional_get(self) -> None:
+        url = reverse('flashcard-deck-detail', kwargs={'slug': self.deck.slug})
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        missing = self.client.get(reverse('flashcard-deck-detail', kwargs={'slug': 'missing'}))
+        self.assertEqual(missing.status_code, 404)
+
     def test_session_endpoint(self) -> None:
         url = reverse('flashcard-session')
         response = self.client.post(
@@ -63,3 +184,496 @@ class FlashCardDeckApiTests(APITestCase):
         self.assertEqual(response.data['word_count'], 2)
         self.assertEqual(len(response.data['sequence']), 2)
         self.assertEqual(len(response.data['recall']), 2)
+        self.assertIn('seed', response.data)
+
+    def test_session_endpoint_is_reproducible_with_seed(self) -> None:
+        url = reverse('flashcard-session')
+        payload = {'deck_slug': self.deck.slug, 'speed': 0.8, 'word_count': 2, 'seed': 11}
+        first = self.client.post(url, payload, format='json')
+        second = self.client.post(url, payload, format='json')
+
+        self.assertEqual(first.data['seed'], 11)
+        self.assertEqual(first.data['sequence'], second.data['sequence'])
+        self.assertEqual(first.data['recall'], second.data['recall'])
+
+    def test_abacus_session_is_reproducible_with_seed(self) -> None:
+        url = reverse('flashcard-abacus-session')
+        payload = {'difficulty': 3, 'speed': 1.0, 'quantity': 20, 'max_digit': 7, 'seed': 99}
+        first = self.client.post(url, payload, format='json')
+        second = self.client.post(url, payload, format='json')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data['seed'], 99)
+        self.assertEqual(first.data['numbers'], second.data['numbers'])
+
+    def test_abacus_compact_formats_match_full_columns(self) -> None:
+        url = reverse('flashcard-abacus-session')
+        payload = {'difficulty': 4, 'speed': 1.0, 'quantity': 30, 'max_digit': 9, 'seed': 5}
+        full = self.client.post(url, payload, format='json').data
+        digits = self.client.post(url, {**payload, 'columns_format': 'digits'}, format='json').data
+        bitmask = self.client.post(url, {**payload, 'columns_format': 'bitmask'}, format='json').data
+
+        self.assertNotIn('cards', digits)
+        self.assertEqual(digits['numbers'], full['numbers'])
+        for card, digit_string, mask in zip(full['cards'], digits['columns'], bitmask['columns']):
+            self.assertEqual(digit_string, str(card['value']))
+            decoded = [
+                {'upper_active': bool(mask >> shift & 0b1000), 'lower_active_count': mask >> shift & 0b111}
+                for shift in range(4 * (len(digit_string) - 1), -1, -4)
+            ]
+            self.assertEqual(decoded, [dict(column) for column in card['columns']])
+            self.assertEqual(
+                [column['lower_active_count'] + 5 * column['upper_active'] for column in card['columns']],
+                [int(char) for char in digit_string],
+            )
+
+    def test_abacus_stream_emits_cards(self) -> None:
+        response = self.client.get(
+            reverse('flashcard-abacus-session-stream'),
+            {'difficulty': 2, 'speed': 1.0, 'quantity': 5, 'max_digit': 9},
+            HTTP_ACCEPT='text/event-stream',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(body.count('event: card'), 5)
+        self.assertTrue(body.startswith('event: settings'))
+        self.assertIn('event: end', body)
+
+    def test_session_is_built_from_cached_deck_index(self) -> None:
+        FlashCard.objects.bulk_create(
+            FlashCard(deck=self.deck, front_text=f'Слово {index}', back_text='-', order=index + 3)
+            for index in range(200)
+        )
+        url = reverse('flashcard-session')
+        payload = {'deck_slug': self.deck.slug, 'speed': 0.8, 'word_count': 5}
+
+        with self.assertNumQueries(2):
+            response = self.client.post(url, payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len({card['id'] for card in response.data['sequence']}), 5)
+
+        # Попадание в кеш сверяет только content_version набора.
+        with self.assertNumQueries(1):
+            response = self.client.post(url, payload, format='json')
+        self.assertEqual(len(response.data['sequence']), 5)
+
+    def test_card_changes_invalidate_deck_index(self) -> None:
+        url = reverse('flashcard-session')
+        payload = {'deck_slug': self.deck.slug, 'speed': 0.8, 'word_count': 10}
+        self.client.post(url, payload, format='json')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            card = FlashCard.objects.create(deck=self.deck, front_text='Thanks', back_text='Спасибо', order=3)
+        response = self.client.post(url, payload, format='json')
+        self.assertIn('Thanks', {item['text'] for item in response.data['sequence']})
+
+        card.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            card.save()
+        response = self.client.post(url, payload, format='json')
+        self.assertNotIn('Thanks', {item['text'] for item in response.data['sequence']})
+
+        self.deck.title = 'Новые фразы'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.deck.save()
+        response = self.client.post(url, payload, format='json')
+        self.assertEqual(response.data['deck']['title'], 'Новые фразы')
+
+    def test_cached_index_is_checked_against_content_version(self) -> None:
+        url = reverse('flashcard-session')
+        payload = {'deck_slug': self.deck.slug, 'speed': 0.8, 'word_count': 10}
+        self.client.post(url, payload, format='json')
+
+        # Как правка из другого процесса: запись в кеше этого процесса никто не удаляет.
+        FlashCard._base_manager.filter(deck=self.deck, front_text='Hello').update(front_text='Привет')
+        FlashCardDeck.objects.filter(pk=self.deck.pk).update(content_version=F('content_version') + 1)
+
+        response = self.client.post(url, payload, format='json')
+        self.assertIn('Привет', {item['text'] for item in response.data['sequence']})
+
+    def test_deck_index_is_invalidated_after_commit(self) -> None:
+        self.client.post(
+            reverse('flashcard-session'), {'deck_slug': self.deck.slug, 'speed': 0.8, 'word_count': 2}, format='json'
+        )
+        key = deck_index_cache_key(self.deck.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FlashCard.objects.create(deck=self.deck, front_text='Thanks', back_text='Спасибо', order=3)
+            self.assertIsNotNone(cache.get(key))
+        self.assertIsNone(cache.get(key))
+
+    def test_session_for_unknown_deck_returns_404(self) -> None:
+        response = self.client.post(
+            reverse('flashcard-session'),
+            {'deck_slug': 'missing', 'speed': 0.8, 'word_count': 2},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def _catalog_query_count(self) -> int:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('trainer-list'))
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_catalog_query_count_does_not_depend_on_deck_count(self) -> None:
+        # Первый запрос прогревает кеши процесса (например, конфигурацию теста Струпа).
+        self._catalog_query_count()
+        baseline = self._catalog_query_count()
+
+        for index in range(10):
+            deck = FlashCardDeck.objects.create(
+                slug=f'extra-deck-{index}',
+                title=f'Набор {index}',
+                trainer=self.trainer,
+                order=10 + index,
+            )
+            FlashCard.objects.create(deck=deck, front_text=f'слово {index}', back_text='-', order=1)
+
+        self.assertEqual(self._catalog_query_count(), baseline)
+
+        response = self.client.get(reverse('trainer-list'))
+        flash_words = next(item for item in response.data if item['slug'] == 'flash-words')
+        difficulty = next(item for item in flash_words['difficulties'] if item['id'] == self.deck.id)
+        self.assertEqual(difficulty['word_count'], 2)
+        self.assertEqual(difficulty['sample_text'], 'Hello, Bye')
+
+
+class FlashCardDeckStatsTests(TestCase):
+    def setUp(self) -> None:
+        self.deck = FlashCardDeck.objects.create(
+            slug='stats-deck',
+            title='Статистика',
+            trainer=Trainer.objects.get(slug='flash-words'),
+        )
+
+    def assertStats(self, count: int, sample_text: str) -> None:
+        self.deck.refresh_from_db()
+        self.assertEqual(self.deck.active_card_count, count)
+        self.assertEqual(self.deck.sample_text, sample_text)
+
+    def test_single_card_changes_update_stats(self) -> None:
+        first = FlashCard.objects.create(deck=self.deck, front_text='кот', back_text='-', order=2)
+        FlashCard.objects.create(deck=self.deck, front_text='дом', back_text='-', order=1)
+        self.assertStats(2, 'дом, кот')
+
+        first.front_text = 'кит'
+        first.save()
+        self.assertStats(2, 'дом, кит')
+
+        first.is_active = False
+        first.save()
+        self.assertStats(1, 'дом')
+
+        first.delete()
+        self.assertStats(1, 'дом')
+
+        version = self.deck.content_version
+        FlashCard.objects.filter(deck=self.deck).first().delete()
+        self.assertStats(0, '')
+        self.assertGreater(self.deck.content_version, version)
+
+    def test_bulk_operations_update_stats(self) -> None:
+        cards = FlashCard.objects.bulk_create(
+            FlashCard(deck=self.deck, front_text=word, back_text='-', order=index)
+            for index, word in enumerate(['а', 'б', 'в'])
+        )
+        self.assertStats(3, 'а, б, в')
+
+        FlashCard.objects.filter(front_text='б').update(is_active=False)
+        self.assertStats(2, 'а, в')
+
+        cards[0].front_text = 'я'
+        FlashCard.objects.bulk_update(cards[:1], ['front_text'])
+        self.assertStats(2, 'я, в')
+
+    def _create_cards(self, count: int) -> None:
+        FlashCard.objects.bulk_create(
+            FlashCard(deck=self.deck, front_text=f'слово {index}', back_text='-', order=index) for index in range(count)
+        )
+
+    def test_queryset_delete_refreshes_stats_once(self) -> None:
+        self._create_cards(60)
+
+        with self.assertNumQueries(7):
+            FlashCard.objects.filter(deck=self.deck, order__lt=40).delete()
+        self.assertStats(20, ', '.join(f'слово {index}' for index in range(40, 52)))
+
+    def test_sample_text_keeps_first_words_only(self) -> None:
+        self._create_cards(30)
+        self.assertStats(30, ', '.join(f'слово {index}' for index in range(SAMPLE_TEXT_WORDS)))
+
+        card = FlashCard.objects.get(deck=self.deck, order=29)
+        card.back_text = 'новый ответ'
+        # Чтение прежнего состояния, сохранение карточки и сдвиг версии набора — без пересборки превью.
+        with self.assertNumQueries(3):
+            card.save()
+
+        FlashCard.objects.filter(deck=self.deck, order=0).update(is_active=False)
+        self.assertStats(29, ', '.join(f'слово {index}' for index in range(1, SAMPLE_TEXT_WORDS + 1)))
+
+    def test_deck_delete_skips_card_stats(self) -> None:
+        self._create_cards(60)
+
+        with self.assertNumQueries(5):
+            self.deck.delete()
+        self.assertFalse(FlashCard.objects.filter(deck_id=self.deck.pk).exists())
+
+    def test_stale_deck_save_keeps_stats(self) -> None:
+        stale_deck = FlashCardDeck.objects.get(pk=self.deck.pk)
+        FlashCard.objects.create(deck=self.deck, front_text='кот', back_text='-')
+
+        stale_deck.title = 'Новое название'
+        stale_deck.save()
+        self.assertStats(1, 'кот')
+
+    def test_rebuild_command_fixes_drift(self) -> None:
+        FlashCard.objects.create(deck=self.deck, front_text='кот', back_text='-')
+        FlashCardDeck.objects.filter(pk=self.deck.pk).update(active_card_count=42, sample_text='')
+
+        call_command('rebuild_deck_stats', 'stats-deck', stdout=StringIO())
+        self.assertStats(1, 'кот')
+
+
+class FlashCardTransferTests(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def _write(self, name: str, content: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8', newline='') as stream:
+            stream.write(content)
+        return path
+
+    def test_csv_import_upserts_by_slug_and_order(self) -> None:
+        path = self._write(
+            'cards.csv',
+            'deck_slug,deck_title,order,front_text,back_text,is_active\n'
+            'import-deck,Импорт,1,кот,cat,1\n'
+            'import-deck,,2,дом,house,1\n'
+            'import-deck,,3,лес,forest,0\n',
+        )
+        call_command('import_flashcards', path, batch_size=2, stdout=StringIO())
+
+        deck = FlashCardDeck.objects.get(slug='import-deck')
+        self.assertEqual(deck.title, 'Импорт')
+        self.assertEqual(deck.active_card_count, 2)
+        self.assertEqual(deck.sample_text, 'кот, дом')
+
+        path = self._write(
+            'update.csv',
+            'deck_slug,order,front_text,back_text\n'
+            'import-deck,2,сад,garden\n'
+            'import-deck,4,мир,world\n',
+        )
+        call_command('import_flashcards', path, stdout=StringIO())
+
+        self.assertEqual(FlashCard.objects.filter(deck=deck).count(), 4)
+        self.assertEqual(FlashCard.objects.get(deck=deck, order=2).front_text, 'сад')
+        deck.refresh_from_db()
+        self.assertEqual(deck.sample_text, 'кот, сад, мир')
+
+    def test_export_and_import_round_trip(self) -> None:
+        deck = FlashCardDeck.objects.create(
+            slug='export-deck',
+            title='Экспорт',
+            trainer=Trainer.objects.get(slug='flash-words'),
+        )
+        FlashCard.objects.bulk_create(
+            FlashCard(deck=deck, front_text=f'слово {index}', back_text='-', order=index) for index in range(5)
+        )
+        path = os.path.join(self.directory.name, 'export.jsonl')
+        call_command('export_flashcards', path, deck=['export-deck'], stdout=StringIO())
+
+        with open(path, encoding='utf-8') as stream:
+            records = [json.loads(line) for line in stream]
+        self.assertEqual([record['front_text'] for record in records], [f'слово {index}' for index in range(5)])
+
+        FlashCard.objects.filter(deck=deck).delete()
+        call_command('import_flashcards', path, stdout=StringIO())
+        deck.refresh_from_db()
+        self.assertEqual(deck.active_card_count, 5)
+
+    def test_invalid_row_rolls_back_import(self) -> None:
+        path = self._write(
+            'broken.jsonl',
+            '{"deck_slug": "broken-deck", "order": 1, "front_text": "кот"}\n'
+            '{"deck_slug": "broken-deck", "order": "x", "front_text": "дом"}\n',
+        )
+        with self.assertRaisesMessage(CommandError, 'Строка 2'):
+            call_command('import_flashcards', path, batch_size=1, stdout=StringIO())
+        self.assertFalse(FlashCardDeck.objects.filter(slug='broken-deck').exists())
+
+    def test_invalid_slug_and_long_title_are_rejected(self) -> None:
+        path = self._write('bad-slug.csv', 'deck_slug,order,front_text\nDeck One,1,кот\n')
+        with self.assertRaisesMessage(CommandError, 'Строка 2: deck_slug'):
+            call_command('import_flashcards', path, stdout=StringIO())
+
+        path = self._write('long-title.csv', f'deck_slug,deck_title,order,front_text\nlong-deck,{"я" * 201},1,кот\n')
+        with self.assertRaisesMessage(CommandError, 'Строка 2: deck_title длиннее 200 символов'):
+            call_command('import_flashcards', path, stdout=StringIO())
+        self.assertFalse(FlashCardDeck.objects.filter(slug__in=['long-deck', 'Deck One']).exists())
+
+
+class FlashCardReviewTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.deck = FlashCardDeck.objects.create(
+            slug='review-deck',
+            title='Повторение',
+            trainer=Trainer.objects.get(slug='flash-words'),
+        )
+        self.cards = FlashCard.objects.bulk_create(
+            FlashCard(deck=self.deck, front_text=word, back_text='-', order=index)
+            for index, word in enumerate(['кот', 'дом', 'лес'])
+        )
+
+    def _session(self, word_count: int):
+        response = self.client.post(
+            reverse('flashcard-review-session'),
+            {'learner': 'learner-1', 'deck_slug': 'review-deck', 'word_count': word_count},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_sm2_intervals_grow_and_reset_on_lapse(self) -> None:
+        now = timezone.now()
+        review = FlashCardReview(learner='l', card=self.cards[0], deck=self.deck, ease_factor=2.5)
+        intervals = []
+        for _ in range(3):
+            apply_sm2(review, 5, now)
+            intervals.append(review.interval_days)
+        self.assertEqual(intervals, [1, 6, 16])
+        self.assertAlmostEqual(review.ease_factor, 2.8)
+
+        apply_sm2(review, 1, now)
+        self.assertEqual((review.interval_days, review.repetitions, review.lapses), (1, 0, 1))
+
+    def test_session_prefers_overdue_then_new_cards(self) -> None:
+        first = self._session(3)
+        self.assertEqual([card['text'] for card in first.data['sequence']], ['кот', 'дом', 'лес'])
+        self.assertEqual(first.data['new_count'], 3)
+
+        answers = self.client.post(
+            reverse('flashcard-review-answers'),
+            {'learner': 'learner-1', 'answers': [{'card_id': card.id, 'quality': 4} for card in self.cards[:2]]},
+            format='json',
+        )
+        self.assertEqual(answers.data, {'updated': 0, 'created': 2})
+
+        FlashCardReview.objects.filter(card=self.cards[1]).update(due_at=timezone.now() - timedelta(days=1))
+        second = self._session(2)
+        self.assertEqual([card['text'] for card in second.data['sequence']], ['дом', 'лес'])
+        self.assertEqual((second.data['due_count'], second.data['new_count']), (1, 1))
+
+    def test_answers_update_schedule_in_bulk(self) -> None:
+        payload = {'learner': 'learner-1', 'answers': [{'card_id': card.id, 'quality': 5} for card in self.cards]}
+        self.client.post(reverse('flashcard-review-answers'), payload, format='json')
+
+        with self.assertNumQueries(5):
+            response = self.client.post(reverse('flashcard-review-answers'), payload, format='json')
+        self.assertEqual(response.data, {'updated': 3, 'created': 0})
+        self.assertEqual(set(FlashCardReview.objects.values_list('interval_days', flat=True)), {6})
+
+        unknown = self.client.post(
+            reverse('flashcard-review-answers'),
+            {'learner': 'learner-1', 'answers': [{'card_id': 999999, 'quality': 3}]},
+            format='json',
+        )
+        self.assertEqual(unknown.status_code, 400)
+
+    def _answer(self, cards, quality: int = 4):
+        return self.client.post(
+            reverse('flashcard-review-answers'),
+            {'learner': 'learner-1', 'answers': [{'card_id': card.id, 'quality': quality} for card in cards]},
+            format='json',
+        )
+
+    def test_inactive_cards_do_not_crowd_out_due_cards(self) -> None:
+        self._answer(self.cards)
+        now = timezone.now()
+        for days, card in zip([3, 2, 1], self.cards):
+            FlashCardReview.objects.filter(card=card).update(due_at=now - timedelta(days=days))
+        FlashCard.objects.filter(pk__in=[self.cards[0].pk, self.cards[1].pk]).update(is_active=False)
+
+        session = self._session(2)
+        self.assertEqual([card['text'] for card in session.data['sequence']], ['лес'])
+        self.assertEqual((session.data['due_count'], session.data['new_count']), (1, 0))
+
+    def test_moved_card_keeps_its_review(self) -> None:
+        other = FlashCardDeck.objects.create(slug='other-deck', title='Другой', trainer=self.deck.trainer)
+        self._answer(self.cards)
+
+        card = self.cards[0]
+        card.deck = other
+        card.save()
+        FlashCard.objects.filter(pk=self.cards[1].pk).update(deck=other)
+
+        moved = set(FlashCardReview.objects.filter(deck=other).values_list('card_id', flat=True))
+        self.assertEqual(moved, {self.cards[0].pk, self.cards[1].pk})
+        response = self.client.post(
+            reverse('flashcard-review-session'),
+            {'learner': 'learner-1', 'deck_slug': 'other-deck', 'word_count': 2},
+            format='json',
+        )
+        self.assertEqual(response.data['new_count'], 0)
+
+    def test_review_created_concurrently_is_updated(self) -> None:
+        self._answer(self.cards[:1])
+
+        # Как если бы строку создал параллельный запрос после чтения расписаний.
+        unlocked = FlashCardReview.objects.none()
+        with mock.patch.object(FlashCardReview.objects, 'select_for_update', return_value=unlocked):
+            response = self._answer(self.cards[:1], quality=5)
+
+        self.assertEqual(response.status_code, 200)
+        review = FlashCardReview.objects.get(card=self.cards[0])
+        self.assertEqual(review.repetitions, 1)
+
+
+class FlashCardSearchTests(APITestCase):
+    def setUp(self) -> None:
+        trainer = Trainer.objects.get(slug='flash-words')
+        self.animals = FlashCardDeck.objects.create(slug='animals', title='Животные', trainer=trainer)
+        self.home = FlashCardDeck.objects.create(slug='home', title='Дом и быт', trainer=trainer)
+        FlashCard.objects.create(deck=self.animals, front_text='Кошка', back_text='cat', order=1)
+        FlashCard.objects.create(deck=self.animals, front_text='Собака', back_text='dog', hint='Лает', order=2)
+        FlashCard.objects.create(deck=self.home, front_text='Кошелек', back_text='wallet', order=1)
+        FlashCard.objects.create(deck=self.home, front_text='Кошма', back_text='felt', order=2, is_active=False)
+
+    def _search(self, **params):
+        response = self.client.get(reverse('flashcard-search'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_prefix_search_across_decks(self) -> None:
+        data = self._search(q='кош')
+        self.assertEqual({card['front_text'] for card in data['cards']}, {'Кошка', 'Кошелек'})
+
+        data = self._search(q='кош', deck='animals')
+        self.assertEqual([card['front_text'] for card in data['cards']], ['Кошка'])
+        self.assertEqual(data['cards'][0]['deck'], {'slug': 'animals', 'title': 'Животные'})
+
+    def test_search_matches_back_text_and_hint(self) -> None:
+        self.assertEqual([card['front_text'] for card in self._search(q='wallet')['cards']], ['Кошелек'])
+        self.assertEqual([card['front_text'] for card in self._search(q='лает')['cards']], ['Собака'])
+
+    def test_index_follows_card_updates(self) -> None:
+        card = FlashCard.objects.get(front_text='Собака')
+        card.front_text = 'Щенок'
+        card.save()
+        self.assertEqual(self._search(q='собака', deck='animals')['cards'], [])
+        self.assertEqual(len(self._search(q='щенок', deck='animals')['cards']), 1)
+
+        card.delete()
+        self.assertEqual(self._search(q='щенок', deck='animals')['cards'], [])
+
+    def test_search_returns_matching_decks(self) -> None:
+        data = self._search(q='дом')
+        self.assertEqual([deck['slug'] for deck in data['decks']], ['home'])
+
+        response = self.client.get(reverse('flashcard-search'), {'q': 'к'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,299 @@
+"""
+Потоковый импорт и экспорт наборов флеш-карт в CSV и JSONL.
+
+Каждая запись описывает одну карточку вместе с реквизитами ее набора. Ключ записи —
+слаг набора и порядковый номер карточки: существующие карточки обновляются, новые
+создаются пакетами через bulk_create/bulk_update. Реквизиты набора берутся из первой
+записи с его слагом.
+"""
+
+import csv
+import json
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_slug
+from django.db import transaction
+
+from trainers.models import Trainer
+
+from .models import FlashCard, FlashCardDeck
+from .stats import deferred_deck_stats, schedule_deck_stats_refresh
+
+FORMATS = ("csv", "jsonl")
+
+DECK_COLUMNS = ("deck_slug", "deck_title", "deck_description", "deck_accent_color", "deck_order")
+CARD_COLUMNS = ("order", "front_text", "back_text", "hint", "is_active")
+COLUMNS = DECK_COLUMNS + CARD_COLUMNS
+
+# Поля модели набора, которые задаются колонками deck_*.
+DECK_FIELD_COLUMNS = {
+    "title": "deck_title",
+    "description": "deck_description",
+    "accent_color": "deck_accent_color",
+    "order": "deck_order",
+}
+CARD_UPDATE_FIELDS = ["front_text", "back_text", "hint", "is_active"]
+
+TRUE_VALUES = {"1", "true", "yes", "да"}
+FALSE_VALUES = {"0", "false", "no", "нет"}
+
+
+class TransferError(ValueError):
+    pass
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    decks_created: int = 0
+    decks_updated: int = 0
+    cards_created: int = 0
+    cards_updated: int = 0
+
+
+def detect_format(path: str, explicit: Optional[str] = None) -> str:
+    if explicit:
+        return explicit
+    lowered = path.lower()
+    if lowered.endswith(".jsonl") or lowered.endswith(".ndjson"):
+        return "jsonl"
+    if lowered.endswith(".csv"):
+        return "csv"
+    raise TransferError("Не удалось определить формат по расширению файла, укажите --format.")
+
+
+def read_records(stream: TextIO, file_format: str) -> Iterator[Tuple[int, dict]]:
+    """Построчно читает файл и возвращает пары (номер строки, запись)."""
+
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        missing = {"deck_slug", "order", "front_text"} - set(reader.fieldnames or ())
+        if missing:
+            raise TransferError(f"В CSV нет обязательных колонок: {', '.join(sorted(missing))}")
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as error:
+            raise TransferError(f"Строка {line_number}: некорректный JSON ({error.msg}).")
+        if not isinstance(record, dict):
+            raise TransferError(f"Строка {line_number}: ожидается JSON-объект.")
+        yield line_number, record
+
+
+def _parse_int(value, line_number: int, column: str) -> int:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise TransferError(f"Строка {line_number}: {column} должен быть целым числом.")
+    if number < 0:
+        raise TransferError(f"Строка {line_number}: {column} не может быть отрицательным.")
+    return number
+
+
+def _parse_bool(value, line_number: int) -> bool:
+    if value is None or value == "":
+        return True
+    if isinstance(value, bool):
+        return value
+    lowered = str(value).strip().lower()
+    if lowered in TRUE_VALUES:
+        return True
+    if lowered in FALSE_VALUES:
+        return False
+    raise TransferError(f"Строка {line_number}: is_active должен быть логическим значением.")
+
+
+def _text(record: dict, column: str) -> str:
+    value = record.get(column)
+    return "" if value is None else str(value)
+
+
+def _check_length(value: str, model, field: str, line_number: int, column: str) -> str:
+    # bulk_create не валидирует поля, а на PostgreSQL длинное значение дало бы DataError.
+    max_length = model._meta.get_field(field).max_length
+    if max_length is not None and len(value) > max_length:
+        raise TransferError(f"Строка {line_number}: {column} длиннее {max_length} символов.")
+    return value
+
+
+def _parse_card(line_number: int, record: dict) -> Tuple[str, int, dict]:
+    slug = _text(record, "deck_slug").strip()
+    if not slug:
+        raise TransferError(f"Строка {line_number}: не указан deck_slug.")
+    try:
+        validate_slug(slug)
+    except ValidationError:
+        raise TransferError(
+            f"Строка {line_number}: deck_slug может содержать только латинские буквы, цифры, «-» и «_»."
+        )
+    _check_length(slug, FlashCardDeck, "slug", line_number, "deck_slug")
+    front_text = _text(record, "front_text")
+    if not front_text.strip():
+        raise TransferError(f"Строка {line_number}: не указан front_text.")
+    order = _parse_int(record.get("order"), line_number, "order")
+    values = {
+        "front_text": front_text,
+        "back_text": _text(record, "back_text"),
+        "hint": _check_length(_text(record, "hint"), FlashCard, "hint", line_number, "hint"),
+        "is_active": _parse_bool(record.get("is_active"), line_number),
+    }
+    return slug, order, values
+
+
+def _deck_values(line_number: int, record: dict) -> dict:
+    values = {}
+    for field, column in DECK_FIELD_COLUMNS.items():
+        raw = record.get(column)
+        if raw is None or raw == "":
+            continue
+        if field == "order":
+            values[field] = _parse_int(raw, line_number, column)
+        else:
+            values[field] = _check_length(str(raw), FlashCardDeck, field, line_number, column)
+    return values
+
+
+class FlashCardImporter:
+    def __init__(self, trainer: Trainer, batch_size: int = 1000) -> None:
+        self.trainer = trainer
+        self.batch_size = batch_size
+        self.deck_ids: Dict[str, int] = {}
+        self.result = ImportResult()
+
+    def run(self, records: Iterable[Tuple[int, dict]]) -> ImportResult:
+        iterator = iter(records)
+        # Статистика наборов пересчитывается один раз после всех пакетов.
+        with transaction.atomic(), deferred_deck_stats():
+            while True:
+                batch = list(islice(iterator, self.batch_size))
+                if not batch:
+                    break
+                self._import_batch(batch)
+        return self.result
+
+    def _import_batch(self, batch: List[Tuple[int, dict]]) -> None:
+        cards: Dict[Tuple[str, int], dict] = {}
+        new_decks: Dict[str, dict] = {}
+        for line_number, record in batch:
+            slug, order, values = _parse_card(line_number, record)
+            # Повтор ключа в файле перезаписывает предыдущую запись.
+            cards[(slug, order)] = values
+            if slug not in self.deck_ids and slug not in new_decks:
+                new_decks[slug] = _deck_values(line_number, record)
+        self.result.rows += len(batch)
+
+        if new_decks:
+            self._upsert_decks(new_decks)
+
+        orders_by_deck: Dict[int, List[int]] = {}
+        for slug, order in cards:
+            orders_by_deck.setdefault(self.deck_ids[slug], []).append(order)
+
+        existing: Dict[Tuple[int, int], FlashCard] = {}
+        for deck_id, orders in orders_by_deck.items():
+            # Если в наборе несколько карточек с одним порядком, обновляется самая ранняя.
+            for card in FlashCard.objects.filter(deck_id=deck_id, order__in=orders).order_by("-id"):
+                existing[(deck_id, card.order)] = card
+
+        to_create: List[FlashCard] = []
+        to_update: List[FlashCard] = []
+        for (slug, order), values in cards.items():
+            deck_id = self.deck_ids[slug]
+            card = existing.get((deck_id, order))
+            if card is None:
+                to_create.append(FlashCard(deck_id=deck_id, order=order, **values))
+                continue
+            if any(getattr(card, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(card, field, value)
+                to_update.append(card)
+
+        if to_create:
+            FlashCard.objects.bulk_create(to_create, batch_size=self.batch_size)
+        if to_update:
+            FlashCard.objects.bulk_update(to_update, CARD_UPDATE_FIELDS, batch_size=self.batch_size)
+        self.result.cards_created += len(to_create)
+        self.result.cards_updated += len(to_update)
+
+    def _upsert_decks(self, decks: Dict[str, dict]) -> None:
+        existing = {deck.slug: deck for deck in FlashCardDeck.objects.filter(slug__in=decks)}
+
+        to_update = []
+        for slug, values in decks.items():
+            deck = existing.get(slug)
+            if deck is None or not values:
+                continue
+            if any(getattr(deck, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(deck, field, value)
+                to_update.append(deck)
+        if to_update:
+            fields = sorted({field for values in decks.values() for field in values})
+            FlashCardDeck.objects.bulk_update(to_update, fields)
+            # bulk_update не шлет сигналы: версию набора и кэш его индекса обновляет пересчет статистики.
+            schedule_deck_stats_refresh(deck.pk for deck in to_update)
+
+        to_create = [
+            FlashCardDeck(trainer=self.trainer, slug=slug, **{"title": slug, **values})
+            for slug, values in decks.items()
+            if slug not in existing
+        ]
+        if to_create:
+            FlashCardDeck.objects.bulk_create(to_create)
+            existing.update(
+                FlashCardDeck.objects.filter(slug__in=[deck.slug for deck in to_create]).in_bulk(field_name="slug")
+            )
+
+        self.deck_ids.update((slug, deck.pk) for slug, deck in existing.items())
+        self.result.decks_created += len(to_create)
+        self.result.decks_updated += len(to_update)
+
+
+def import_flashcards(
+    stream: TextIO,
+    file_format: str,
+    trainer: Trainer,
+    batch_size: int = 1000,
+) -> ImportResult:
+    return FlashCardImporter(trainer, batch_size).run(read_records(stream, file_format))
+
+
+def iter_export_rows(deck_slugs: Optional[Iterable[str]] = None, chunk_size: int = 2000) -> Iterator[dict]:
+    cards = FlashCard.objects.order_by("deck__order", "deck__slug", "order", "id")
+    if deck_slugs:
+        cards = cards.filter(deck__slug__in=list(deck_slugs))
+    values = cards.values_list(
+        "deck__slug",
+        "deck__title",
+        "deck__description",
+        "deck__accent_color",
+        "deck__order",
+        *CARD_COLUMNS,
+    )
+    for row in values.iterator(chunk_size=chunk_size):
+        yield dict(zip(COLUMNS, row))
+
+
+def export_flashcards(stream: TextIO, file_format: str, deck_slugs: Optional[Iterable[str]] = None) -> int:
+    exported = 0
+    if file_format == "csv":
+        writer = csv.DictWriter(stream, fieldnames=COLUMNS)
+        writer.writeheader()
+        for row in iter_export_rows(deck_slugs):
+            writer.writerow({**row, "is_active": int(row["is_active"])})
+            exported += 1
+        return exported
+
+    for row in iter_export_rows(deck_slugs):
+        stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+        exported += 1
+    return exported
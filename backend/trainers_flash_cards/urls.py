@@ -1,15 +1,29 @@
 from django.urls import path
 
 from .views import (
+    FlashCardAbacusSessionStreamView,
     FlashCardAbacusSessionView,
+    FlashCardDeckCardListView,
     FlashCardDeckDetailView,
     FlashCardDeckListView,
+    FlashCardReviewAnswersView,
+    FlashCardReviewSessionView,
+    FlashCardSearchView,
     FlashCardSessionView,
 )
 
 urlpatterns = [
     path('decks/', FlashCardDeckListView.as_view(), name='flashcard-deck-list'),
     path('decks/<slug:slug>/', FlashCardDeckDetailView.as_view(), name='flashcard-deck-detail'),
+    path('decks/<slug:slug>/cards/', FlashCardDeckCardListView.as_view(), name='flashcard-deck-cards'),
+    path('search/', FlashCardSearchView.as_view(), name='flashcard-search'),
     path('session/', FlashCardSessionView.as_view(), name='flashcard-session'),
+    path('review/session/', FlashCardReviewSessionView.as_view(), name='flashcard-review-session'),
+    path('review/answers/', FlashCardReviewAnswersView.as_view(), name='flashcard-review-answers'),
     path('abacus/session/', FlashCardAbacusSessionView.as_view(), name='flashcard-abacus-session'),
+    path(
+        'abacus/session/stream/',
+        FlashCardAbacusSessionStreamView.as_view(),
+        name='flashcard-abacus-session-stream',
+    ),
 ]
@@ -1,43 +1,176 @@
+import hashlib
+
 from django.db.models import Prefetch
-from django.shortcuts import get_object_or_404
+from django.http import Http404
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from rest_framework import status
 from rest_framework.generics import ListAPIView, RetrieveAPIView
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from trainers.pools import SessionPool
+from trainers.seeding import make_rng
+from trainers.sse import EventStreamRenderer, event_stream_response, format_sse
+
+from .deck_cache import get_deck_index
 from .models import FlashCard, FlashCardDeck
+from .pagination import FlashCardCursorPagination, FlashCardDeckCursorPagination
 from .serializers import (
+    FlashCardAbacusCompactSessionResponseSerializer,
     FlashCardAbacusSessionRequestSerializer,
     FlashCardAbacusSessionResponseSerializer,
     FlashCardDeckSerializer,
+    FlashCardDeckSummarySerializer,
+    FlashCardReviewAnswersRequestSerializer,
+    FlashCardReviewSessionRequestSerializer,
+    FlashCardReviewSessionResponseSerializer,
+    FlashCardSearchRequestSerializer,
+    FlashCardSearchResultSerializer,
+    FlashCardSerializer,
     FlashCardSessionRequestSerializer,
     FlashCardSessionResponseSerializer,
 )
-from .services import generate_flashcards_abacus_session
+from .reviews import record_answers, select_review_cards
+from .search import search_cards, search_decks
+from .services import (
+    COLUMNS_FORMAT_FULL,
+    build_flashcards_abacus_settings,
+    encode_abacus_columns,
+    generate_flashcards_abacus_session,
+    iter_flashcards_abacus_cards,
+)
+
+
+def _generate_pooled_abacus_session(key, rng):
+    difficulty, quantity, max_digit = key
+    # Скорость не влияет на генерацию и подставляется в ответ из запроса.
+    return generate_flashcards_abacus_session(
+        difficulty=difficulty,
+        speed=1.0,
+        quantity=quantity,
+        max_digit=max_digit,
+        rng=rng,
+    )
+
 
-import random
+ABACUS_SESSION_POOL = SessionPool("flash-cards-abacus", _generate_pooled_abacus_session)
+
+
+def _split_query_list(request, name):
+    raw = request.query_params.get(name, "")
+    return [item.strip() for item in raw.split(",") if item.strip()]
 
 
 class FlashCardDeckQuerysetMixin:
+    """
+    По умолчанию наборы отдаются краткой сводкой без карточек.
+
+    ``?include=cards`` встраивает активные карточки, ``?fields=slug,title`` сужает набор полей.
+    """
+
+    pagination_class = FlashCardDeckCursorPagination
+
+    def includes_cards(self) -> bool:
+        return "cards" in _split_query_list(self.request, "include")
+
     def get_queryset(self):
-        base_qs = FlashCardDeck.objects.filter(is_active=True).prefetch_related(
-            Prefetch(
-                "cards",
-                queryset=FlashCard.objects.filter(is_active=True).order_by("order", "id"),
+        base_qs = FlashCardDeck.objects.filter(is_active=True).order_by("order", "title", "id")
+        if self.includes_cards():
+            base_qs = base_qs.prefetch_related(
+                Prefetch(
+                    "cards",
+                    queryset=FlashCard.objects.filter(is_active=True).order_by("order", "id"),
+                )
             )
-        ).order_by("order", "title")
         return base_qs
 
+    def get_serializer_class(self):
+        return FlashCardDeckSerializer if self.includes_cards() else FlashCardDeckSummarySerializer
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", _split_query_list(self.request, "fields"))
+        return super().get_serializer(*args, **kwargs)
+
+
+# Меняется при изменении формата ответа, чтобы старые ETag не совпали с новыми.
+DECK_ETAG_FORMAT = "decks-v2"
+
+
+def _versions_etag(request, versions) -> str:
+    # Параметры запроса (fields, include, курсор) меняют тело ответа, поэтому входят в ETag.
+    query = request.GET.urlencode()
+    return hashlib.sha1(f"{DECK_ETAG_FORMAT}:{query}:{versions!r}".encode()).hexdigest()
+
+
+def deck_list_etag(request, *args, **kwargs):
+    # content_version набора растет при любом изменении набора или его карточек,
+    # поэтому пары (id, версия) однозначно задают содержимое списка без чтения карточек.
+    versions = list(
+        FlashCardDeck.objects.filter(is_active=True).order_by("pk").values_list("pk", "content_version")
+    )
+    return _versions_etag(request, versions)
+
+
+def deck_detail_etag(request, slug, *args, **kwargs):
+    version = (
+        FlashCardDeck.objects.filter(slug=slug, is_active=True).values_list("pk", "content_version").first()
+    )
+    return _versions_etag(request, version) if version is not None else None
 
+
+# Условные запросы — только по ETag. Last-Modified по updated_at активных наборов не растет,
+# когда набор выключают или удаляют, и клиент с If-Modified-Since получил бы устаревший 304.
+@method_decorator(condition(etag_func=deck_list_etag), name="get")
 class FlashCardDeckListView(FlashCardDeckQuerysetMixin, ListAPIView):
-    serializer_class = FlashCardDeckSerializer
+    pass
 
 
+@method_decorator(condition(etag_func=deck_detail_etag), name="get")
 class FlashCardDeckDetailView(FlashCardDeckQuerysetMixin, RetrieveAPIView):
-    serializer_class = FlashCardDeckSerializer
     lookup_field = "slug"
 
 
+@method_decorator(condition(etag_func=deck_detail_etag), name="get")
+class FlashCardDeckCardListView(ListAPIView):
+    """Активные карточки набора постранично (курсор по ``order``, ``id``)."""
+
+    serializer_class = FlashCardSerializer
+    pagination_class = FlashCardCursorPagination
+
+    def get_queryset(self):
+        deck_id = (
+            FlashCardDeck.objects.filter(slug=self.kwargs["slug"], is_active=True).values_list("pk", flat=True).first()
+        )
+        if deck_id is None:
+            raise Http404
+        return FlashCard.objects.filter(deck_id=deck_id, is_active=True)
+
+
+class FlashCardSearchView(APIView):
+    """Поиск по активным наборам (по названию) и их карточкам (по всем текстовым полям)."""
+
+    def get(self, request, *args, **kwargs):
+        request_serializer = FlashCardSearchRequestSerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        query = request_serializer.validated_data["q"]
+        deck_slug = request_serializer.validated_data.get("deck")
+        limit = request_serializer.validated_data["limit"]
+
+        decks = [] if deck_slug else search_decks(query, limit)
+        cards = search_cards(query, deck_slug, limit)
+        return Response(
+            {
+                "query": query,
+                "decks": FlashCardDeckSummarySerializer(decks, many=True).data,
+                "cards": FlashCardSearchResultSerializer(cards, many=True).data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 class FlashCardSessionView(APIView):
     def post(self, request, *args, **kwargs):
         request_serializer = FlashCardSessionRequestSerializer(data=request.data)
@@ -46,42 +179,38 @@ class FlashCardSessionView(APIView):
         deck_slug = request_serializer.validated_data["deck_slug"]
         speed = request_serializer.validated_data["speed"]
         requested_count = request_serializer.validated_data["word_count"]
+        rng, seed = make_rng(request_serializer.validated_data.get("seed"))
 
-        deck = get_object_or_404(FlashCardDeck, slug=deck_slug)
+        deck_index = get_deck_index(deck_slug)
+        if deck_index is None:
+            raise Http404
 
-        cards_qs = deck.cards.filter(is_active=True).order_by("order", "id")
-        available_cards = list(cards_qs)
-
-        if not available_cards:
+        if not deck_index.card_ids:
             return Response(
                 {"detail": "В выбранном наборе пока нет активных карточек."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        max_words = len(available_cards)
-        if requested_count > max_words:
-            requested_count = max_words
-
-        selected_cards = available_cards.copy()
-        random.shuffle(selected_cards)
-        selected_cards = selected_cards[:requested_count]
+        requested_count = min(requested_count, len(deck_index.card_ids))
+        positions = rng.sample(range(len(deck_index.card_ids)), requested_count)
 
         sequence = [
-            {"id": card.id, "text": card.front_text}
-            for card in selected_cards
+            {"id": deck_index.card_ids[position], "text": deck_index.front_texts[position]}
+            for position in positions
         ]
 
         recall_cards = sequence.copy()
-        random.shuffle(recall_cards)
+        rng.shuffle(recall_cards)
 
         response_payload = {
             "deck": {
-                "slug": deck.slug,
-                "title": deck.title,
-                "accent_color": deck.accent_color,
+                "slug": deck_index.slug,
+                "title": deck_index.title,
+                "accent_color": deck_index.accent_color,
             },
             "speed": speed,
             "word_count": len(sequence),
+            "seed": seed,
             "sequence": sequence,
             "recall": recall_cards,
         }
@@ -90,17 +219,130 @@ class FlashCardSessionView(APIView):
         return Response(response_serializer.data, status=status.HTTP_200_OK)
 
 
+class FlashCardReviewSessionView(APIView):
+    """Сессия интервального повторения: самые просроченные карточки ученика, затем новые."""
+
+    def post(self, request, *args, **kwargs):
+        request_serializer = FlashCardReviewSessionRequestSerializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
+
+        learner = request_serializer.validated_data["learner"]
+        rng, seed = make_rng(request_serializer.validated_data.get("seed"))
+
+        deck_index = get_deck_index(request_serializer.validated_data["deck_slug"])
+        if deck_index is None:
+            raise Http404
+
+        if not deck_index.card_ids:
+            return Response(
+                {"detail": "В выбранном наборе пока нет активных карточек."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        card_ids, due_count, new_count = select_review_cards(
+            learner, deck_index, request_serializer.validated_data["word_count"]
+        )
+        texts = dict(zip(deck_index.card_ids, deck_index.front_texts))
+        sequence = [{"id": card_id, "text": texts[card_id]} for card_id in card_ids]
+
+        recall_cards = sequence.copy()
+        rng.shuffle(recall_cards)
+
+        response_payload = {
+            "deck": {
+                "slug": deck_index.slug,
+                "title": deck_index.title,
+                "accent_color": deck_index.accent_color,
+            },
+            "learner": learner,
+            "word_count": len(sequence),
+            "seed": seed,
+            "sequence": sequence,
+            "recall": recall_cards,
+            "due_count": due_count,
+            "new_count": new_count,
+        }
+
+        response_serializer = FlashCardReviewSessionResponseSerializer(response_payload)
+        return Response(response_serializer.data, status=status.HTTP_200_OK)
+
+
+class FlashCardReviewAnswersView(APIView):
+    """Принимает оценки всей сессии разом и пересчитывает расписание пакетно."""
+
+    def post(self, request, *args, **kwargs):
+        request_serializer = FlashCardReviewAnswersRequestSerializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
+
+        answers = [(answer["card_id"], answer["quality"]) for answer in request_serializer.validated_data["answers"]]
+        try:
+            result = record_answers(request_serializer.validated_data["learner"], answers)
+        except ValueError as error:
+            return Response({"detail": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(result, status=status.HTTP_200_OK)
+
+
 class FlashCardAbacusSessionView(APIView):
     def post(self, request, *args, **kwargs):
         request_serializer = FlashCardAbacusSessionRequestSerializer(data=request.data)
         request_serializer.is_valid(raise_exception=True)
+        seed = request_serializer.validated_data.get("seed")
 
-        session_payload = generate_flashcards_abacus_session(
-            difficulty=request_serializer.validated_data["difficulty"],
-            speed=request_serializer.validated_data["speed"],
-            quantity=request_serializer.validated_data["quantity"],
-            max_digit=request_serializer.validated_data["max_digit"],
+        pool_key = (
+            request_serializer.validated_data["difficulty"],
+            request_serializer.validated_data["quantity"],
+            request_serializer.validated_data["max_digit"],
         )
+        if seed is None:
+            seed, session_payload = ABACUS_SESSION_POOL.get(pool_key)
+        else:
+            seed, session_payload = ABACUS_SESSION_POOL.generate(pool_key, seed)
+        session_payload["speed"] = request_serializer.validated_data["speed"]
+        session_payload["seed"] = seed
 
-        response_serializer = FlashCardAbacusSessionResponseSerializer(session_payload)
+        columns_format = request_serializer.validated_data["columns_format"]
+        if columns_format == COLUMNS_FORMAT_FULL:
+            response_serializer = FlashCardAbacusSessionResponseSerializer(session_payload)
+        else:
+            # Компактный ответ: вместо вложенных карточек — столбцы, параллельные numbers.
+            session_payload["columns_format"] = columns_format
+            session_payload["columns"] = encode_abacus_columns(session_payload["numbers"], columns_format)
+            response_serializer = FlashCardAbacusCompactSessionResponseSerializer(session_payload)
         return Response(response_serializer.data, status=status.HTTP_200_OK)
+
+
+class FlashCardAbacusSessionStreamView(APIView):
+    """Потоковая (Server-Sent Events) выдача карточек абакуса по мере генерации."""
+
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    def get(self, request, *args, **kwargs):
+        request_serializer = FlashCardAbacusSessionRequestSerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        difficulty = request_serializer.validated_data["difficulty"]
+        quantity = request_serializer.validated_data["quantity"]
+        max_digit = request_serializer.validated_data["max_digit"]
+        speed = request_serializer.validated_data["speed"]
+        rng, seed = make_rng(request_serializer.validated_data.get("seed"))
+        columns_format = request_serializer.validated_data["columns_format"]
+        cards = iter_flashcards_abacus_cards(difficulty, quantity, max_digit, rng, columns_format)
+
+        def events():
+            yield format_sse(
+                "settings",
+                {
+                    "settings": build_flashcards_abacus_settings(difficulty, quantity, max_digit),
+                    "speed": speed,
+                    "seed": seed,
+                    "columns_format": columns_format,
+                },
+            )
+            total = 0
+            for card in cards:
+                total += card["value"]
+                yield format_sse("card", card)
+            yield format_sse("end", {"total": total})
+
+        return event_stream_response(events())
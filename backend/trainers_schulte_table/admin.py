@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import SchulteTableLevel
+from .models import SchulteResult, SchulteResultBin, SchulteTableLevel
 
 
 @admin.register(SchulteTableLevel)
@@ -9,3 +9,17 @@ class SchulteTableLevelAdmin(admin.ModelAdmin):
     list_filter = ['trainer', 'grid_size', 'is_active']
     search_fields = ['title', 'trainer__title']
     ordering = ['trainer', 'order', 'grid_size']
+
+
+@admin.register(SchulteResult)
+class SchulteResultAdmin(admin.ModelAdmin):
+    list_display = ['grid_size', 'variant', 'duration_ms', 'mistakes', 'created_at']
+    list_filter = ['grid_size', 'variant']
+    ordering = ['-created_at']
+
+
+@admin.register(SchulteResultBin)
+class SchulteResultBinAdmin(admin.ModelAdmin):
+    list_display = ['grid_size', 'variant', 'bin', 'count']
+    list_filter = ['grid_size', 'variant']
+    readonly_fields = ['grid_size', 'variant', 'bin', 'count']
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from trainers_schulte_table.ranking import rebuild_result_bins
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает гистограммы времен прохождения таблиц Шульте по сохраненным результатам.'
+
+    def handle(self, *args, **options):
+        bins = rebuild_result_bins()
+        self.stdout.write(self.style.SUCCESS(f'Заполнено корзин: {bins}'))
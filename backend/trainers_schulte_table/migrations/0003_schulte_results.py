@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers_schulte_table', '0002_seed_default_levels'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchulteResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grid_size', models.PositiveSmallIntegerField(verbose_name='Размер сетки')),
+                ('variant', models.CharField(max_length=16, verbose_name='Вариант таблицы')),
+                ('duration_ms', models.PositiveIntegerField(verbose_name='Время прохождения, мс')),
+                ('mistakes', models.PositiveSmallIntegerField(default=0, verbose_name='Ошибок')),
+                ('seed', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Зерно таблицы')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+            ],
+            options={
+                'verbose_name': 'Результат «Таблицы Шульте»',
+                'verbose_name_plural': 'Результаты «Таблицы Шульте»',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SchulteResultBin',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grid_size', models.PositiveSmallIntegerField(verbose_name='Размер сетки')),
+                ('variant', models.CharField(max_length=16, verbose_name='Вариант таблицы')),
+                ('bin', models.PositiveSmallIntegerField(verbose_name='Номер корзины')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Результатов')),
+            ],
+            options={
+                'verbose_name': 'Корзина гистограммы результатов',
+                'verbose_name_plural': 'Корзины гистограммы результатов',
+                'ordering': ['grid_size', 'variant', 'bin'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='schulteresultbin',
+            constraint=models.UniqueConstraint(fields=('grid_size', 'variant', 'bin'), name='schulte_result_bin_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='schulteresult',
+            index=models.Index(fields=['grid_size', 'variant', 'duration_ms'], name='schulte_result_lookup_idx'),
+        ),
+    ]
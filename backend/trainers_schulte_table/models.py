@@ -32,3 +32,50 @@ class SchulteTableLevel(models.Model):
 
     def __str__(self) -> str:
         return f'{self.trainer.title} — {self.title}'
+
+
+class SchulteResult(models.Model):
+    """Время прохождения одной таблицы Шульте."""
+
+    grid_size = models.PositiveSmallIntegerField(verbose_name='Размер сетки')
+    variant = models.CharField(max_length=16, verbose_name='Вариант таблицы')
+    duration_ms = models.PositiveIntegerField(verbose_name='Время прохождения, мс')
+    mistakes = models.PositiveSmallIntegerField(default=0, verbose_name='Ошибок')
+    seed = models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Зерно таблицы')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Создано')
+
+    class Meta:
+        verbose_name = 'Результат «Таблицы Шульте»'
+        verbose_name_plural = 'Результаты «Таблицы Шульте»'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['grid_size', 'variant', 'duration_ms'], name='schulte_result_lookup_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.grid_size}×{self.grid_size} {self.variant}: {self.duration_ms} мс'
+
+
+class SchulteResultBin(models.Model):
+    """
+    Корзина гистограммы времен прохождения для пары (размер сетки, вариант).
+
+    Счетчик увеличивается при каждом сохранении SchulteResult (см. ranking.record_result),
+    поэтому процентиль считается по нескольким сотням корзин, а не по всей таблице результатов.
+    """
+
+    grid_size = models.PositiveSmallIntegerField(verbose_name='Размер сетки')
+    variant = models.CharField(max_length=16, verbose_name='Вариант таблицы')
+    bin = models.PositiveSmallIntegerField(verbose_name='Номер корзины')
+    count = models.PositiveIntegerField(default=0, verbose_name='Результатов')
+
+    class Meta:
+        verbose_name = 'Корзина гистограммы результатов'
+        verbose_name_plural = 'Корзины гистограммы результатов'
+        ordering = ['grid_size', 'variant', 'bin']
+        constraints = [
+            models.UniqueConstraint(fields=['grid_size', 'variant', 'bin'], name='schulte_result_bin_uniq'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.grid_size}×{self.grid_size} {self.variant} #{self.bin}: {self.count}'
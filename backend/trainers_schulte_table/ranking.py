@@ -0,0 +1,107 @@
+"""
+Процентиль времени прохождения таблицы Шульте.
+
+Времена раскладываются по логарифмическим корзинам (каждая следующая на 5% шире
+предыдущей), счетчики корзин хранятся в SchulteResultBin и увеличиваются при сохранении
+результата. «Быстрее, чем X%» считается одним агрегирующим запросом по корзинам одной
+пары (размер сетки, вариант) — их не больше NUM_BINS, сколько бы ни было результатов.
+Точность — в пределах одной корзины: половина результатов из корзины пользователя
+считается медленнее него.
+"""
+
+from bisect import bisect_right
+from collections import Counter
+from typing import Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Sum
+
+from .models import SchulteResult, SchulteResultBin
+
+MIN_BIN_MS = 500
+BIN_GROWTH = 1.05
+NUM_BINS = 200
+
+# Верхние (не включая) границы корзин 0..NUM_BINS-2; последняя корзина открыта сверху.
+BIN_UPPER_BOUNDS = tuple(round(MIN_BIN_MS * BIN_GROWTH ** (index + 1)) for index in range(NUM_BINS - 1))
+
+
+def duration_bin(duration_ms: int) -> int:
+    return bisect_right(BIN_UPPER_BOUNDS, duration_ms)
+
+
+def _increment_bin(grid_size: int, variant: str, bin_: int) -> None:
+    bins = SchulteResultBin.objects.filter(grid_size=grid_size, variant=variant, bin=bin_)
+    if bins.update(count=F('count') + 1):
+        return
+    try:
+        with transaction.atomic():
+            SchulteResultBin.objects.create(grid_size=grid_size, variant=variant, bin=bin_, count=1)
+    except IntegrityError:
+        # Корзину одновременно создал другой запрос — остается увеличить ее счетчик.
+        bins.update(count=F('count') + 1)
+
+
+def result_percentile(grid_size: int, variant: str, duration_ms: int, recorded: bool = False) -> dict:
+    """
+    Доля результатов той же пары (размер, вариант), которые медленнее ``duration_ms``.
+
+    ``recorded`` — результат уже учтен в гистограмме и не должен сравниваться сам с собой.
+    Если сравнивать не с кем, ``faster_than_percent`` равен None.
+    """
+
+    bin_ = duration_bin(duration_ms)
+    totals = SchulteResultBin.objects.filter(grid_size=grid_size, variant=variant).aggregate(
+        total=Sum('count'),
+        slower=Sum('count', filter=Q(bin__gt=bin_)),
+        same=Sum('count', filter=Q(bin=bin_)),
+    )
+    total = totals['total'] or 0
+    slower = totals['slower'] or 0
+    same = totals['same'] or 0
+    if recorded:
+        total = max(0, total - 1)
+        same = max(0, same - 1)
+
+    return {
+        'faster_than_percent': round(100 * (slower + same / 2) / total, 1) if total else None,
+        'compared_count': total,
+    }
+
+
+def record_result(
+    grid_size: int,
+    variant: str,
+    duration_ms: int,
+    mistakes: int = 0,
+    seed: Optional[int] = None,
+) -> tuple[SchulteResult, dict]:
+    """Сохраняет результат, увеличивает счетчик его корзины и возвращает процентиль."""
+
+    with transaction.atomic():
+        result = SchulteResult.objects.create(
+            grid_size=grid_size,
+            variant=variant,
+            duration_ms=duration_ms,
+            mistakes=mistakes,
+            seed=seed,
+        )
+        _increment_bin(grid_size, variant, duration_bin(duration_ms))
+    return result, result_percentile(grid_size, variant, duration_ms, recorded=True)
+
+
+def rebuild_result_bins() -> int:
+    """Пересчитывает все корзины по таблице результатов (например, после ручной правки данных)."""
+
+    counts: Counter = Counter()
+    results = SchulteResult.objects.values_list('grid_size', 'variant', 'duration_ms')
+    for grid_size, variant, duration_ms in results.iterator(chunk_size=2000):
+        counts[grid_size, variant, duration_bin(duration_ms)] += 1
+
+    with transaction.atomic():
+        SchulteResultBin.objects.all().delete()
+        SchulteResultBin.objects.bulk_create(
+            SchulteResultBin(grid_size=grid_size, variant=variant, bin=bin_, count=count)
+            for (grid_size, variant, bin_), count in counts.items()
+        )
+    return len(counts)
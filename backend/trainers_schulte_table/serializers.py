@@ -1,6 +1,12 @@
 from rest_framework import serializers
 
-from .models import SchulteTableLevel
+from trainers.seeding import MAX_SEED
+
+from .models import SchulteResult, SchulteTableLevel
+from .services import MAX_GRID_SIZE, MAX_VARIANT_GRID_SIZE, MIN_GRID_SIZE, VARIANT_NUMBERS, VARIANTS
+
+MAX_DURATION_MS = 3_600_000
+MAX_MISTAKES = 10_000
 
 
 class SchulteTableLevelSerializer(serializers.ModelSerializer):
@@ -16,3 +22,35 @@ class SchulteTableLevelSerializer(serializers.ModelSerializer):
             'is_active',
         ]
 
+
+class SchultePercentileQuerySerializer(serializers.Serializer):
+    grid_size = serializers.IntegerField(min_value=MIN_GRID_SIZE, max_value=MAX_GRID_SIZE)
+    variant = serializers.ChoiceField(choices=VARIANTS, default=VARIANT_NUMBERS)
+    duration_ms = serializers.IntegerField(min_value=1, max_value=MAX_DURATION_MS)
+
+    def validate(self, attrs: dict) -> dict:
+        max_size = MAX_VARIANT_GRID_SIZE[attrs['variant']]
+        if attrs['grid_size'] > max_size:
+            raise serializers.ValidationError(
+                {'grid_size': f'Размер таблицы должен быть от {MIN_GRID_SIZE} до {max_size}.'}
+            )
+        return attrs
+
+
+class SchulteResultRequestSerializer(SchultePercentileQuerySerializer):
+    mistakes = serializers.IntegerField(min_value=0, max_value=MAX_MISTAKES, default=0)
+    seed = serializers.IntegerField(min_value=0, max_value=MAX_SEED, required=False, allow_null=True)
+
+
+class SchulteResultSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SchulteResult
+        fields = [
+            'id',
+            'grid_size',
+            'variant',
+            'duration_ms',
+            'mistakes',
+            'seed',
+            'created_at',
+        ]
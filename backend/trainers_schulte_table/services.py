@@ -0,0 +1,94 @@
+import random
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple, Union
+
+MIN_GRID_SIZE = 2
+MAX_GRID_SIZE = 10
+DEFAULT_GRID_SIZE = 4
+
+VARIANT_NUMBERS = 'numbers'
+VARIANT_REVERSE = 'reverse'
+VARIANT_LETTERS = 'letters'
+VARIANT_GORBOV = 'gorbov'
+VARIANTS = (VARIANT_NUMBERS, VARIANT_REVERSE, VARIANT_LETTERS, VARIANT_GORBOV)
+
+# Без Ё, Й, Ъ, Ы и Ь — их легко спутать с соседними буквами на маленьких карточках.
+LETTERS = 'АБВГДЕЖЗИКЛМНОПРСТУФХЦЧШЩЭЮЯ'
+
+# Наибольший размер сетки для каждого варианта: буквенная таблица ограничена алфавитом.
+MAX_VARIANT_GRID_SIZE = {
+    VARIANT_NUMBERS: MAX_GRID_SIZE,
+    VARIANT_REVERSE: MAX_GRID_SIZE,
+    VARIANT_LETTERS: 5,
+    VARIANT_GORBOV: MAX_GRID_SIZE,
+}
+
+# Порядок поиска: reverse — от большего к меньшему, gorbov — черные по возрастанию
+# вперемежку с красными по убыванию.
+VARIANT_ORDERS = {
+    VARIANT_NUMBERS: 'asc',
+    VARIANT_REVERSE: 'desc',
+    VARIANT_LETTERS: 'asc',
+    VARIANT_GORBOV: 'alternating',
+}
+
+Cell = Union[int, str]
+
+
+def generate_schulte_layout(size: int, rng: Optional[random.Random] = None) -> List[int]:
+    """
+    Раскладка таблицы: перестановка индексов 0..size²-1 по ячейкам слева направо, сверху вниз.
+
+    Перемешивание то же, что и у прежней таблицы из чисел, поэтому зерно дает ту же таблицу.
+    """
+
+    rng = rng if rng is not None else random.Random()
+    layout = list(range(size * size))
+    rng.shuffle(layout)
+    return layout
+
+
+def generate_schulte_layouts(size: int, count: int, rng: Optional[random.Random] = None) -> List[Tuple[int, List[int]]]:
+    """
+    Генерирует ``count`` раскладок одного размера за вызов. Каждая раскладка получает
+    собственное зерно из ``rng`` и воспроизводится отдельно через generate_schulte_layout.
+    """
+
+    rng = rng if rng is not None else random.Random()
+    layouts: List[Tuple[int, List[int]]] = []
+    for _ in range(count):
+        seed = rng.getrandbits(32)
+        layouts.append((seed, generate_schulte_layout(size, random.Random(seed))))
+    return layouts
+
+
+@lru_cache(maxsize=None)
+def variant_cells(variant: str, size: int) -> Tuple[Cell, ...]:
+    """
+    Содержимое ячейки для каждого индекса раскладки.
+
+    - numbers и reverse — числа 1..size² (в reverse их ищут от большего к меньшему);
+    - letters — буквы по алфавиту;
+    - gorbov — черно-красная таблица Горбова: четные индексы — черные числа 1, 2, …,
+      нечетные — красные, они передаются отрицательными (-1, -2, …).
+    """
+
+    total = size * size
+    if variant == VARIANT_LETTERS:
+        return tuple(LETTERS[:total])
+    if variant == VARIANT_GORBOV:
+        return tuple(index // 2 + 1 if index % 2 == 0 else -(index // 2 + 1) for index in range(total))
+    return tuple(range(1, total + 1))
+
+
+def layout_cells(layout: Sequence[int], variant: str, size: int) -> List[Cell]:
+    """Плоский массив ячеек таблицы варианта по раскладке."""
+
+    cells = variant_cells(variant, size)
+    return [cells[index] for index in layout]
+
+
+def generate_schulte_numbers(size: int, rng: Optional[random.Random] = None) -> List[int]:
+    """Перемешанные числа от 1 до size² для таблицы Шульте."""
+
+    return layout_cells(generate_schulte_layout(size, rng), VARIANT_NUMBERS, size)
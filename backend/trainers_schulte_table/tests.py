@@ -1,3 +1,148 @@
-from django.test import TestCase
+import random
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .models import SchulteResult, SchulteResultBin
+from .ranking import duration_bin
+from .services import (
+    LETTERS,
+    generate_schulte_layout,
+    generate_schulte_layouts,
+    generate_schulte_numbers,
+    layout_cells,
+)
+
+
+class SchulteSessionViewTests(APITestCase):
+    def test_session_returns_shuffled_numbers(self):
+        response = self.client.get(reverse('schulte-session'), {'size': 5})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        payload = response.json()
+        self.assertEqual(payload['grid_size'], 5)
+        self.assertEqual(sorted(payload['numbers']), list(range(1, 26)))
+        self.assertIn('seed', payload)
+
+    def test_same_seed_returns_same_table(self):
+        first = self.client.get(reverse('schulte-session'), {'size': 6, 'seed': 5}).json()
+        second = self.client.get(reverse('schulte-session'), {'size': 6, 'seed': 5}).json()
+
+        self.assertEqual(first['numbers'], second['numbers'])
+
+    def test_numbers_variant_keeps_previous_layout_for_seed(self):
+        payload = self.client.get(reverse('schulte-session'), {'size': 4, 'seed': 11}).json()
+
+        self.assertEqual(payload['numbers'], generate_schulte_numbers(4, random.Random(11)))
+        self.assertEqual(payload['cells'], payload['numbers'])
+        self.assertEqual(payload['variant'], 'numbers')
+        self.assertEqual(payload['order'], 'asc')
+
+    def test_variants_share_layout_for_seed(self):
+        params = {'size': 5, 'seed': 9}
+        numbers = self.client.get(reverse('schulte-session'), params).json()['cells']
+        reverse_ = self.client.get(reverse('schulte-session'), {**params, 'variant': 'reverse'}).json()
+        letters = self.client.get(reverse('schulte-session'), {**params, 'variant': 'letters'}).json()
+        gorbov = self.client.get(reverse('schulte-session'), {**params, 'variant': 'gorbov'}).json()
+
+        self.assertEqual(reverse_['cells'], numbers)
+        self.assertEqual(reverse_['order'], 'desc')
+        self.assertNotIn('numbers', reverse_)
+        self.assertEqual(letters['cells'], [LETTERS[value - 1] for value in numbers])
+        self.assertEqual(sorted(value for value in gorbov['cells'] if value > 0), list(range(1, 14)))
+        self.assertEqual(sorted(-value for value in gorbov['cells'] if value < 0), list(range(1, 13)))
+
+    def test_large_grid_and_size_limits(self):
+        response = self.client.get(reverse('schulte-session'), {'size': 10, 'variant': 'gorbov'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['cells']), 100)
+
+        too_large = self.client.get(reverse('schulte-session'), {'size': 11})
+        self.assertEqual(too_large.status_code, status.HTTP_400_BAD_REQUEST)
+        letters = self.client.get(reverse('schulte-session'), {'size': 6, 'variant': 'letters'})
+        self.assertEqual(letters.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unknown_variant_returns_error(self):
+        response = self.client.get(reverse('schulte-session'), {'variant': 'spiral'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('available_variants', response.json())
+
+
+class SchulteLayoutTests(SimpleTestCase):
+    def test_batched_layouts_are_reproducible_one_by_one(self):
+        layouts = generate_schulte_layouts(7, 4, random.Random(2))
+
+        self.assertEqual(len(layouts), 4)
+        for seed, layout in layouts:
+            self.assertEqual(sorted(layout), list(range(49)))
+            self.assertEqual(generate_schulte_layout(7, random.Random(seed)), layout)
+
+    def test_layout_cells_for_gorbov(self):
+        self.assertEqual(layout_cells([3, 0, 2, 1], 'gorbov', 2), [-2, 1, 2, -1])
+
+
+class SchulteResultTests(APITestCase):
+    def _submit(self, duration_ms, grid_size=5, variant='numbers'):
+        response = self.client.post(
+            reverse('schulte-results'),
+            {'grid_size': grid_size, 'variant': variant, 'duration_ms': duration_ms},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.json()
+
+    def test_first_result_has_nothing_to_compare_with(self):
+        payload = self._submit(20_000)
+
+        self.assertIsNone(payload['faster_than_percent'])
+        self.assertEqual(payload['compared_count'], 0)
+        self.assertEqual(SchulteResultBin.objects.get().count, 1)
+
+    def test_percentile_among_previous_results(self):
+        for duration_ms in (10_000, 20_000, 30_000, 40_000):
+            self._submit(duration_ms)
+        self._submit(5_000, grid_size=6)
+
+        payload = self._submit(25_000)
+        self.assertEqual(payload['compared_count'], 4)
+        self.assertEqual(payload['faster_than_percent'], 50.0)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse('schulte-result-percentile'),
+                {'grid_size': 5, 'duration_ms': 9_000},
+            )
+        self.assertEqual(response.json()['faster_than_percent'], 100.0)
+        self.assertEqual(response.json()['compared_count'], 5)
+
+    def test_same_bin_counts_as_half(self):
+        self._submit(20_000)
+        payload = self._submit(20_100)
+
+        self.assertEqual(duration_bin(20_000), duration_bin(20_100))
+        self.assertEqual(payload['faster_than_percent'], 50.0)
+
+    def test_rebuild_matches_incremental_bins(self):
+        for duration_ms in (700, 700, 15_000, 90_000):
+            self._submit(duration_ms, variant='gorbov')
+        incremental = list(SchulteResultBin.objects.values_list('grid_size', 'variant', 'bin', 'count'))
+
+        SchulteResultBin.objects.all().delete()
+        call_command('rebuild_schulte_bins', stdout=StringIO())
+
+        self.assertEqual(list(SchulteResultBin.objects.values_list('grid_size', 'variant', 'bin', 'count')), incremental)
+
+    def test_invalid_result_is_rejected(self):
+        response = self.client.post(
+            reverse('schulte-results'),
+            {'grid_size': 6, 'variant': 'letters', 'duration_ms': 1000},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(SchulteResult.objects.exists())
@@ -1,8 +1,9 @@
 from django.urls import path
 
-from .views import SchulteSessionView
+from .views import SchulteResultPercentileView, SchulteResultView, SchulteSessionView
 
 urlpatterns = [
     path('session/', SchulteSessionView.as_view(), name='schulte-session'),
+    path('results/', SchulteResultView.as_view(), name='schulte-results'),
+    path('results/percentile/', SchulteResultPercentileView.as_view(), name='schulte-result-percentile'),
 ]
-
@@ -4,12 +4,38 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from trainers.pools import SessionPool
+from trainers.seeding import parse_seed
+
 from .models import SchulteTableLevel
-from .serializers import SchulteTableLevelSerializer
+from .ranking import record_result, result_percentile
+from .serializers import (
+    SchultePercentileQuerySerializer,
+    SchulteResultRequestSerializer,
+    SchulteResultSerializer,
+    SchulteTableLevelSerializer,
+)
+from .services import (
+    DEFAULT_GRID_SIZE,
+    MAX_VARIANT_GRID_SIZE,
+    MIN_GRID_SIZE,
+    VARIANT_NUMBERS,
+    VARIANT_ORDERS,
+    VARIANTS,
+    generate_schulte_layout,
+    generate_schulte_layouts,
+    layout_cells,
+)
 
 
 class SchulteSessionView(APIView):
-    """Генерация сессии для тренажера «Таблица Шульте»."""
+    """
+    Генерация сессии для тренажера «Таблица Шульте».
+
+    Таблица передается плоским массивом ``cells`` (по строкам) вместе с зерном:
+    раскладка ячеек зависит только от размера и зерна, вариант определяет лишь
+    содержимое ячеек, поэтому одно зерно дает одинаковую раскладку во всех вариантах.
+    """
 
     def get(self, request):
         size_param = request.query_params.get('size')
@@ -24,21 +50,83 @@ class SchulteSessionView(APIView):
             serializer = SchulteTableLevelSerializer(level)
             return Response(serializer.data)
 
+        variant = request.query_params.get('variant', VARIANT_NUMBERS).lower()
+        if variant not in VARIANTS:
+            return Response(
+                {'detail': 'Неизвестный вариант таблицы.', 'available_variants': list(VARIANTS)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         try:
-            size = int(size_param) if size_param is not None else 4
+            size = int(size_param) if size_param is not None else DEFAULT_GRID_SIZE
         except ValueError:
             return Response({'detail': 'Размер таблицы должен быть числом.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        if size < 2 or size > 8:
-            return Response({'detail': 'Размер таблицы должен быть от 2 до 8.'}, status=status.HTTP_400_BAD_REQUEST)
+        max_size = MAX_VARIANT_GRID_SIZE[variant]
+        if size < MIN_GRID_SIZE or size > max_size:
+            return Response(
+                {'detail': f'Размер таблицы должен быть от {MIN_GRID_SIZE} до {max_size}.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            seed = parse_seed(request.query_params.get('seed'))
+        except ValueError:
+            return Response({'detail': 'Некорректное значение seed.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        numbers = list(range(1, size * size + 1))
-        random.shuffle(numbers)
+        if seed is None:
+            seed, layout = SCHULTE_LAYOUT_POOL.get(size)
+        else:
+            seed, layout = SCHULTE_LAYOUT_POOL.generate(size, seed)
 
+        cells = layout_cells(layout, variant, size)
+        payload = {
+            'grid_size': size,
+            'variant': variant,
+            'order': VARIANT_ORDERS[variant],
+            'seed': seed,
+            'cells': cells,
+            'time_limit_seconds': None,
+        }
+        if variant == VARIANT_NUMBERS:
+            # Прежнее поле классической таблицы — его читает текущий клиент.
+            payload['numbers'] = cells
+        return Response(payload)
+
+
+class SchulteResultView(APIView):
+    """Сохраняет время прохождения таблицы и сразу возвращает процентиль среди всех результатов."""
+
+    def post(self, request):
+        request_serializer = SchulteResultRequestSerializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
+
+        result, percentile = record_result(**request_serializer.validated_data)
         return Response(
-            {
-                'grid_size': size,
-                'numbers': numbers,
-                'time_limit_seconds': None,
-            }
+            {**SchulteResultSerializer(result).data, **percentile},
+            status=status.HTTP_201_CREATED,
         )
+
+
+class SchulteResultPercentileView(APIView):
+    """Процентиль произвольного времени без сохранения результата."""
+
+    def get(self, request):
+        query_serializer = SchultePercentileQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+
+        data = query_serializer.validated_data
+        percentile = result_percentile(data['grid_size'], data['variant'], data['duration_ms'])
+        return Response({**data, **percentile})
+
+
+def _generate_pooled_layout(size: int, rng: random.Random) -> list[int]:
+    return generate_schulte_layout(size, rng)
+
+
+def _generate_pooled_layouts(size: int, count: int) -> list[tuple[int, list[int]]]:
+    return generate_schulte_layouts(size, count)
+
+
+# Раскладки общие для всех вариантов, поэтому пул ведется по размеру сетки.
+SCHULTE_LAYOUT_POOL = SessionPool('schulte', _generate_pooled_layout, batch_factory=_generate_pooled_layouts)
@@ -0,0 +1,96 @@
+import json
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from django.core.management.base import BaseCommand, CommandError
+
+from trainers_simply.validation import ValidationTask, validate_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерирует большое число последовательностей «Просто» на всех ядрах, собирает "
+        "распределения цифр, знаков и итогов и проверяет инварианты генератора."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sequences", type=int, default=10_000, help="Последовательностей на каждую комбинацию.")
+        parser.add_argument("--lengths", default="2,5,10,20,50,99", help="Значения num_examples через запятую.")
+        parser.add_argument("--chunk", type=int, default=2_000, help="Последовательностей в одной задаче процесса.")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Количество процессов.")
+        parser.add_argument("--seed", type=int, default=0, help="Зерно для воспроизводимого прогона.")
+        parser.add_argument("--output", default="", help="Путь к JSON-отчету с гистограммами.")
+
+    def handle(self, *args, **options):
+        try:
+            lengths = [int(value) for value in options["lengths"].split(",") if value.strip()]
+        except ValueError:
+            raise CommandError("--lengths должен быть списком чисел через запятую.")
+        if any(not 2 <= length <= 99 for length in lengths):
+            raise CommandError("Значения --lengths должны быть от 2 до 99.")
+        if options["sequences"] < 1 or options["chunk"] < 1 or options["workers"] < 1:
+            raise CommandError("--sequences, --chunk и --workers должны быть положительными.")
+
+        seeds = random.Random(options["seed"])
+        tasks: List[ValidationTask] = []
+        for range_key in range(1, 5):
+            for max_digit in range(2, 10):
+                for num_examples in lengths:
+                    remaining = options["sequences"]
+                    while remaining > 0:
+                        count = min(options["chunk"], remaining)
+                        tasks.append((range_key, max_digit, num_examples, count, seeds.getrandbits(32)))
+                        remaining -= count
+
+        groups: Dict[tuple, Dict] = {}
+        violation_count = 0
+        violations: List[Dict] = []
+
+        with ProcessPoolExecutor(max_workers=options["workers"]) as executor:
+            for result in executor.map(validate_batch, tasks, chunksize=4):
+                key = (result["range_key"], result["max_digit"])
+                group = groups.setdefault(
+                    key,
+                    {"sequences": 0, "digits": Counter(), "signs": Counter(), "totals": Counter()},
+                )
+                group["sequences"] += result["sequences"]
+                group["digits"].update(result["digits"])
+                group["signs"].update(result["signs"])
+                group["totals"].update(result["totals"])
+
+                violation_count += result["violation_count"]
+                for violation in result["violations"]:
+                    if len(violations) < 20:
+                        violations.append({"range_key": key[0], "max_digit": key[1], **violation})
+
+        report = {
+            "sequences": sum(group["sequences"] for group in groups.values()),
+            "violation_count": violation_count,
+            "violations": violations,
+            "groups": [
+                {
+                    "range_key": range_key,
+                    "max_digit": max_digit,
+                    "sequences": group["sequences"],
+                    "digits": {digit: group["digits"][digit] for digit in sorted(group["digits"])},
+                    "signs": dict(group["signs"]),
+                    "totals": {str(total): group["totals"][total] for total in sorted(group["totals"])},
+                }
+                for (range_key, max_digit), group in sorted(groups.items())
+            ],
+        }
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as report_file:
+                json.dump(report, report_file, ensure_ascii=False, indent=2)
+
+        self.stdout.write(f"Проверено последовательностей: {report['sequences']}, задач: {len(tasks)}")
+        if violation_count:
+            for violation in violations:
+                self.stderr.write(json.dumps(violation, ensure_ascii=False))
+            raise CommandError(f"Нарушений инвариантов: {violation_count}")
+
+        self.stdout.write(self.style.SUCCESS("Все инварианты выполнены."))
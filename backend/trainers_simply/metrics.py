@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Tuple
+
+MetricKey = Tuple[str, int, int]  # (путь генератора, range_key, max_digit)
+
+# Пути генератора «Просто»:
+# constructive — однозначные последовательности при max_digit < 5;
+# abacus — однозначная последовательность по правилам абакуса;
+# abacus_columns — многозначная последовательность по столбцам абакуса;
+# abacus_reset — сброс абакуса, когда из текущего состояния нет допустимых ходов;
+# abacus_correction — корректирующее число в конце, если сумма превысила max_digit.
+PATHS = ("constructive", "abacus", "abacus_columns", "abacus_reset", "abacus_correction")
+
+
+class GeneratorMetrics:
+    """Потокобезопасные счетчики и время выполнения по путям генератора с тегами range_key и max_digit."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[MetricKey, List[float]] = {}  # [количество, суммарное время, максимум]
+
+    def observe(self, path: str, range_key: int, max_digit: int, duration: float = 0.0, count: int = 1) -> None:
+        key = (path, range_key, max_digit)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                self._stats[key] = [count, duration, duration]
+            else:
+                stats[0] += count
+                stats[1] += duration
+                if duration > stats[2]:
+                    stats[2] = duration
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            items = sorted(self._stats.items())
+        return [
+            {
+                "path": path,
+                "range_key": range_key,
+                "max_digit": max_digit,
+                "count": int(count),
+                "total_ms": round(total * 1000, 3),
+                "mean_us": round(total / count * 1_000_000, 3) if count else 0.0,
+                "max_us": round(maximum * 1_000_000, 3),
+            }
+            for (path, range_key, max_digit), (count, total, maximum) in items
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+SIMPLY_METRICS = GeneratorMetrics()
@@ -1,11 +1,16 @@
 from rest_framework import serializers
 
+from trainers.seeding import MAX_SEED
+
+from .services import MAX_BATCH_SESSIONS
+
 
 class SimplySessionRequestSerializer(serializers.Serializer):
     range_key = serializers.ChoiceField(choices=[(1, "1-10"), (2, "10-100"), (3, "100-1000"), (4, "1000-10000")], default=2)
     num_examples = serializers.IntegerField(min_value=2, max_value=99, default=10)
     speed = serializers.FloatField(min_value=0.1, max_value=10, default=1.0)
     max_digit = serializers.IntegerField(min_value=2, max_value=9, default=9)
+    seed = serializers.IntegerField(min_value=0, max_value=MAX_SEED, required=False)
 
 
 class SimplyNumberSerializer(serializers.Serializer):
@@ -24,6 +29,23 @@ class SimplySettingsSerializer(serializers.Serializer):
 
 class SimplySessionResponseSerializer(serializers.Serializer):
     settings = SimplySettingsSerializer()
+    seed = serializers.IntegerField()
     numbers = SimplyNumberSerializer(many=True)
     total = serializers.IntegerField()
 
+
+class SimplyBatchSessionRequestSerializer(SimplySessionRequestSerializer):
+    count = serializers.IntegerField(min_value=1, max_value=MAX_BATCH_SESSIONS, default=30)
+
+
+class SimplyBatchSessionItemSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    numbers = serializers.ListField(child=serializers.IntegerField())
+    total = serializers.IntegerField()
+
+
+class SimplyBatchSessionResponseSerializer(serializers.Serializer):
+    settings = SimplySettingsSerializer()
+    seed = serializers.IntegerField()
+    count = serializers.IntegerField()
+    sessions = SimplyBatchSessionItemSerializer(many=True)
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 import random
+import time
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .metrics import SIMPLY_METRICS
 
 RANGE_LABELS: Dict[int, str] = {
     1: "от 1 до 10",
@@ -11,6 +16,8 @@ RANGE_LABELS: Dict[int, str] = {
     4: "от 1000 до 10000",
 }
 
+MAX_BATCH_SESSIONS = 300
+
 
 @dataclass(frozen=True)
 class RangeConfig:
@@ -54,223 +61,399 @@ def resolve_range(range_key: int, max_digit: int) -> Tuple[RangeConfig, int]:
     return config, effective_max
 
 
-def generate_abacus_numbers(max_digit: int, num_examples: int) -> List[int]:
+AbacusState = Tuple[bool, int, int]  # (есть ли пятерка, единичные косточки, текущая сумма)
+
+
+@dataclass(frozen=True)
+class AbacusTransitions:
+    """Допустимые ходы из одного состояния абакуса с накопленными весами."""
+
+    values: Tuple[int, ...]
+    next_states: Tuple[AbacusState, ...]
+    cum_weights: Tuple[int, ...]
+
+
+def _abacus_operation_weight(value: int, max_digit: int) -> int:
+    if value == max_digit:
+        return 6 if max_digit == 9 else 5 if max_digit == 4 else 4
+    if value == 5 and max_digit >= 5:
+        return 2
+    return 1
+
+
+def _build_abacus_transitions(max_digit: int, max_intermediate_sum: int = 9) -> Dict[AbacusState, AbacusTransitions]:
     """
-    Генерирует последовательность по правилам абакуса (для однозначных чисел).
+    Строит таблицу переходов абакуса для одного значения max_digit.
     Логика перенесена из оригинального проекта mental_final_new.
     """
 
+    table: Dict[AbacusState, AbacusTransitions] = {}
+    max_units = min(4, max_digit)
+
+    for has_five in (False, True):
+        for units in range(5):
+            for current_sum in range(max_intermediate_sum + 1):
+                operations = []
+                if max_digit >= 5:
+                    operations.append(-5 if has_five else 5)
+
+                for i in range(1, max_units + 1):
+                    if units + i <= 4:
+                        operations.append(i)
+                    if units - i >= 0:
+                        operations.append(-i)
+
+                if max_digit > 5:
+                    operations.append(max_digit)
+                    operations.append(-max_digit)
+
+                values: List[int] = []
+                next_states: List[AbacusState] = []
+                cum_weights: List[int] = []
+                cumulative = 0
+                for value in operations:
+                    new_sum = current_sum + value
+                    if not 0 <= new_sum <= max_intermediate_sum:
+                        continue
+
+                    magnitude = abs(value)
+                    if magnitude == 5:
+                        next_state = (value > 0, units, new_sum)
+                    elif magnitude > 5:
+                        next_state = (has_five, units, new_sum)
+                    else:
+                        next_state = (has_five, units + value, new_sum)
+
+                    cumulative += _abacus_operation_weight(magnitude, max_digit)
+                    values.append(value)
+                    next_states.append(next_state)
+                    cum_weights.append(cumulative)
+
+                table[(has_five, units, current_sum)] = AbacusTransitions(
+                    tuple(values), tuple(next_states), tuple(cum_weights)
+                )
+
+    return table
+
+
+ABACUS_TRANSITIONS: Dict[int, Dict[AbacusState, AbacusTransitions]] = {
+    max_digit: _build_abacus_transitions(max_digit) for max_digit in range(2, 10)
+}
+
+ABACUS_INITIAL_STATE: AbacusState = (False, 0, 0)
+
+
+def iter_abacus_numbers(max_digit: int, num_examples: int, rng: Optional[random.Random] = None) -> Iterator[int]:
+    """
+    Генерирует последовательность по правилам абакуса (для однозначных чисел), по одному числу.
+    Каждый шаг — поиск состояния в ABACUS_TRANSITIONS и выбор хода по накопленным весам.
+    """
+
+    rng = rng if rng is not None else random.Random()
     max_digit = int(clamp(max_digit, 2, 9))
-    numbers: List[int] = []
+    transitions = ABACUS_TRANSITIONS[max_digit]
+    state = ABACUS_INITIAL_STATE
+    resets = 0
+    total_sum = 0
+
+    for _ in range(num_examples):
+        options = transitions[state]
+        if not options.values:
+            resets += 1
+            state = ABACUS_INITIAL_STATE
+            options = transitions[state]
+
+        index = bisect_right(options.cum_weights, rng.randrange(options.cum_weights[-1]))
+        state = options.next_states[index]
+        total_sum += options.values[index]
+        yield options.values[index]
+
+    if resets:
+        SIMPLY_METRICS.observe("abacus_reset", 1, max_digit, count=resets)
+
+    if total_sum > max_digit:
+        SIMPLY_METRICS.observe("abacus_correction", 1, max_digit)
+        yield max_digit - total_sum
+
+
+def generate_abacus_numbers(max_digit: int, num_examples: int, rng: Optional[random.Random] = None) -> List[int]:
+    """Последовательность по правилам абакуса (для однозначных чисел) одним списком."""
+
+    return list(iter_abacus_numbers(max_digit, num_examples, rng))
+
+
+@dataclass(frozen=True)
+class ColumnMoves:
+    """Прямые (без переходов через разряд) ходы для одного столбца абакуса."""
+
+    plus: Tuple[int, ...]
+    minus_nonzero: Tuple[int, ...]
+    minus_unblocked: Tuple[int, ...]
+    up_blocked: bool
+
+
+def _is_direct_column_move(column_value: int, delta: int) -> bool:
+    """Можно ли прибавить/отнять ``delta`` в столбце одними косточками, без дополнений до 5 и 10."""
+
+    has_five, units = divmod(column_value, 5)
+    five_delta, units_delta = divmod(abs(delta), 5)
+    if delta > 0:
+        return not (has_five and five_delta) and units + units_delta <= 4
+    return (has_five or not five_delta) and units >= units_delta
+
+
+def _build_column_moves(max_digit: int) -> Tuple[ColumnMoves, ...]:
+    """
+    Таблица ходов для значений столбца 0..max_digit. Состояние столбца — та же пара
+    (есть ли пятерка, единичные косточки), что и в ABACUS_TRANSITIONS, она однозначно
+    задается цифрой столбца.
+    """
+
+    digits = range(1, max_digit + 1)
+    plus = [
+        tuple(d for d in digits if value + d <= max_digit and _is_direct_column_move(value, d))
+        for value in range(max_digit + 1)
+    ]
+    minus = [
+        tuple(d for d in digits if value - d >= 0 and _is_direct_column_move(value, -d))
+        for value in range(max_digit + 1)
+    ]
+    up_blocked = [not moves for moves in plus]
+
+    return tuple(
+        ColumnMoves(
+            plus=plus[value],
+            minus_nonzero=tuple(d for d in minus[value] if value - d != 0),
+            minus_unblocked=tuple(d for d in minus[value] if not up_blocked[value - d]),
+            up_blocked=up_blocked[value],
+        )
+        for value in range(max_digit + 1)
+    )
+
+
+ABACUS_COLUMN_MOVES: Dict[int, Tuple[ColumnMoves, ...]] = {
+    max_digit: _build_column_moves(max_digit) for max_digit in range(2, 10)
+}
+
+
+def iter_abacus_column_numbers(
+    num_digits: int,
+    max_digit: int,
+    num_examples: int,
+    rng: Optional[random.Random] = None,
+) -> Iterator[int]:
+    """
+    Генерирует многозначные числа по правилам абакуса «Просто»: каждый столбец меняется
+    прямым ходом, значение столбца остается в пределах 0..max_digit, все цифры числа
+    от 1 до max_digit, знак общий для всех столбцов.
+
+    Тупиком было бы состояние, где один столбец пуст (нельзя отнимать), а другой
+    заблокирован сверху (нельзя прибавлять). Прибавление не дает пустых столбцов,
+    а при вычитании цифры выбираются так, чтобы не появились одновременно пустые
+    и заблокированные столбцы, поэтому генерация идет за один проход без отказов.
+    """
+
+    rng = rng if rng is not None else random.Random()
+    max_digit = int(clamp(max_digit, 2, 9))
+    moves = ABACUS_COLUMN_MOVES[max_digit]
+    columns = [0] * num_digits
+
+    for _ in range(num_examples):
+        can_add = not any(moves[value].up_blocked for value in columns)
+        can_subtract = all(columns)
+        if can_add and can_subtract:
+            sign = rng.choice((1, -1))
+        else:
+            sign = 1 if can_add else -1
+
+        if sign > 0:
+            options = [moves[value].plus for value in columns]
+        else:
+            options = [moves[value].minus_unblocked for value in columns]
+            nonzero = [moves[value].minus_nonzero for value in columns]
+            if all(nonzero) and rng.random() < 0.5:
+                options = nonzero
+
+        number = 0
+        for position, digits in enumerate(options):
+            digit = rng.choice(digits)
+            columns[position] += digit * sign
+            number = number * 10 + digit
+
+        yield number * sign
+
+
+def generate_abacus_column_numbers(
+    num_digits: int,
+    max_digit: int,
+    num_examples: int,
+    rng: Optional[random.Random] = None,
+) -> List[int]:
+    """Многозначная последовательность по столбцам абакуса одним списком."""
+
+    return list(iter_abacus_column_numbers(num_digits, max_digit, num_examples, rng))
+
+
+@lru_cache(maxsize=None)
+def number_pool(num_digits: int, max_digit: int) -> Tuple[int, ...]:
+    """
+    Отсортированный набор модулей чисел, которые может дать тренажер:
+    все числа из ``num_digits`` цифр, каждая цифра от 1 до ``max_digit``.
+    """
+
+    digits = range(1, max_digit + 1)
+    pool = [0]
+    for _ in range(num_digits):
+        pool = [value * 10 + digit for value in pool for digit in digits]
+    return tuple(sorted(pool))
+
+
+def _iter_pool_numbers(pool: Tuple[int, ...], max_sum: int, num_examples: int, rng: random.Random) -> Iterator[int]:
     current_sum = 0
-    abacus_state = [False, 0]  # [есть ли пятерка, количество единичных косточек]
-
-    def get_valid_operations(current_state, max_intermediate_sum):
-        operations = []
-        has_five, units = current_state
-
-        if max_digit >= 5:
-            if not has_five:
-                operations.append(("+", 5))
-            else:
-                operations.append(("-", 5))
-
-        max_units = min(4, max_digit) if max_digit < 5 else 4
-        for i in range(1, max_units + 1):
-            if units + i <= 4:
-                operations.append(("+", i))
-            if units - i >= 0:
-                operations.append(("-", i))
-
-        if max_digit > 5:
-            operations.append(("+", max_digit))
-            operations.append(("-", max_digit))
-
-        valid_operations = []
-        for sign, value in operations:
-            new_sum = current_sum + (value if sign == "+" else -value)
-            if 0 <= new_sum <= max_intermediate_sum:
-                valid_operations.append((sign, value))
-        return valid_operations
-
-    def get_weighted_operations(valid_ops):
-        weighted_ops = []
-        for op in valid_ops:
-            sign, value = op
-            if value == max_digit:
-                weight = 6 if max_digit == 9 else 5 if max_digit == 4 else 4
-                weighted_ops.extend([op] * weight)
-            elif value == 5 and max_digit >= 5:
-                weighted_ops.extend([op] * 2)
-            else:
-                weighted_ops.append(op)
-        return weighted_ops
 
     for _ in range(num_examples):
-        valid_ops = get_valid_operations(abacus_state, 9)
-        if not valid_ops:
-            abacus_state = [False, 0]
-            current_sum = 0
-            valid_ops = get_valid_operations(abacus_state, 9)
-
-        if not valid_ops:
-            safe_value = min(1, max_digit)
-            numbers.append(safe_value)
-            current_sum += safe_value
-            abacus_state[1] = min(4, abacus_state[1] + safe_value)
-            continue
-
-        weighted_ops = get_weighted_operations(valid_ops)
-        sign, value = random.choice(weighted_ops)
-
-        if value == 5:
-            abacus_state[0] = sign == "+"
-        elif value > 5:
-            pass
+        headroom = max_sum - current_sum
+        # Наименьшее число набора всегда помещается хотя бы с одним знаком,
+        # так как max_sum не меньше удвоенного минимального числа.
+        available = bisect_right(pool, max(current_sum, headroom))
+        number = pool[rng.randrange(available)]
+
+        if number <= headroom and number <= current_sum:
+            sign = rng.choice((1, -1))
+        elif number <= headroom:
+            sign = 1
         else:
-            if sign == "+":
-                abacus_state[1] += value
-            else:
-                abacus_state[1] -= value
+            sign = -1
 
-        final_number = value if sign == "+" else -value
-        numbers.append(final_number)
-        current_sum += final_number
+        current_sum += number * sign
+        yield number * sign
 
-    total_sum = sum(numbers)
-    if total_sum > max_digit:
-        correction = max_digit - total_sum
-        if correction:
-            numbers.append(correction)
 
+def _sequence_path(config: RangeConfig, max_digit: int) -> str:
+    if config.key == 1 and max_digit >= 5:
+        return "abacus"
+    if config.digits > 1:
+        return "abacus_columns"
+    return "constructive"
+
+
+def _iter_sequence(
+    config: RangeConfig,
+    max_sum: int,
+    max_digit: int,
+    num_examples: int,
+    rng: random.Random,
+) -> Iterator[int]:
+    path = _sequence_path(config, max_digit)
+    if path == "abacus":
+        return iter_abacus_numbers(max_digit, num_examples, rng)
+    if path == "abacus_columns":
+        return iter_abacus_column_numbers(config.digits, max_digit, num_examples, rng)
+    return _iter_pool_numbers(number_pool(config.digits, max_digit), max_sum, num_examples, rng)
+
+
+def _build_sequence(
+    config: RangeConfig,
+    max_sum: int,
+    max_digit: int,
+    num_examples: int,
+    rng: random.Random,
+) -> List[int]:
+    started = time.perf_counter()
+    numbers = list(_iter_sequence(config, max_sum, max_digit, num_examples, rng))
+    SIMPLY_METRICS.observe(_sequence_path(config, max_digit), config.key, max_digit, time.perf_counter() - started)
     return numbers
 
 
-def generate_simply_sequence(range_key: int, num_examples: int, max_digit: int) -> Tuple[List[int], int, int, RangeConfig]:
+def generate_simply_sequence(
+    range_key: int,
+    num_examples: int,
+    max_digit: int,
+    rng: Optional[random.Random] = None,
+) -> Tuple[List[int], int, int, RangeConfig]:
     """
     Главная функция генерации чисел. Возвращает последовательность чисел, итоговую сумму,
     максимально возможную сумму и конфигурацию диапазона.
+
+    Однозначные числа при max_digit >= 5 строятся по таблице ABACUS_TRANSITIONS,
+    многозначные — по столбцам абакуса (generate_abacus_column_numbers). Для однозначных
+    чисел при max_digit < 5 число выбирается сразу из допустимой части набора: при
+    промежуточной сумме ``current_sum`` подходят только модули не больше
+    ``max(current_sum, max_sum - current_sum)``, а знак берется из тех, что оставляют сумму
+    в пределах ``[0, max_sum]``. Ни один путь не отбрасывает числа и не перезапускается,
+    а работа линейна по ``num_examples``.
     """
 
+    rng = rng if rng is not None else random.Random()
     max_digit = int(clamp(max_digit, 2, 9))
     num_examples = int(clamp(num_examples, 2, 99))
     config, max_sum = resolve_range(range_key, max_digit)
 
-    if config.key == 1 and max_digit >= 5:
-        numbers = generate_abacus_numbers(max_digit, num_examples)
-        return numbers, sum(numbers), max_sum, config
+    numbers = _build_sequence(config, max_sum, max_digit, num_examples, rng)
+    return numbers, sum(numbers), max_sum, config
 
-    numbers: List[int] = []
-    num_digits = config.digits
-    min_num = config.min_value
-    max_num = config.max_value
-    target_sum = random.randint(0, max_sum)
 
-    current_sum = 0
-    i = 0
-    max_attempts = 1000
-
-    while i < num_examples:
-        attempts = 0
-        while attempts < max_attempts:
-            attempts += 1
-
-            number = 0
-            valid_number = True
-            for digit_pos in range(num_digits):
-                available_first_digits = list(range(1, min(max_digit + 1, 10)))
-                if not available_first_digits:
-                    valid_number = False
-                    break
-                digit = random.choice(available_first_digits)
-                number += digit * (10 ** (num_digits - 1 - digit_pos))
-
-            if not valid_number:
-                continue
-
-            if not (min_num <= number <= max_num):
-                continue
-
-            remaining_numbers = num_examples - i - 1
-
-            if i == num_examples - 1:
-                needed_value = target_sum - current_sum
-                if abs(needed_value) == number:
-                    sign = 1 if needed_value > 0 else -1
-                    temp_sum = current_sum + (number * sign)
-                    if 0 <= temp_sum <= max_sum:
-                        final_number = number * sign
-                        numbers.append(final_number)
-                        current_sum += final_number
-                        break
-                continue
-
-            possible_signs = []
-            temp_sum_pos = current_sum + number
-            if 0 <= temp_sum_pos <= max_sum:
-                remaining_range = remaining_numbers * max_num
-                if temp_sum_pos - remaining_range <= target_sum <= temp_sum_pos + remaining_range:
-                    possible_signs.append(1)
-
-            temp_sum_neg = current_sum - number
-            if 0 <= temp_sum_neg <= max_sum:
-                remaining_range = remaining_numbers * max_num
-                if temp_sum_neg - remaining_range <= target_sum <= temp_sum_neg + remaining_range:
-                    possible_signs.append(-1)
-
-            if possible_signs:
-                sign = random.choice(possible_signs)
-                final_number = number * sign
-                numbers.append(final_number)
-                current_sum += final_number
-                break
-
-        if attempts >= max_attempts:
-            numbers = []
-            current_sum = 0
-            target_sum = random.randint(0, max_sum)
-            i = 0
-            continue
-
-        i += 1
-
-    if len(numbers) != num_examples:
-        numbers = []
-        current_sum = 0
-        for _ in range(num_examples):
-            number = 0
-            for digit_pos in range(num_digits):
-                available_first_digits = list(range(1, min(max_digit + 1, 10)))
-                digit = random.choice(available_first_digits) if available_first_digits else 1
-                number += digit * (10 ** (num_digits - 1 - digit_pos))
-
-            number = max(min_num, min(number, max_num))
-
-            possible_signs = []
-            if current_sum + number <= max_sum:
-                possible_signs.append(1)
-            if current_sum - number >= 0:
-                possible_signs.append(-1)
-
-            if not possible_signs:
-                sign = 1
-                if current_sum + number > max_sum:
-                    number = max_sum - current_sum
-                    if number < min_num:
-                        number = min_num
-            else:
-                sign = random.choice(possible_signs)
-
-            final_number = number * sign
-            numbers.append(final_number)
-            current_sum += final_number
-
-            if current_sum < 0:
-                current_sum = 0
-            elif current_sum > max_sum:
-                current_sum = max_sum
-
-    total = sum(numbers)
-    total = max(0, min(total, max_sum))
-    return numbers, total, max_sum, config
+def generate_simply_sessions(
+    range_key: int,
+    num_examples: int,
+    max_digit: int,
+    count: int,
+    rng: Optional[random.Random] = None,
+) -> Tuple[List[Tuple[List[int], int]], int, RangeConfig]:
+    """
+    Генерирует сразу ``count`` независимых последовательностей с одинаковыми настройками
+    (например, для печати листов на весь класс). Возвращает список пар (числа, итог),
+    максимально возможную сумму и конфигурацию диапазона.
+    """
+
+    rng = rng if rng is not None else random.Random()
+    max_digit = int(clamp(max_digit, 2, 9))
+    num_examples = int(clamp(num_examples, 2, 99))
+    count = int(clamp(count, 1, MAX_BATCH_SESSIONS))
+    config, max_sum = resolve_range(range_key, max_digit)
+
+    sessions: List[Tuple[List[int], int]] = []
+    for _ in range(count):
+        numbers = _build_sequence(config, max_sum, max_digit, num_examples, rng)
+        sessions.append((numbers, sum(numbers)))
+    return sessions, max_sum, config
+
+
+def _iter_observed_sequence(
+    config: RangeConfig,
+    max_sum: int,
+    max_digit: int,
+    num_examples: int,
+    rng: random.Random,
+) -> Iterator[int]:
+    # Засекается только генерация чисел, без времени, пока потребитель (поток SSE) их отправляет.
+    # Путь записывается в метрики, когда последовательность дочитана до конца.
+    numbers = _iter_sequence(config, max_sum, max_digit, num_examples, rng)
+    elapsed = 0.0
+    while True:
+        started = time.perf_counter()
+        value = next(numbers, None)
+        elapsed += time.perf_counter() - started
+        if value is None:
+            break
+        yield value
+    SIMPLY_METRICS.observe(_sequence_path(config, max_digit), config.key, max_digit, elapsed)
+
+
+def iter_simply_sequence(
+    range_key: int,
+    num_examples: int,
+    max_digit: int,
+    rng: Optional[random.Random] = None,
+) -> Tuple[Iterator[int], int, RangeConfig]:
+    """
+    Потоковый вариант generate_simply_sequence: возвращает итератор чисел, которые
+    генерируются по мере чтения, максимально возможную сумму и конфигурацию диапазона.
+    """
+
+    rng = rng if rng is not None else random.Random()
+    max_digit = int(clamp(max_digit, 2, 9))
+    num_examples = int(clamp(num_examples, 2, 99))
+    config, max_sum = resolve_range(range_key, max_digit)
 
+    return _iter_observed_sequence(config, max_sum, max_digit, num_examples, rng), max_sum, config
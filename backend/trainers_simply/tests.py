@@ -0,0 +1,271 @@
+import json
+import random
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .metrics import SIMPLY_METRICS
+from .services import (
+    _is_direct_column_move,
+    generate_abacus_column_numbers,
+    generate_abacus_numbers,
+    generate_simply_sequence,
+    number_pool,
+    resolve_range,
+)
+from .validation import check_sequence, validate_batch
+
+
+def legacy_generate_abacus_numbers(max_digit, num_examples):
+    """Реализация до таблицы переходов — эталон распределения."""
+
+    numbers = []
+    current_sum = 0
+    abacus_state = [False, 0]
+
+    def get_valid_operations(current_state, max_intermediate_sum):
+        operations = []
+        has_five, units = current_state
+        if max_digit >= 5:
+            operations.append(("-", 5) if has_five else ("+", 5))
+        max_units = min(4, max_digit) if max_digit < 5 else 4
+        for i in range(1, max_units + 1):
+            if units + i <= 4:
+                operations.append(("+", i))
+            if units - i >= 0:
+                operations.append(("-", i))
+        if max_digit > 5:
+            operations.append(("+", max_digit))
+            operations.append(("-", max_digit))
+        return [
+            (sign, value)
+            for sign, value in operations
+            if 0 <= current_sum + (value if sign == "+" else -value) <= max_intermediate_sum
+        ]
+
+    def get_weighted_operations(valid_ops):
+        weighted_ops = []
+        for op in valid_ops:
+            if op[1] == max_digit:
+                weighted_ops.extend([op] * (6 if max_digit == 9 else 5 if max_digit == 4 else 4))
+            elif op[1] == 5 and max_digit >= 5:
+                weighted_ops.extend([op] * 2)
+            else:
+                weighted_ops.append(op)
+        return weighted_ops
+
+    for _ in range(num_examples):
+        valid_ops = get_valid_operations(abacus_state, 9)
+        if not valid_ops:
+            abacus_state = [False, 0]
+            current_sum = 0
+            valid_ops = get_valid_operations(abacus_state, 9)
+
+        sign, value = random.choice(get_weighted_operations(valid_ops))
+        if value == 5:
+            abacus_state[0] = sign == "+"
+        elif value < 5:
+            abacus_state[1] += value if sign == "+" else -value
+
+        final_number = value if sign == "+" else -value
+        numbers.append(final_number)
+        current_sum += final_number
+
+    total_sum = sum(numbers)
+    if total_sum > max_digit:
+        numbers.append(max_digit - total_sum)
+    return numbers
+
+
+class SimplySequenceTests(SimpleTestCase):
+    def test_partial_sums_stay_within_range(self) -> None:
+        for range_key in range(1, 5):
+            for max_digit in range(2, 10):
+                if range_key == 1 and max_digit >= 5:
+                    continue
+                allowed = set(number_pool(max(1, range_key), max_digit))
+                for _ in range(20):
+                    numbers, total, max_sum, config = generate_simply_sequence(range_key, 99, max_digit)
+                    self.assertEqual(len(numbers), 99)
+                    self.assertEqual(config.key, range_key)
+
+                    current_sum = 0
+                    for number in numbers:
+                        self.assertIn(abs(number), allowed)
+                        current_sum += number
+                        self.assertGreaterEqual(current_sum, 0)
+                        self.assertLessEqual(current_sum, max_sum)
+                    self.assertEqual(total, current_sum)
+
+    def test_same_seed_reproduces_sequence(self) -> None:
+        for range_key in range(1, 5):
+            first = generate_simply_sequence(range_key, 30, 7, random.Random(42))
+            second = generate_simply_sequence(range_key, 30, 7, random.Random(42))
+            self.assertEqual(first, second)
+
+    def test_number_pool_uses_allowed_digits_only(self) -> None:
+        self.assertEqual(number_pool(2, 2), (11, 12, 21, 22))
+        self.assertEqual(len(number_pool(4, 9)), 9 ** 4)
+
+
+class AbacusTransitionTableTests(SimpleTestCase):
+    def test_matches_legacy_implementation_for_same_seed(self) -> None:
+        for max_digit in range(2, 10):
+            for seed in range(200):
+                random.seed(seed)
+                expected = legacy_generate_abacus_numbers(max_digit, 99)
+                self.assertEqual(generate_abacus_numbers(max_digit, 99, random.Random(seed)), expected)
+
+
+class AbacusColumnGeneratorTests(SimpleTestCase):
+    def test_every_column_move_is_direct(self) -> None:
+        for num_digits in range(2, 5):
+            for max_digit in range(2, 10):
+                rng = random.Random(num_digits * 10 + max_digit)
+                for _ in range(20):
+                    numbers = generate_abacus_column_numbers(num_digits, max_digit, 99, rng)
+                    self.assertEqual(len(numbers), 99)
+                    columns = [0] * num_digits
+                    for number in numbers:
+                        sign = 1 if number > 0 else -1
+                        digits = [int(char) for char in str(abs(number))]
+                        self.assertEqual(len(digits), num_digits)
+                        for position, digit in enumerate(digits):
+                            self.assertTrue(1 <= digit <= max_digit)
+                            self.assertTrue(_is_direct_column_move(columns[position], digit * sign))
+                            columns[position] += digit * sign
+                            self.assertTrue(0 <= columns[position] <= max_digit)
+
+
+class ValidationHarnessTests(SimpleTestCase):
+    def test_validate_batch_collects_histograms(self) -> None:
+        result = validate_batch((3, 6, 20, 50, 1))
+
+        self.assertEqual(result['violation_count'], 0)
+        self.assertEqual(result['sequences'], 50)
+        self.assertEqual(sum(result['signs'].values()), 50 * 20)
+        self.assertEqual(sum(result['totals'].values()), 50)
+        self.assertNotIn('0', result['digits'])
+
+    def test_check_sequence_detects_negative_partial_sum(self) -> None:
+        config, max_sum = resolve_range(2, 5)
+        error = check_sequence([11, -22, 33], 22, max_sum, config, 5, 3)
+
+        self.assertIn('отрицательная', error)
+
+    def test_command_runs_on_process_pool(self) -> None:
+        stdout = StringIO()
+        call_command('validate_generators', sequences=5, lengths='2,30', workers=2, stdout=stdout)
+
+        self.assertIn('Все инварианты выполнены', stdout.getvalue())
+
+
+class SimplySessionApiTests(APITestCase):
+    def test_session_endpoint(self) -> None:
+        response = self.client.post(
+            reverse('trainers_simply:session'),
+            {'range_key': 3, 'num_examples': 15, 'speed': 1.5, 'max_digit': 3},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['settings']['max_sum'], 333)
+        self.assertEqual(len(response.data['numbers']), 15)
+        self.assertEqual(response.data['total'], sum(item['value'] for item in response.data['numbers']))
+        self.assertIn('seed', response.data)
+
+    def test_session_endpoint_is_reproducible_with_seed(self) -> None:
+        payload = {'range_key': 2, 'num_examples': 20, 'max_digit': 6, 'seed': 2024}
+        first = self.client.post(reverse('trainers_simply:session'), payload, format='json')
+        second = self.client.post(reverse('trainers_simply:session'), payload, format='json')
+
+        self.assertEqual(first.data['seed'], 2024)
+        self.assertEqual(first.data['numbers'], second.data['numbers'])
+
+    def test_metrics_endpoint_reports_generator_paths(self) -> None:
+        SIMPLY_METRICS.reset()
+        generate_simply_sequence(3, 10, 4)
+        generate_simply_sequence(1, 10, 9)
+
+        response = self.client.get(reverse('trainers_simply:metrics'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        observed = {(item['path'], item['range_key'], item['max_digit']): item for item in response.data['paths']}
+        self.assertEqual(observed[('abacus_columns', 3, 4)]['count'], 1)
+        self.assertEqual(observed[('abacus', 1, 9)]['count'], 1)
+
+    def test_stream_endpoint_records_generator_path(self) -> None:
+        SIMPLY_METRICS.reset()
+        response = self.client.get(
+            reverse('trainers_simply:session-stream'),
+            {'range_key': 3, 'num_examples': 6, 'max_digit': 4},
+            HTTP_ACCEPT='text/event-stream',
+        )
+        self.assertEqual(SIMPLY_METRICS.snapshot(), [])
+
+        b''.join(response.streaming_content)
+        paths = {(item['path'], item['range_key'], item['max_digit']): item for item in SIMPLY_METRICS.snapshot()}
+        self.assertEqual(paths[('abacus_columns', 3, 4)]['count'], 1)
+
+    def test_stream_endpoint_emits_numbers_as_events(self) -> None:
+        response = self.client.get(
+            reverse('trainers_simply:session-stream'),
+            {'range_key': 2, 'num_examples': 8, 'max_digit': 5, 'seed': 3},
+            HTTP_ACCEPT='text/event-stream',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/event-stream'))
+        events = []
+        for chunk in b''.join(response.streaming_content).decode().strip().split('\n\n'):
+            event_line, data_line = chunk.split('\n')
+            events.append((event_line[len('event: '):], json.loads(data_line[len('data: '):])))
+
+        self.assertEqual([name for name, _ in events], ['settings'] + ['number'] * 8 + ['end'])
+        self.assertEqual(events[0][1]['seed'], 3)
+        values = [data['value'] for name, data in events if name == 'number']
+        self.assertEqual(events[-1][1]['total'], sum(values))
+
+        regular = self.client.post(
+            reverse('trainers_simply:session'),
+            {'range_key': 2, 'num_examples': 8, 'max_digit': 5, 'seed': 3},
+            format='json',
+        )
+        self.assertEqual([item['value'] for item in regular.data['numbers']], values)
+
+    def test_stream_endpoint_reports_validation_errors(self) -> None:
+        response = self.client.get(
+            reverse('trainers_simply:session-stream'),
+            {'num_examples': 500},
+            HTTP_ACCEPT='text/event-stream',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.content.startswith(b'event: error'))
+
+    def test_batch_endpoint_returns_requested_sessions(self) -> None:
+        response = self.client.post(
+            reverse('trainers_simply:session-batch'),
+            {'range_key': 2, 'num_examples': 12, 'max_digit': 4, 'count': 25},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(response.data['settings']['max_sum'], 44)
+        for session in response.data['sessions']:
+            self.assertEqual(len(session['numbers']), 12)
+            self.assertEqual(session['total'], sum(session['numbers']))
+
+    def test_batch_endpoint_rejects_oversized_count(self) -> None:
+        response = self.client.post(
+            reverse('trainers_simply:session-batch'),
+            {'count': 10_000},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,10 +1,17 @@
 from django.urls import path
 
-from .views import SimplySessionAPIView
+from .views import (
+    SimplyMetricsAPIView,
+    SimplySessionAPIView,
+    SimplySessionBatchAPIView,
+    SimplySessionStreamAPIView,
+)
 
 app_name = "trainers_simply"
 
 urlpatterns = [
     path("session/", SimplySessionAPIView.as_view(), name="session"),
+    path("session/stream/", SimplySessionStreamAPIView.as_view(), name="session-stream"),
+    path("metrics/", SimplyMetricsAPIView.as_view(), name="metrics"),
+    path("sessions/batch/", SimplySessionBatchAPIView.as_view(), name="session-batch"),
 ]
-
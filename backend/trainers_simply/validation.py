@@ -0,0 +1,134 @@
+"""
+Проверка инвариантов и сбор распределений генератора «Просто».
+
+Функции модуля не зависят от Django, чтобы их можно было запускать
+в дочерних процессах ProcessPoolExecutor.
+"""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from .services import (
+    ABACUS_INITIAL_STATE,
+    ABACUS_TRANSITIONS,
+    RangeConfig,
+    _is_direct_column_move,
+    generate_simply_sequence,
+)
+
+# (range_key, max_digit, num_examples, количество последовательностей, зерно)
+ValidationTask = Tuple[int, int, int, int, int]
+
+MAX_REPORTED_VIOLATIONS = 10
+
+
+def _check_abacus_moves(numbers: List[int], max_digit: int, num_examples: int) -> Optional[str]:
+    transitions = ABACUS_TRANSITIONS[max_digit]
+    state = ABACUS_INITIAL_STATE
+    for position, value in enumerate(numbers[:num_examples]):
+        options = transitions[state]
+        if not options.values:
+            state = ABACUS_INITIAL_STATE
+            options = transitions[state]
+        if value not in options.values:
+            return f"недопустимый ход абакуса {value} на позиции {position + 1}"
+        state = options.next_states[options.values.index(value)]
+
+    extra = numbers[num_examples:]
+    if len(extra) > 1:
+        return "больше одного корректирующего числа"
+    if extra and sum(numbers) != max_digit:
+        return "корректирующее число не приводит сумму к max_digit"
+    return None
+
+
+def _check_column_moves(numbers: List[int], num_digits: int, max_digit: int) -> Optional[str]:
+    columns = [0] * num_digits
+    for position, number in enumerate(numbers):
+        digits = str(abs(number))
+        if len(digits) != num_digits:
+            return f"число {number} на позиции {position + 1} не из {num_digits} цифр"
+        sign = 1 if number > 0 else -1
+        for column, char in enumerate(digits):
+            digit = int(char)
+            if not 1 <= digit <= max_digit:
+                return f"цифра {digit} вне 1..{max_digit} на позиции {position + 1}"
+            if not _is_direct_column_move(columns[column], digit * sign):
+                return f"непрямой ход в столбце {column + 1} на позиции {position + 1}"
+            columns[column] += digit * sign
+    return None
+
+
+def check_sequence(
+    numbers: List[int],
+    total: int,
+    max_sum: int,
+    config: RangeConfig,
+    max_digit: int,
+    num_examples: int,
+) -> Optional[str]:
+    """Возвращает описание первого нарушенного инварианта или None."""
+
+    if len(numbers) < num_examples:
+        return "последовательность короче num_examples"
+    if total != sum(numbers):
+        return "total не равен сумме чисел"
+    if not 0 <= total <= max_sum:
+        return f"итог {total} вне [0, {max_sum}]"
+
+    abacus = config.key == 1 and max_digit >= 5
+    # Для однозначного абакуса промежуточные суммы ограничены одним столбцом (0..9).
+    upper_bound = 9 if abacus else max_sum
+    current_sum = 0
+    for position, number in enumerate(numbers):
+        current_sum += number
+        if current_sum < 0:
+            return f"отрицательная промежуточная сумма на позиции {position + 1}"
+        if current_sum > upper_bound:
+            return f"промежуточная сумма {current_sum} больше {upper_bound} на позиции {position + 1}"
+
+    if abacus:
+        return _check_abacus_moves(numbers, max_digit, num_examples)
+    if config.digits > 1:
+        return _check_column_moves(numbers, config.digits, max_digit)
+    return None
+
+
+def validate_batch(task: ValidationTask) -> Dict:
+    """Генерирует пачку последовательностей и собирает гистограммы и нарушения инвариантов."""
+
+    range_key, max_digit, num_examples, count, seed = task
+    rng = random.Random(seed)
+    digits: Counter = Counter()
+    signs: Counter = Counter()
+    totals: Counter = Counter()
+    violations: List[Dict] = []
+    violation_count = 0
+
+    for _ in range(count):
+        numbers, total, max_sum, config = generate_simply_sequence(range_key, num_examples, max_digit, rng)
+        error = check_sequence(numbers, total, max_sum, config, max_digit, num_examples)
+        if error is not None:
+            violation_count += 1
+            if len(violations) < MAX_REPORTED_VIOLATIONS:
+                violations.append({"error": error, "numbers": numbers})
+
+        totals[total] += 1
+        for number in numbers:
+            signs["+" if number > 0 else "-"] += 1
+            digits.update(str(abs(number)))
+
+    return {
+        "range_key": range_key,
+        "max_digit": max_digit,
+        "num_examples": num_examples,
+        "sequences": count,
+        "digits": dict(digits),
+        "signs": dict(signs),
+        "totals": dict(totals),
+        "violation_count": violation_count,
+        "violations": violations,
+    }
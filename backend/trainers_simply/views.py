@@ -1,11 +1,38 @@
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from trainers.pools import SessionPool
+from trainers.seeding import make_rng
+from trainers.sse import EventStreamRenderer, event_stream_response, format_sse
+
+from .metrics import SIMPLY_METRICS
 from .serializers import (
+    SimplyBatchSessionRequestSerializer,
+    SimplyBatchSessionResponseSerializer,
     SimplySessionRequestSerializer,
     SimplySessionResponseSerializer,
 )
-from .services import generate_simply_sequence
+from .services import RangeConfig, generate_simply_sequence, generate_simply_sessions, iter_simply_sequence
+
+
+def _generate_pooled_session(key, rng):
+    range_key, num_examples, max_digit = key
+    return generate_simply_sequence(range_key=range_key, num_examples=num_examples, max_digit=max_digit, rng=rng)
+
+
+SIMPLY_SESSION_POOL = SessionPool("simply", _generate_pooled_session)
+
+
+def build_settings_payload(config: RangeConfig, num_examples: int, speed: float, max_digit: int, max_sum: int) -> dict:
+    return {
+        "range_key": config.key,
+        "range_label": config.label,
+        "num_examples": num_examples,
+        "speed": speed,
+        "max_digit": max_digit,
+        "max_sum": max_sum,
+    }
 
 
 class SimplySessionAPIView(APIView):
@@ -19,22 +46,17 @@ class SimplySessionAPIView(APIView):
         num_examples = int(request_serializer.validated_data["num_examples"])
         speed = float(request_serializer.validated_data["speed"])
         max_digit = int(request_serializer.validated_data["max_digit"])
+        seed = request_serializer.validated_data.get("seed")
 
-        numbers, total, max_sum, config = generate_simply_sequence(
-            range_key=range_key,
-            num_examples=num_examples,
-            max_digit=max_digit,
-        )
+        pool_key = (range_key, num_examples, max_digit)
+        if seed is None:
+            seed, (numbers, total, max_sum, config) = SIMPLY_SESSION_POOL.get(pool_key)
+        else:
+            seed, (numbers, total, max_sum, config) = SIMPLY_SESSION_POOL.generate(pool_key, seed)
 
         payload = {
-            "settings": {
-                "range_key": config.key,
-                "range_label": config.label,
-                "num_examples": num_examples,
-                "speed": speed,
-                "max_digit": max_digit,
-                "max_sum": max_sum,
-            },
+            "settings": build_settings_payload(config, num_examples, speed, max_digit, max_sum),
+            "seed": seed,
             "numbers": [
                 {"index": idx + 1, "value": value} for idx, value in enumerate(numbers)
             ],
@@ -44,3 +66,81 @@ class SimplySessionAPIView(APIView):
         response_serializer = SimplySessionResponseSerializer(payload)
         return Response(response_serializer.data)
 
+
+class SimplySessionStreamAPIView(APIView):
+    """Потоковая (Server-Sent Events) выдача чисел «Просто» по мере генерации."""
+
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    def get(self, request, *args, **kwargs):
+        request_serializer = SimplySessionRequestSerializer(data=request.query_params)
+        request_serializer.is_valid(raise_exception=True)
+
+        range_key = int(request_serializer.validated_data["range_key"])
+        num_examples = int(request_serializer.validated_data["num_examples"])
+        speed = float(request_serializer.validated_data["speed"])
+        max_digit = int(request_serializer.validated_data["max_digit"])
+        rng, seed = make_rng(request_serializer.validated_data.get("seed"))
+
+        numbers, max_sum, config = iter_simply_sequence(
+            range_key=range_key,
+            num_examples=num_examples,
+            max_digit=max_digit,
+            rng=rng,
+        )
+
+        def events():
+            yield format_sse(
+                "settings",
+                {"settings": build_settings_payload(config, num_examples, speed, max_digit, max_sum), "seed": seed},
+            )
+            total = 0
+            for idx, value in enumerate(numbers):
+                total += value
+                yield format_sse("number", {"index": idx + 1, "value": value})
+            yield format_sse("end", {"total": total})
+
+        return event_stream_response(events())
+
+
+class SimplySessionBatchAPIView(APIView):
+    """Пакетная генерация последовательностей «Просто» с общими настройками (листы на весь класс)."""
+
+    def post(self, request, *args, **kwargs):
+        request_serializer = SimplyBatchSessionRequestSerializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
+
+        range_key = int(request_serializer.validated_data["range_key"])
+        num_examples = int(request_serializer.validated_data["num_examples"])
+        speed = float(request_serializer.validated_data["speed"])
+        max_digit = int(request_serializer.validated_data["max_digit"])
+        count = int(request_serializer.validated_data["count"])
+        rng, seed = make_rng(request_serializer.validated_data.get("seed"))
+
+        sessions, max_sum, config = generate_simply_sessions(
+            range_key=range_key,
+            num_examples=num_examples,
+            max_digit=max_digit,
+            count=count,
+            rng=rng,
+        )
+
+        payload = {
+            "settings": build_settings_payload(config, num_examples, speed, max_digit, max_sum),
+            "seed": seed,
+            "count": len(sessions),
+            "sessions": [
+                {"index": idx + 1, "numbers": numbers, "total": total}
+                for idx, (numbers, total) in enumerate(sessions)
+            ],
+        }
+
+        response_serializer = SimplyBatchSessionResponseSerializer(payload)
+        return Response(response_serializer.data)
+
+
+class SimplyMetricsAPIView(APIView):
+    """Счетчики и время по путям генератора «Просто» с разбивкой по range_key и max_digit."""
+
+    def get(self, request, *args, **kwargs):
+        return Response({"paths": SIMPLY_METRICS.snapshot()})
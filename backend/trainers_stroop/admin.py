@@ -0,0 +1,32 @@
+from django.contrib import admin
+
+from .models import StroopColorPalette, StroopLevel, StroopPaletteColor, StroopResult
+
+
+class StroopPaletteColorInline(admin.TabularInline):
+    model = StroopPaletteColor
+    extra = 1
+    fields = ['name', 'hex', 'order']
+
+
+@admin.register(StroopColorPalette)
+class StroopColorPaletteAdmin(admin.ModelAdmin):
+    list_display = ['title', 'slug']
+    search_fields = ['title', 'slug']
+    prepopulated_fields = {'slug': ('title',)}
+    inlines = [StroopPaletteColorInline]
+
+
+@admin.register(StroopLevel)
+class StroopLevelAdmin(admin.ModelAdmin):
+    list_display = ['slug', 'rounds', 'mismatch_ratio', 'recommended_seconds', 'palette', 'order', 'is_active']
+    list_filter = ['is_active', 'palette']
+    ordering = ['order', 'id']
+
+
+@admin.register(StroopResult)
+class StroopResultAdmin(admin.ModelAdmin):
+    list_display = ['level', 'correct_count', 'rounds_count', 'mean_rt_ms', 'interference_ms', 'created_at']
+    list_filter = ['level']
+    exclude = ['reaction_times', 'round_flags']
+    ordering = ['-created_at']
@@ -6,4 +6,5 @@ class TrainersStroopConfig(AppConfig):
     name = 'trainers_stroop'
     verbose_name = 'Тренажер «Тест Струпа»'
 
-
+    def ready(self):
+        from . import signals  # noqa: F401
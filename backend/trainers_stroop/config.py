@@ -0,0 +1,147 @@
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from django.db.models import F
+
+from .models import StroopConfigRevision, StroopLevel, StroopPaletteColor
+from .services import StroopColor, StroopPalette
+
+CONFIG_REVISION_ID = 1
+
+
+@dataclass(frozen=True)
+class StroopLevelConfig:
+    slug: str
+    rounds: int
+    mismatch_ratio: float
+    recommended_seconds: int
+    palette: StroopPalette
+
+
+@dataclass(frozen=True)
+class StroopConfig:
+    version: int
+    levels: dict[str, StroopLevelConfig]
+    # Готовые элементы difficulties для каталога тренажеров (только для чтения).
+    catalog: list[dict]
+
+
+_lock = threading.Lock()
+_current: Optional[StroopConfig] = None
+# Предыдущая версия нужна пулу сессий, пока в нем остаются ключи, выданные до перезагрузки.
+_previous: Optional[StroopConfig] = None
+
+
+def current_config_version() -> int:
+    revision = StroopConfigRevision.objects.filter(pk=CONFIG_REVISION_ID).values_list('revision', flat=True).first()
+    return revision or 0
+
+
+def bump_config_version() -> None:
+    """Увеличивает версию в текущей транзакции — вместе с правкой, которая ее вызвала."""
+
+    if not StroopConfigRevision.objects.filter(pk=CONFIG_REVISION_ID).update(revision=F('revision') + 1):
+        StroopConfigRevision.objects.get_or_create(pk=CONFIG_REVISION_ID, defaults={'revision': 1})
+
+
+def _build_catalog(levels: list[StroopLevelConfig]) -> list[dict]:
+    catalog: list[dict] = []
+    for order, level in enumerate(levels, start=1):
+        mismatch_ratio = int(round(level.mismatch_ratio * 100))
+        catalog.append(
+            {
+                'id': order,
+                'title': f'{level.rounds} раундов — уровень «{level.slug}»',
+                'word_count': level.rounds,
+                'sample_text': (
+                    f'Рекомендуемое время: {level.recommended_seconds} сек. '
+                    f'Несовпадений: {mismatch_ratio}%'
+                ),
+                'order': order,
+                'is_active': True,
+            }
+        )
+    return catalog
+
+
+def load_stroop_config(version: int = 0) -> StroopConfig:
+    """Читает активные уровни и их палитры двумя запросами и заранее строит таблицы палитр."""
+
+    levels = list(StroopLevel.objects.filter(is_active=True).order_by('order', 'id'))
+    colors: dict[int, list[StroopColor]] = {}
+    palette_colors = StroopPaletteColor.objects.filter(palette_id__in={level.palette_id for level in levels})
+    for palette_id, name, hex_color in palette_colors.order_by('order', 'id').values_list('palette_id', 'name', 'hex'):
+        colors.setdefault(palette_id, []).append(StroopColor(name, hex_color))
+
+    palettes: dict[int, StroopPalette] = {}
+    configs: list[StroopLevelConfig] = []
+    for level in levels:
+        palette_colors = colors.get(level.palette_id, [])
+        if len(palette_colors) < 2:
+            # Уровень с неполной палитрой нельзя сыграть — не показываем его.
+            continue
+        if level.palette_id not in palettes:
+            palettes[level.palette_id] = StroopPalette(palette_colors)
+        configs.append(
+            StroopLevelConfig(
+                slug=level.slug,
+                rounds=level.rounds,
+                mismatch_ratio=level.mismatch_ratio,
+                recommended_seconds=level.recommended_seconds,
+                palette=palettes[level.palette_id],
+            )
+        )
+
+    return StroopConfig(
+        version=version,
+        levels={level.slug: level for level in configs},
+        catalog=_build_catalog(configs),
+    )
+
+
+def get_stroop_config() -> StroopConfig:
+    """
+    Конфигурация уровней из памяти процесса.
+
+    На запрос приходится одно чтение версии по первичному ключу; уровни и палитры
+    читаются, только когда версия изменилась. Версия хранится в базе, поэтому совпадает
+    во всех процессах и переживает перезапуск.
+    """
+
+    global _current, _previous
+
+    version = current_config_version()
+    config = _current
+    if config is not None and config.version == version:
+        return config
+
+    with _lock:
+        while _current is None or _current.version != version:
+            config = load_stroop_config(version)
+            # Если правка зафиксировалась, пока читались уровни, данные могут быть новее
+            # прочитанной версии — перечитываем.
+            latest = current_config_version()
+            if latest == version:
+                _previous, _current = _current, config
+                break
+            version = latest
+        return _current
+
+
+def get_stroop_config_version(version: int) -> Optional[StroopConfig]:
+    """Конфигурация указанной версии, если она еще есть в памяти процесса."""
+
+    for config in (_current, _previous):
+        if config is not None and config.version == version:
+            return config
+    return None
+
+
+def clear_stroop_config() -> None:
+    """Сбрасывает конфигурацию в памяти процесса (для тестов: откат транзакции не меняет версию вперед)."""
+
+    global _current, _previous
+
+    with _lock:
+        _current = _previous = None
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StroopResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('level', models.CharField(max_length=32, verbose_name='Уровень')),
+                ('seed', models.PositiveBigIntegerField(verbose_name='Зерно сессии')),
+                ('rounds_count', models.PositiveSmallIntegerField(verbose_name='Раундов')),
+                ('answered_count', models.PositiveSmallIntegerField(verbose_name='Отвечено')),
+                ('correct_count', models.PositiveSmallIntegerField(verbose_name='Верных ответов')),
+                ('reaction_times', models.BinaryField(verbose_name='Время реакции по раундам')),
+                ('round_flags', models.BinaryField(verbose_name='Флаги раундов')),
+                ('accuracy', models.FloatField(verbose_name='Точность')),
+                ('mean_rt_ms', models.FloatField(null=True, verbose_name='Среднее время реакции, мс')),
+                ('median_rt_ms', models.FloatField(null=True, verbose_name='Медианное время реакции, мс')),
+                ('congruent_mean_rt_ms', models.FloatField(null=True, verbose_name='Среднее время (совпадение), мс')),
+                ('incongruent_mean_rt_ms', models.FloatField(null=True, verbose_name='Среднее время (несовпадение), мс')),
+                ('interference_ms', models.FloatField(null=True, verbose_name='Эффект интерференции, мс')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создано')),
+            ],
+            options={
+                'verbose_name': 'Результат «Теста Струпа»',
+                'verbose_name_plural': 'Результаты «Теста Струпа»',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['level', 'created_at'], name='stroop_result_level_idx')],
+            },
+        ),
+    ]
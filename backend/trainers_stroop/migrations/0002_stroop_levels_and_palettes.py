@@ -0,0 +1,76 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:09
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers_stroop', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StroopColorPalette',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(max_length=60, unique=True, verbose_name='Слаг')),
+                ('title', models.CharField(max_length=120, verbose_name='Название палитры')),
+            ],
+            options={
+                'verbose_name': 'Палитра «Теста Струпа»',
+                'verbose_name_plural': 'Палитры «Теста Струпа»',
+                'ordering': ['title'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StroopPaletteColor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=32, verbose_name='Название цвета')),
+                ('hex', models.CharField(max_length=9, verbose_name='HEX-цвет')),
+                ('order', models.PositiveIntegerField(default=0, verbose_name='Порядок')),
+                ('palette', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='colors', to='trainers_stroop.stroopcolorpalette', verbose_name='Палитра')),
+            ],
+            options={
+                'verbose_name': 'Цвет палитры',
+                'verbose_name_plural': 'Цвета палитры',
+                'ordering': ['palette', 'order', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StroopLevel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(max_length=32, unique=True, verbose_name='Слаг уровня')),
+                ('rounds', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1)], verbose_name='Раундов')),
+                ('mismatch_ratio', models.FloatField(validators=[django.core.validators.MinValueValidator(0.0), django.core.validators.MaxValueValidator(1.0)], verbose_name='Доля несовпадений')),
+                ('recommended_seconds', models.PositiveIntegerField(verbose_name='Рекомендуемое время, сек')),
+                ('order', models.PositiveIntegerField(default=0, verbose_name='Порядок отображения')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Активен')),
+                ('palette', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='levels', to='trainers_stroop.stroopcolorpalette', verbose_name='Палитра')),
+            ],
+            options={
+                'verbose_name': 'Уровень «Теста Струпа»',
+                'verbose_name_plural': 'Уровни «Теста Струпа»',
+                'ordering': ['order', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StroopConfigRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('revision', models.PositiveBigIntegerField(default=0, verbose_name='Версия конфигурации')),
+            ],
+            options={
+                'verbose_name': 'Версия конфигурации «Теста Струпа»',
+                'verbose_name_plural': 'Версия конфигурации «Теста Струпа»',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='strooppalettecolor',
+            constraint=models.UniqueConstraint(fields=('palette', 'name'), name='stroop_palette_color_name_uniq'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+
+COLORS = [
+    ('красный', '#E74C3C'),
+    ('синий', '#277BC0'),
+    ('зелёный', '#27AE60'),
+    ('жёлтый', '#F1C40F'),
+    ('фиолетовый', '#8E44AD'),
+    ('оранжевый', '#F39C12'),
+]
+
+LEVELS = [
+    {'slug': 'easy', 'rounds': 12, 'mismatch_ratio': 0.55, 'recommended_seconds': 48},
+    {'slug': 'normal', 'rounds': 20, 'mismatch_ratio': 0.7, 'recommended_seconds': 60},
+    {'slug': 'hard', 'rounds': 30, 'mismatch_ratio': 0.85, 'recommended_seconds': 75},
+]
+
+
+def seed_levels(apps, schema_editor):
+    StroopColorPalette = apps.get_model('trainers_stroop', 'StroopColorPalette')
+    StroopPaletteColor = apps.get_model('trainers_stroop', 'StroopPaletteColor')
+    StroopLevel = apps.get_model('trainers_stroop', 'StroopLevel')
+    StroopConfigRevision = apps.get_model('trainers_stroop', 'StroopConfigRevision')
+
+    StroopConfigRevision.objects.get_or_create(pk=1)
+    palette, _ = StroopColorPalette.objects.get_or_create(slug='basic', defaults={'title': 'Основные цвета'})
+    for order, (name, hex_color) in enumerate(COLORS, start=1):
+        StroopPaletteColor.objects.update_or_create(
+            palette=palette,
+            name=name,
+            defaults={'hex': hex_color, 'order': order},
+        )
+    for order, level in enumerate(LEVELS, start=1):
+        StroopLevel.objects.update_or_create(
+            slug=level['slug'],
+            defaults={**level, 'palette': palette, 'order': order, 'is_active': True},
+        )
+
+
+def remove_levels(apps, schema_editor):
+    StroopLevel = apps.get_model('trainers_stroop', 'StroopLevel')
+    StroopColorPalette = apps.get_model('trainers_stroop', 'StroopColorPalette')
+
+    StroopLevel.objects.filter(slug__in=[level['slug'] for level in LEVELS]).delete()
+    StroopColorPalette.objects.filter(slug='basic', levels__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers_stroop', '0002_stroop_levels_and_palettes'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_levels, remove_levels),
+    ]
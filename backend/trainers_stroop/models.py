@@ -0,0 +1,153 @@
+import sys
+from array import array
+
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models
+
+# Флаги раунда в StroopResult.round_flags (один байт на раунд).
+FLAG_ANSWERED = 1
+FLAG_CORRECT = 2
+FLAG_CONGRUENT = 4
+
+
+def pack_reaction_times(reaction_times: list[int]) -> bytes:
+    packed = array('I', reaction_times)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_reaction_times(raw: bytes) -> list[int]:
+    packed = array('I')
+    packed.frombytes(bytes(raw))
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tolist()
+
+
+class StroopColorPalette(models.Model):
+    slug = models.SlugField(max_length=60, unique=True, verbose_name='Слаг')
+    title = models.CharField(max_length=120, verbose_name='Название палитры')
+
+    class Meta:
+        verbose_name = 'Палитра «Теста Струпа»'
+        verbose_name_plural = 'Палитры «Теста Струпа»'
+        ordering = ['title']
+
+    def __str__(self) -> str:
+        return self.title
+
+
+class StroopPaletteColor(models.Model):
+    palette = models.ForeignKey(
+        StroopColorPalette,
+        on_delete=models.CASCADE,
+        related_name='colors',
+        verbose_name='Палитра',
+    )
+    name = models.CharField(max_length=32, verbose_name='Название цвета')
+    hex = models.CharField(max_length=9, verbose_name='HEX-цвет')
+    order = models.PositiveIntegerField(default=0, verbose_name='Порядок')
+
+    class Meta:
+        verbose_name = 'Цвет палитры'
+        verbose_name_plural = 'Цвета палитры'
+        ordering = ['palette', 'order', 'id']
+        constraints = [
+            models.UniqueConstraint(fields=['palette', 'name'], name='stroop_palette_color_name_uniq'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.name} ({self.hex})'
+
+
+class StroopLevel(models.Model):
+    slug = models.SlugField(max_length=32, unique=True, verbose_name='Слаг уровня')
+    rounds = models.PositiveSmallIntegerField(validators=[MinValueValidator(1)], verbose_name='Раундов')
+    mismatch_ratio = models.FloatField(
+        validators=[MinValueValidator(0.0), MaxValueValidator(1.0)],
+        verbose_name='Доля несовпадений',
+    )
+    recommended_seconds = models.PositiveIntegerField(verbose_name='Рекомендуемое время, сек')
+    palette = models.ForeignKey(
+        StroopColorPalette,
+        on_delete=models.PROTECT,
+        related_name='levels',
+        verbose_name='Палитра',
+    )
+    order = models.PositiveIntegerField(default=0, verbose_name='Порядок отображения')
+    is_active = models.BooleanField(default=True, verbose_name='Активен')
+
+    class Meta:
+        verbose_name = 'Уровень «Теста Струпа»'
+        verbose_name_plural = 'Уровни «Теста Струпа»'
+        ordering = ['order', 'id']
+
+    def __str__(self) -> str:
+        return self.slug
+
+
+class StroopConfigRevision(models.Model):
+    """
+    Единственная строка со счетчиком правок уровней и палитр.
+
+    Счетчик увеличивается в той же транзакции, что и правка (см. signals.py), поэтому все
+    процессы видят одинаковую версию конфигурации, а новые данные — вместе с новой версией.
+    """
+
+    revision = models.PositiveBigIntegerField(default=0, verbose_name='Версия конфигурации')
+
+    class Meta:
+        verbose_name = 'Версия конфигурации «Теста Струпа»'
+        verbose_name_plural = 'Версия конфигурации «Теста Струпа»'
+
+    def __str__(self) -> str:
+        return str(self.revision)
+
+
+class StroopResult(models.Model):
+    """
+    Результат одной сессии «Теста Струпа»: одна строка на сессию.
+
+    Пораундовые данные упакованы: время реакции — массив uint32 (мс, little-endian),
+    флаги раунда — по байту на раунд (ответ дан, верно, слово совпадает с цветом).
+    """
+
+    level = models.CharField(max_length=32, verbose_name='Уровень')
+    seed = models.PositiveBigIntegerField(verbose_name='Зерно сессии')
+    rounds_count = models.PositiveSmallIntegerField(verbose_name='Раундов')
+    answered_count = models.PositiveSmallIntegerField(verbose_name='Отвечено')
+    correct_count = models.PositiveSmallIntegerField(verbose_name='Верных ответов')
+    reaction_times = models.BinaryField(verbose_name='Время реакции по раундам')
+    round_flags = models.BinaryField(verbose_name='Флаги раундов')
+    accuracy = models.FloatField(verbose_name='Точность')
+    mean_rt_ms = models.FloatField(null=True, verbose_name='Среднее время реакции, мс')
+    median_rt_ms = models.FloatField(null=True, verbose_name='Медианное время реакции, мс')
+    congruent_mean_rt_ms = models.FloatField(null=True, verbose_name='Среднее время (совпадение), мс')
+    incongruent_mean_rt_ms = models.FloatField(null=True, verbose_name='Среднее время (несовпадение), мс')
+    interference_ms = models.FloatField(null=True, verbose_name='Эффект интерференции, мс')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Создано')
+
+    class Meta:
+        verbose_name = 'Результат «Теста Струпа»'
+        verbose_name_plural = 'Результаты «Теста Струпа»'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['level', 'created_at'], name='stroop_result_level_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.level}: {self.correct_count}/{self.rounds_count}'
+
+    def unpack_rounds(self) -> list[dict]:
+        flags = bytes(self.round_flags)
+        return [
+            {
+                'id': index + 1,
+                'answered': bool(flag & FLAG_ANSWERED),
+                'correct': bool(flag & FLAG_CORRECT),
+                'congruent': bool(flag & FLAG_CONGRUENT),
+                'reaction_ms': reaction_ms if flag & FLAG_ANSWERED else None,
+            }
+            for index, (flag, reaction_ms) in enumerate(zip(flags, unpack_reaction_times(self.reaction_times)))
+        ]
@@ -0,0 +1,50 @@
+from rest_framework import serializers
+
+from trainers.seeding import MAX_SEED
+
+from .models import StroopResult
+
+MAX_REACTION_MS = 600_000
+
+
+class StroopAnswerSerializer(serializers.Serializer):
+    round_id = serializers.IntegerField(min_value=1)
+    answer = serializers.CharField(max_length=64)
+    reaction_ms = serializers.IntegerField(min_value=0, max_value=MAX_REACTION_MS)
+
+
+class StroopResultRequestSerializer(serializers.Serializer):
+    level = serializers.CharField(max_length=32)
+    seed = serializers.IntegerField(min_value=0, max_value=MAX_SEED)
+    # Версия конфигурации из ответа сессии: по ней проверяется, что раунды восстановятся такими же.
+    config_version = serializers.IntegerField(min_value=0)
+    answers = StroopAnswerSerializer(many=True, max_length=500)
+
+    def validate_level(self, value: str) -> str:
+        return value.lower()
+
+    def validate_answers(self, value: list) -> list:
+        round_ids = [answer['round_id'] for answer in value]
+        if len(round_ids) != len(set(round_ids)):
+            raise serializers.ValidationError('Ответ на каждый раунд можно передать только один раз.')
+        return value
+
+
+class StroopResultSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StroopResult
+        fields = [
+            'id',
+            'level',
+            'seed',
+            'rounds_count',
+            'answered_count',
+            'correct_count',
+            'accuracy',
+            'mean_rt_ms',
+            'median_rt_ms',
+            'congruent_mean_rt_ms',
+            'incongruent_mean_rt_ms',
+            'interference_ms',
+            'created_at',
+        ]
@@ -0,0 +1,151 @@
+import random
+from dataclasses import dataclass
+from statistics import median
+from typing import Mapping, Optional, Sequence
+
+from .models import FLAG_ANSWERED, FLAG_CONGRUENT, FLAG_CORRECT, pack_reaction_times
+
+MAX_CHOICES = 4
+MAX_BATCH_SESSIONS = 100
+
+
+@dataclass(frozen=True)
+class StroopColor:
+    name: str
+    hex: str
+
+
+class StroopPalette:
+    """
+    Палитра с заранее посчитанными таблицами: для каждого цвета — названия всех
+    остальных цветов (кандидаты и для несовпадающего слова, и для неверных вариантов ответа).
+    """
+
+    def __init__(self, colors: Sequence[StroopColor]) -> None:
+        if len(colors) < 2:
+            raise ValueError('Палитра теста Струпа должна содержать хотя бы два цвета.')
+
+        self.colors = tuple(colors)
+        self.names = tuple(color.name for color in self.colors)
+        self.hexes = tuple(color.hex for color in self.colors)
+        self.mismatch_names = tuple(
+            tuple(name for other, name in enumerate(self.names) if other != index) for index in range(len(self.names))
+        )
+        self.choice_count = min(MAX_CHOICES, len(self.names))
+        self.available_colors = tuple({'name': color.name, 'hex': color.hex} for color in self.colors)
+
+
+def generate_stroop_rounds(
+    palette: StroopPalette,
+    total: int,
+    mismatch_ratio: float,
+    rng: Optional[random.Random] = None,
+) -> list[dict]:
+    rng = rng if rng is not None else random.Random()
+    names = palette.names
+    hexes = palette.hexes
+    mismatch_names = palette.mismatch_names
+    distractor_count = palette.choice_count - 1
+    rounds: list[dict] = []
+
+    for index in range(total):
+        ink = rng.randrange(len(names))
+        ink_name = names[ink]
+        word = rng.choice(mismatch_names[ink]) if rng.random() < mismatch_ratio else ink_name
+
+        # Неверные варианты берутся только из других цветов, правильный вставляется
+        # на случайную позицию — без множеств и повторного перемешивания.
+        choices = rng.sample(mismatch_names[ink], distractor_count)
+        choices.insert(rng.randrange(distractor_count + 1), ink_name)
+
+        rounds.append(
+            {
+                'id': index + 1,
+                'word': word,
+                'ink_color': hexes[ink],
+                'correct_answer': ink_name,
+                'choices': choices,
+            }
+        )
+
+    return rounds
+
+
+def generate_stroop_sessions(
+    palette: StroopPalette,
+    total: int,
+    mismatch_ratio: float,
+    count: int,
+    rng: Optional[random.Random] = None,
+) -> list[tuple[int, list[dict]]]:
+    """
+    Генерирует ``count`` сессий за один вызов. Каждая сессия получает собственное зерно
+    из ``rng``, поэтому ее можно воспроизвести отдельно через generate_stroop_rounds.
+    """
+
+    rng = rng if rng is not None else random.Random()
+    sessions: list[tuple[int, list[dict]]] = []
+    for _ in range(count):
+        seed = rng.getrandbits(32)
+        sessions.append((seed, generate_stroop_rounds(palette, total, mismatch_ratio, random.Random(seed))))
+    return sessions
+
+
+def _mean(total: int, count: int) -> Optional[float]:
+    return round(total / count, 2) if count else None
+
+
+def summarize_answers(rounds: Sequence[dict], answers: Mapping[int, tuple[str, int]]) -> dict:
+    """
+    Считает показатели сессии за один проход по раундам.
+
+    ``answers`` — ответы по id раунда: (выбранный цвет, время реакции в мс). Раунды без
+    ответа учитываются в точности как неверные. Эффект интерференции — разница средних
+    времен верных ответов на несовпадающих и совпадающих раундах.
+    Возвращает показатели и упакованные пораундовые данные для StroopResult.
+    """
+
+    flags = bytearray(len(rounds))
+    reaction_times = [0] * len(rounds)
+    answered_times: list[int] = []
+    correct_count = 0
+    # Суммы и количества времени верных ответов: [совпадение, несовпадение].
+    correct_sums = [0, 0]
+    correct_counts = [0, 0]
+
+    for position, round_ in enumerate(rounds):
+        congruent = round_['word'] == round_['correct_answer']
+        flag = FLAG_CONGRUENT if congruent else 0
+        answer = answers.get(round_['id'])
+        if answer is not None:
+            choice, reaction_ms = answer
+            flag |= FLAG_ANSWERED
+            reaction_times[position] = reaction_ms
+            answered_times.append(reaction_ms)
+            if choice == round_['correct_answer']:
+                flag |= FLAG_CORRECT
+                correct_count += 1
+                bucket = 0 if congruent else 1
+                correct_sums[bucket] += reaction_ms
+                correct_counts[bucket] += 1
+        flags[position] = flag
+
+    congruent_mean = _mean(correct_sums[0], correct_counts[0])
+    incongruent_mean = _mean(correct_sums[1], correct_counts[1])
+    return {
+        'rounds_count': len(rounds),
+        'answered_count': len(answered_times),
+        'correct_count': correct_count,
+        'accuracy': round(correct_count / len(rounds), 4) if rounds else 0.0,
+        'mean_rt_ms': _mean(sum(answered_times), len(answered_times)),
+        'median_rt_ms': float(median(answered_times)) if answered_times else None,
+        'congruent_mean_rt_ms': congruent_mean,
+        'incongruent_mean_rt_ms': incongruent_mean,
+        'interference_ms': (
+            round(incongruent_mean - congruent_mean, 2)
+            if congruent_mean is not None and incongruent_mean is not None
+            else None
+        ),
+        'reaction_times': pack_reaction_times(reaction_times),
+        'round_flags': bytes(flags),
+    }
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .config import bump_config_version
+from .models import StroopColorPalette, StroopLevel, StroopPaletteColor
+
+
+@receiver(post_save, sender=StroopLevel)
+@receiver(post_delete, sender=StroopLevel)
+@receiver(post_save, sender=StroopColorPalette)
+@receiver(post_delete, sender=StroopColorPalette)
+@receiver(post_save, sender=StroopPaletteColor)
+@receiver(post_delete, sender=StroopPaletteColor)
+def invalidate_stroop_config(sender, **kwargs) -> None:
+    # В той же транзакции, что и правка: другие процессы увидят новую версию
+    # только вместе с новыми строками.
+    bump_config_version()
@@ -1,6 +1,23 @@
+import random
+from collections import deque
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
-from django.urls import reverse
+
+from .config import bump_config_version, clear_stroop_config, get_stroop_config
+from .models import StroopConfigRevision, StroopLevel, StroopResult
+from .services import StroopColor, StroopPalette, generate_stroop_rounds, generate_stroop_sessions
+from .views import STROOP_SESSION_POOL
+
+COLORS = [
+    StroopColor('красный', '#E74C3C'),
+    StroopColor('синий', '#277BC0'),
+    StroopColor('зелёный', '#27AE60'),
+    StroopColor('жёлтый', '#F1C40F'),
+    StroopColor('фиолетовый', '#8E44AD'),
+]
 
 
 class StroopSessionViewTests(APITestCase):
@@ -26,4 +43,210 @@ class StroopSessionViewTests(APITestCase):
         payload = response.json()
         self.assertIn('available_levels', payload)
 
+    def test_same_seed_returns_same_rounds(self):
+        first = self.client.get(reverse('stroop-session'), {'level': 'hard', 'seed': 77}).json()
+        second = self.client.get(reverse('stroop-session'), {'level': 'hard', 'seed': 77}).json()
+
+        self.assertEqual(first['seed'], 77)
+        self.assertEqual(first['rounds'], second['rounds'])
+
+    def test_invalid_seed_returns_error(self):
+        response = self.client.get(reverse('stroop-session'), {'seed': 'abc'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_endpoint(self):
+        response = self.client.get(reverse('stroop-session-batch'), {'level': 'easy', 'count': 3, 'seed': 4})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        payload = response.json()
+        self.assertEqual(payload['count'], 3)
+        session = payload['sessions'][1]
+        single = self.client.get(reverse('stroop-session'), {'level': 'easy', 'seed': session['seed']}).json()
+        self.assertEqual(single['rounds'], session['rounds'])
+
+        too_many = self.client.get(reverse('stroop-session-batch'), {'count': 1000})
+        self.assertEqual(too_many.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class StroopGeneratorTests(SimpleTestCase):
+    def test_rounds_follow_palette_tables(self):
+        rounds = generate_stroop_rounds(StroopPalette(COLORS), 500, 0.7, random.Random(3))
+        hex_by_name = {color.name: color.hex for color in COLORS}
+
+        for round_ in rounds:
+            self.assertEqual(hex_by_name[round_['correct_answer']], round_['ink_color'])
+            self.assertEqual(len(round_['choices']), 4)
+            self.assertEqual(len(set(round_['choices'])), 4)
+            self.assertIn(round_['correct_answer'], round_['choices'])
+        mismatched = sum(round_['word'] != round_['correct_answer'] for round_ in rounds)
+        self.assertTrue(300 <= mismatched <= 400)
+
+    def test_small_palette_limits_choices(self):
+        palette = StroopPalette(COLORS[:2])
+        rounds = generate_stroop_rounds(palette, 20, 1.0, random.Random(1))
+
+        for round_ in rounds:
+            self.assertEqual(sorted(round_['choices']), sorted(palette.names))
+            self.assertNotEqual(round_['word'], round_['correct_answer'])
+
+    def test_batch_sessions_are_reproducible_one_by_one(self):
+        palette = StroopPalette(COLORS)
+        sessions = generate_stroop_sessions(palette, 12, 0.55, 5, random.Random(8))
+
+        self.assertEqual(len(sessions), 5)
+        for seed, rounds in sessions:
+            self.assertEqual(generate_stroop_rounds(palette, 12, 0.55, random.Random(seed)), rounds)
+
+    def test_palette_requires_two_colors(self):
+        with self.assertRaises(ValueError):
+            StroopPalette(COLORS[:1])
+
+
+class StroopConfigTests(TestCase):
+    def setUp(self):
+        # Откат транзакции теста возвращает версию назад, а конфигурация в памяти процесса
+        # остается — сбрасываем ее, чтобы та же версия не досталась другим данным.
+        clear_stroop_config()
+        self.addCleanup(clear_stroop_config)
+
+    def test_seeded_levels_are_loaded(self):
+        config = get_stroop_config()
+
+        self.assertEqual(list(config.levels), ['easy', 'normal', 'hard'])
+        self.assertEqual(config.levels['normal'].rounds, 20)
+        self.assertEqual(len(config.levels['normal'].palette.names), 6)
+        self.assertEqual([item['word_count'] for item in config.catalog], [12, 20, 30])
+
+    def test_warm_config_reads_only_version(self):
+        config = get_stroop_config()
+
+        with self.assertNumQueries(1):
+            self.assertIs(get_stroop_config(), config)
+
+    def test_saving_level_reloads_config(self):
+        before = get_stroop_config()
+        StroopLevel.objects.filter(slug='hard').update(rounds=40)
+        self.assertIs(get_stroop_config(), before)
+
+        level = StroopLevel.objects.get(slug='easy')
+        level.is_active = False
+        level.save()
+
+        after = get_stroop_config()
+        self.assertEqual(after.version, before.version + 1)
+        self.assertEqual(StroopConfigRevision.objects.get().revision, after.version)
+        self.assertNotIn('easy', after.levels)
+        self.assertEqual(after.levels['hard'].rounds, 40)
+
+    def test_session_uses_updated_level(self):
+        get_stroop_config()
+        level = StroopLevel.objects.get(slug='normal')
+        level.rounds = 7
+        level.save()
+
+        payload = self.client.get(reverse('stroop-session')).json()
+        self.assertEqual(payload['total_rounds'], 7)
+        trainers = self.client.get(reverse('trainer-list')).json()
+        trainer = next(item for item in trainers if item['slug'] == 'stroop-test')
+        self.assertEqual(trainer['difficulties'][1]['word_count'], 7)
+
+    def test_pool_drops_keys_of_outdated_config(self):
+        before = get_stroop_config()
+        StroopLevel.objects.filter(slug='hard').update(is_active=False)
+        bump_config_version()
+        after = get_stroop_config()
+        self.addCleanup(STROOP_SESSION_POOL._queues.clear)
+
+        for key in [('easy', before.version - 1), ('hard', after.version), ('easy', after.version)]:
+            STROOP_SESSION_POOL._queues[key] = deque()
+        STROOP_SESSION_POOL.refill()
+
+        self.assertEqual(list(STROOP_SESSION_POOL._queues), [('easy', after.version)])
+        self.assertEqual(len(STROOP_SESSION_POOL._queues['easy', after.version]), STROOP_SESSION_POOL.size)
+        self.assertEqual(STROOP_SESSION_POOL.errors, 0)
+
+
+class StroopResultViewTests(APITestCase):
+    def setUp(self):
+        clear_stroop_config()
+        self.addCleanup(clear_stroop_config)
+
+    def test_results_are_scored_against_regenerated_rounds(self):
+        session = self.client.get(reverse('stroop-session'), {'level': 'easy', 'seed': 21}).json()
+        rounds = session['rounds']
+        answers = []
+        for round_ in rounds[:-1]:
+            congruent = round_['word'] == round_['correct_answer']
+            answers.append(
+                {'round_id': round_['id'], 'answer': round_['correct_answer'], 'reaction_ms': 500 if congruent else 800}
+            )
+        wrong = next(choice for choice in rounds[0]['choices'] if choice != rounds[0]['correct_answer'])
+        answers[0] = {'round_id': 1, 'answer': wrong, 'reaction_ms': 1000}
+
+        response = self.client.post(
+            reverse('stroop-results'),
+            {'level': 'easy', 'seed': 21, 'config_version': session['config_version'], 'answers': answers},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        payload = response.json()
+        self.assertEqual(payload['rounds_count'], len(rounds))
+        self.assertEqual(payload['answered_count'], len(rounds) - 1)
+        self.assertEqual(payload['correct_count'], len(rounds) - 2)
+        self.assertAlmostEqual(payload['accuracy'], round((len(rounds) - 2) / len(rounds), 4))
+        self.assertEqual(payload['interference_ms'], 300.0)
+        times = sorted(answer['reaction_ms'] for answer in answers)
+        self.assertEqual(payload['mean_rt_ms'], round(sum(times) / len(times), 2))
+
+        stored = StroopResult.objects.get(pk=payload['id']).unpack_rounds()
+        self.assertEqual(len(stored), len(rounds))
+        self.assertEqual(
+            stored[0],
+            {
+                'id': 1,
+                'answered': True,
+                'correct': False,
+                'congruent': rounds[0]['word'] == rounds[0]['correct_answer'],
+                'reaction_ms': 1000,
+            },
+        )
+        self.assertFalse(stored[-1]['answered'])
+        self.assertIsNone(stored[-1]['reaction_ms'])
+
+    def test_results_reject_unknown_rounds(self):
+        response = self.client.post(
+            reverse('stroop-results'),
+            {
+                'level': 'easy',
+                'seed': 1,
+                'config_version': get_stroop_config().version,
+                'answers': [{'round_id': 99, 'answer': 'синий', 'reaction_ms': 400}],
+            },
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(StroopResult.objects.exists())
+
+    def test_results_for_outdated_config_are_rejected(self):
+        session = self.client.get(reverse('stroop-session'), {'level': 'easy', 'seed': 5}).json()
+        level = StroopLevel.objects.get(slug='easy')
+        level.rounds = 5
+        level.save()
+
+        response = self.client.post(
+            reverse('stroop-results'),
+            {
+                'level': 'easy',
+                'seed': 5,
+                'config_version': session['config_version'],
+                'answers': [{'round_id': 1, 'answer': session['rounds'][0]['correct_answer'], 'reaction_ms': 400}],
+            },
+            format='json',
+        )
 
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertNotEqual(response.json()['config_version'], session['config_version'])
+        self.assertFalse(StroopResult.objects.exists())
@@ -1,9 +1,11 @@
 from django.urls import path
 
-from .views import StroopSessionView
+from .views import StroopResultView, StroopSessionBatchView, StroopSessionView
 
 urlpatterns = [
     path('session/', StroopSessionView.as_view(), name='stroop-session'),
+    path('results/', StroopResultView.as_view(), name='stroop-results'),
+    path('sessions/batch/', StroopSessionBatchView.as_view(), name='stroop-session-batch'),
 ]
 
 
@@ -1,43 +1,26 @@
 import random
-from dataclasses import dataclass
 
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from trainers.pools import SessionPool, StaleSessionKey
+from trainers.seeding import make_rng, parse_seed
 
-@dataclass(frozen=True)
-class StroopColor:
-    name: str
-    hex: str
-
-
-COLORS: tuple[StroopColor, ...] = (
-    StroopColor('красный', '#E74C3C'),
-    StroopColor('синий', '#277BC0'),
-    StroopColor('зелёный', '#27AE60'),
-    StroopColor('жёлтый', '#F1C40F'),
-    StroopColor('фиолетовый', '#8E44AD'),
-    StroopColor('оранжевый', '#F39C12'),
-)
-
-DIFFICULTIES = {
-    'easy': {
-        'rounds': 12,
-        'mismatch_ratio': 0.55,
-        'recommended_seconds': 48,
-    },
-    'normal': {
-        'rounds': 20,
-        'mismatch_ratio': 0.7,
-        'recommended_seconds': 60,
-    },
-    'hard': {
-        'rounds': 30,
-        'mismatch_ratio': 0.85,
-        'recommended_seconds': 75,
-    },
-}
+from .config import StroopConfig, StroopLevelConfig, get_stroop_config, get_stroop_config_version
+from .models import StroopResult
+from .serializers import StroopResultRequestSerializer, StroopResultSerializer
+from .services import MAX_BATCH_SESSIONS, generate_stroop_rounds, generate_stroop_sessions, summarize_answers
+
+
+def _invalid_level_response(config: StroopConfig) -> Response:
+    return Response(
+        {
+            'detail': 'Недопустимый уровень сложности.',
+            'available_levels': list(config.levels),
+        },
+        status=status.HTTP_400_BAD_REQUEST,
+    )
 
 
 class StroopSessionView(APIView):
@@ -50,70 +33,141 @@ class StroopSessionView(APIView):
 
     def get(self, request):
         difficulty_slug = request.query_params.get('level', 'normal').lower()
-        config = DIFFICULTIES.get(difficulty_slug)
+        stroop_config = get_stroop_config()
+        level = stroop_config.levels.get(difficulty_slug)
+
+        if level is None:
+            return _invalid_level_response(stroop_config)
+
+        try:
+            seed = parse_seed(request.query_params.get('seed'))
+        except ValueError:
+            return Response({'detail': 'Некорректное значение seed.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Версия конфигурации в ключе: после правки уровней старые готовые сессии не выдаются.
+        pool_key = (difficulty_slug, stroop_config.version)
+        if seed is None:
+            seed, rounds = STROOP_SESSION_POOL.get(pool_key)
+        else:
+            seed, rounds = STROOP_SESSION_POOL.generate(pool_key, seed)
+
+        return Response(
+            {
+                'level': difficulty_slug,
+                'seed': seed,
+                'config_version': stroop_config.version,
+                'total_rounds': len(rounds),
+                'recommended_seconds': level.recommended_seconds,
+                'available_colors': level.palette.available_colors,
+                'rounds': rounds,
+            }
+        )
+
 
-        if config is None:
+class StroopSessionBatchView(APIView):
+    """Пакетная генерация сессий одного уровня; у каждой сессии свое воспроизводимое зерно."""
+
+    def get(self, request):
+        difficulty_slug = request.query_params.get('level', 'normal').lower()
+        stroop_config = get_stroop_config()
+        level = stroop_config.levels.get(difficulty_slug)
+        if level is None:
+            return _invalid_level_response(stroop_config)
+
+        try:
+            seed = parse_seed(request.query_params.get('seed'))
+            count = int(request.query_params.get('count', 10))
+        except ValueError:
+            return Response({'detail': 'Некорректное значение seed или count.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= count <= MAX_BATCH_SESSIONS:
             return Response(
-                {
-                    'detail': 'Недопустимый уровень сложности.',
-                    'available_levels': list(DIFFICULTIES.keys()),
-                },
+                {'detail': f'count должен быть от 1 до {MAX_BATCH_SESSIONS}.'},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        rounds = self._build_rounds(config['rounds'], config['mismatch_ratio'])
+        rng, seed = make_rng(seed)
+        sessions = generate_stroop_sessions(level.palette, level.rounds, level.mismatch_ratio, count, rng)
 
         return Response(
             {
                 'level': difficulty_slug,
-                'total_rounds': len(rounds),
-                'recommended_seconds': config['recommended_seconds'],
-                'available_colors': [{'name': color.name, 'hex': color.hex} for color in COLORS],
-                'rounds': rounds,
+                'seed': seed,
+                'config_version': stroop_config.version,
+                'count': len(sessions),
+                'recommended_seconds': level.recommended_seconds,
+                'available_colors': level.palette.available_colors,
+                'sessions': [
+                    {'seed': session_seed, 'total_rounds': len(rounds), 'rounds': rounds}
+                    for session_seed, rounds in sessions
+                ],
             }
         )
 
-    def _build_rounds(self, total: int, mismatch_ratio: float) -> list[dict]:
-        color_names = [color.name for color in COLORS]
-        rounds: list[dict] = []
 
-        for index in range(total):
-            ink_color = random.choice(COLORS)
-            should_mismatch = random.random() < mismatch_ratio
+class StroopResultView(APIView):
+    """
+    Принимает ответы сессии и сохраняет результат одной строкой.
 
-            if should_mismatch:
-                mismatch_choices = [color for color in COLORS if color.name != ink_color.name]
-                word_color = random.choice(mismatch_choices)
-                word = word_color.name
-            else:
-                word = ink_color.name
+    Раунды не передаются клиентом: сервер восстанавливает их по уровню и зерну,
+    поэтому правильность ответов и совпадение слова с цветом считаются на сервере.
+    Если конфигурация уровней с момента выдачи сессии изменилась (другой config_version),
+    раунды восстановить нельзя — ответ 409.
+    """
 
-            choices = self._build_choices(correct=ink_color.name, palette=color_names)
+    def post(self, request):
+        request_serializer = StroopResultRequestSerializer(data=request.data)
+        request_serializer.is_valid(raise_exception=True)
 
-            rounds.append(
+        level = request_serializer.validated_data['level']
+        stroop_config = get_stroop_config()
+        if level not in stroop_config.levels:
+            return _invalid_level_response(stroop_config)
+
+        if request_serializer.validated_data['config_version'] != stroop_config.version:
+            return Response(
                 {
-                    'id': index + 1,
-                    'word': word,
-                    'ink_color': ink_color.hex,
-                    'correct_answer': ink_color.name,
-                    'choices': choices,
-                }
+                    'detail': 'Настройки уровней изменились после выдачи сессии — результат нельзя проверить.',
+                    'config_version': stroop_config.version,
+                },
+                status=status.HTTP_409_CONFLICT,
             )
 
-        return rounds
+        seed = request_serializer.validated_data['seed']
+        _, rounds = STROOP_SESSION_POOL.generate((level, stroop_config.version), seed)
+
+        answers = {
+            answer['round_id']: (answer['answer'], answer['reaction_ms'])
+            for answer in request_serializer.validated_data['answers']
+        }
+        if any(round_id > len(rounds) for round_id in answers):
+            return Response(
+                {'detail': f'Номер раунда должен быть от 1 до {len(rounds)}.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        result = StroopResult.objects.create(level=level, seed=seed, **summarize_answers(rounds, answers))
+        return Response(StroopResultSerializer(result).data, status=status.HTTP_201_CREATED)
+
+
+def _pooled_level(key: tuple) -> StroopLevelConfig:
+    """Уровень из конфигурации той версии, под которой ключ попал в пул."""
+
+    slug, version = key
+    config = get_stroop_config_version(version)
+    if config is None or slug not in config.levels:
+        # Конфигурация сменилась или уровень отключен: ключ больше никто не запросит.
+        raise StaleSessionKey(key)
+    return config.levels[slug]
+
 
-    @staticmethod
-    def _build_choices(correct: str, palette: list[str]) -> list[str]:
-        sample_size = min(4, len(palette))
-        choices = set(random.sample(palette, k=sample_size))
+def _generate_pooled_rounds(key: tuple, rng: random.Random) -> list[dict]:
+    level = _pooled_level(key)
+    return generate_stroop_rounds(level.palette, level.rounds, level.mismatch_ratio, rng)
 
-        if correct not in choices:
-            if len(choices) >= sample_size:
-                choices.pop()
-            choices.add(correct)
 
-        choices_list = list(choices)
-        random.shuffle(choices_list)
-        return choices_list
+def _generate_pooled_batch(key: tuple, count: int) -> list[tuple[int, list[dict]]]:
+    level = _pooled_level(key)
+    return generate_stroop_sessions(level.palette, level.rounds, level.mismatch_ratio, count)
 
 
+STROOP_SESSION_POOL = SessionPool('stroop', _generate_pooled_rounds, batch_factory=_generate_pooled_batch)
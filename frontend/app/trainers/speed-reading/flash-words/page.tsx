@@ -40,14 +40,6 @@ type SessionWord = {
   text: string;
 };
 
-type DeckCard = {
-  id: number;
-  front_text: string;
-  back_text: string;
-  hint: string;
-  order: number;
-};
-
 type RecallWord = SessionWord & {
   status: 'idle' | 'correct' | 'incorrect';
 };
@@ -58,7 +50,8 @@ type Deck = {
   title: string;
   description: string;
   accent_color?: string | null;
-  cards: DeckCard[];
+  word_count: number;
+  sample_text: string;
 };
 
 type SessionPayload = {
@@ -127,7 +120,7 @@ export default function FlashWordsTrainer() {
   }, [stage]);
 
   const activeDeck = useMemo(() => decks.find((deck) => deck.slug === activeDeckSlug) ?? null, [activeDeckSlug, decks]);
-  const maxWordCount = useMemo(() => (activeDeck ? Math.max(MIN_WORDS, activeDeck.cards.length) : MIN_WORDS), [activeDeck]);
+  const maxWordCount = useMemo(() => (activeDeck ? Math.max(MIN_WORDS, activeDeck.word_count) : MIN_WORDS), [activeDeck]);
   const midWordMark = useMemo(() => {
     const max = Math.max(MIN_WORDS, maxWordCount);
     return Math.max(MIN_WORDS, Math.round((MIN_WORDS + max) / 2));
@@ -138,15 +131,15 @@ export default function FlashWordsTrainer() {
       setWordCount(MIN_WORDS);
       return;
     }
-    if (wordCount > activeDeck.cards.length) {
-      setWordCount(Math.max(MIN_WORDS, activeDeck.cards.length));
+    if (wordCount > activeDeck.word_count) {
+      setWordCount(Math.max(MIN_WORDS, activeDeck.word_count));
     }
   }, [activeDeck, wordCount]);
 
   const applyDeckSelection = useCallback((deck: Deck) => {
     setActiveDeckSlug(deck.slug);
     setWordCount((previous) => {
-      const limit = Math.max(MIN_WORDS, deck.cards.length);
+      const limit = Math.max(MIN_WORDS, deck.word_count);
       return Math.min(limit, Math.max(MIN_WORDS, previous));
     });
   }, []);
@@ -173,12 +166,12 @@ export default function FlashWordsTrainer() {
         setDeckError('Уровень не найден. Попробуйте обновить страницу.');
         return;
       }
-      if (!targetDeck.cards.length) {
+      if (!targetDeck.word_count) {
         setDeckError('Для выбранного уровня пока нет слов.');
         return;
       }
 
-      const deckLimit = Math.max(MIN_WORDS, targetDeck.cards.length);
+      const deckLimit = Math.max(MIN_WORDS, targetDeck.word_count);
       const resolvedWordCount = Math.min(deckLimit, Math.max(MIN_WORDS, options?.wordCount ?? wordCount));
 
       applyDeckSelection(targetDeck);
@@ -363,7 +356,7 @@ export default function FlashWordsTrainer() {
       return (
         <div className={styles.setupPlaceholder}>
           <p>Настройте скорость показа и количество слов, затем нажмите «Применить настройки», чтобы начать тренировку.</p>
-          {activeDeck && <p className={styles.setupDetails}>В наборе «{activeDeck.title}» доступно {activeDeck.cards.length} слов.</p>}
+          {activeDeck && <p className={styles.setupDetails}>В наборе «{activeDeck.title}» доступно {activeDeck.word_count} слов.</p>}
         </div>
       );
     }
@@ -499,11 +492,10 @@ export default function FlashWordsTrainer() {
             ) : decks.length ? (
               <div className={styles.difficultyList}>
                 {decks.map((deck) => {
-                  const preview = deck.cards
-                    .slice(0, 8)
-                    .map((card) => card.front_text)
-                    .filter((word) => word.trim().length > 0)
-                    .join(', ');
+                  // sample_text содержит только первые слова набора — остальные обозначаем многоточием.
+                  const sample = deck.sample_text.trim();
+                  const isTruncated = Boolean(sample) && sample.split(', ').length < deck.word_count;
+                  const preview = isTruncated ? `${sample}…` : sample;
                   const isActive = activeDeckSlug === deck.slug;
                   return (
                     <article
@@ -513,7 +505,7 @@ export default function FlashWordsTrainer() {
                     >
                       <div className={styles.difficultyHeading}>
                         <h3>{deck.title}</h3>
-                        <span>{deck.cards.length} слов</span>
+                        <span>{deck.word_count} слов</span>
                       </div>
                       <p className={styles.difficultySample} title={preview || 'Набор пока пустой'}>
                         {preview || 'Карточки для этого уровня появятся совсем скоро.'}
@@ -546,7 +538,7 @@ export default function FlashWordsTrainer() {
                 <div className={styles.selectedDeckBanner}>
                   <span className={styles.selectedDeckLabel}>Выбран уровень</span>
                   <strong>{activeDeck.title}</strong>
-                  <span className={styles.selectedDeckMeta}>{activeDeck.cards.length} слов в наборе</span>
+                  <span className={styles.selectedDeckMeta}>{activeDeck.word_count} слов в наборе</span>
                 </div>
 
                 <div className={styles.settingsPanel}>